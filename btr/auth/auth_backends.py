@@ -1,9 +1,47 @@
+import hashlib
+
 from django.contrib.auth.backends import ModelBackend
-from django.core.exceptions import ObjectDoesNotExist
+from django.core.cache import cache
+from phonenumber_field.phonenumber import to_python
 
 from btr.users.models import SiteUser
 
 
+# failed logins allowed in the window, then the account (or the unknown
+# login) is rejected without checking the password
+MAX_FAILED_LOGINS = 5
+FAILED_LOGINS_WINDOW = 5 * 60
+
+
+def normalize_login(login: str) -> str:
+    """Phone numbers as E.164, other logins in lower case"""
+    phone = to_python(login)
+    if getattr(phone, 'is_valid', bool)():
+        return phone.as_e164
+    return login.lower()
+
+
+def get_failed_logins_key(login: str = None, user: SiteUser = None) -> str:
+    """
+    Get the cache key of failed logins of the user, every alias of an
+     account (username, email, phone formats) shares it. Logins matching
+     no user are counted by the normalized login.
+    """
+    if user is not None:
+        return f'auth:failed:user:{user.pk}'
+    digest = hashlib.sha1(normalize_login(login).encode()).hexdigest()
+    return f'auth:failed:{digest}'
+
+
+def count_failed_login(key: str) -> None:
+    cache.add(key, 0, FAILED_LOGINS_WINDOW)
+    try:
+        cache.incr(key)
+    except ValueError:
+        # expired between add and incr
+        cache.set(key, 1, FAILED_LOGINS_WINDOW)
+
+
 class MultiplyFieldBackend(ModelBackend):
 
     def authenticate(self, request, username=None, password=None, **kwargs):
@@ -11,6 +49,12 @@ class MultiplyFieldBackend(ModelBackend):
         Custom authentication backend that allows authentication using
          multiple fields (username, email, or phone number).
 
+        The user is resolved in one query. Failed attempts are counted in
+         the cache per account (wrong password with any alias of the user)
+          or per normalized login (unknown login). After MAX_FAILED_LOGINS
+           of them the login is rejected for the rest of the window without
+            checking the password, an unknown login without a query.
+
         Args:
             request: The HTTP request object.
             username (str): The username provided during authentication.
@@ -21,17 +65,41 @@ class MultiplyFieldBackend(ModelBackend):
             SiteUser or None: Returns the authenticated user if valid
              credentials are provided, otherwise returns None.
         """
-        try:
-            user = SiteUser.objects.get(username=username)
-        except ObjectDoesNotExist:
-            try:
-                # must be any register for email field
-                user = SiteUser.objects.get(email=username.lower())
-            except ObjectDoesNotExist:
-                try:
-                    user = SiteUser.objects.get(phone_number=username)
-                except ObjectDoesNotExist:
-                    return None
-
+        if not username or password is None:
+            return None
+        login_key = get_failed_logins_key(username)
+        if cache.get(login_key, 0) >= MAX_FAILED_LOGINS:
+            return None
+        user = self.get_user_by_login(username)
+        if user is None:
+            count_failed_login(login_key)
+            return None
+        key = get_failed_logins_key(user=user)
+        if cache.get(key, 0) >= MAX_FAILED_LOGINS:
+            return None
         if user.check_password(password):
             return user
+        count_failed_login(key)
+        return None
+
+    @staticmethod
+    def get_user_by_login(login: str):
+        """
+        Get the user by username, email or phone number, in this order
+         of priority when the login matches several users.
+
+        Args:
+            login (str): The login provided during authentication.
+
+        Returns:
+            SiteUser or None: The user or None if not found.
+        """
+        email = login.lower()
+
+        def priority(user: SiteUser) -> int:
+            if user.username == login:
+                return 0
+            return 1 if user.normalized_email == email else 2
+
+        return min(SiteUser.objects.filter_by_login(login), key=priority,
+                   default=None)
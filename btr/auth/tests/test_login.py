@@ -1,3 +1,9 @@
+from unittest.mock import patch
+
+from django.core.cache import cache
+
+from btr.auth.auth_backends import (MAX_FAILED_LOGINS, MultiplyFieldBackend,
+                                    get_failed_logins_key)
 from btr.test_init import BTRTestCase
 
 
@@ -59,3 +65,54 @@ class TestMultiplyLogin(BTRTestCase):
         )
         self.assertEqual(response.status_code, 200)
         self.assertTemplateUsed(response, 'forms/auth.html')
+
+
+class TestLoginBackend(BTRTestCase):
+
+    backend = MultiplyFieldBackend()
+
+    def authenticate(self, login: str, password: str = None):
+        return self.backend.authenticate(
+            None, username=login, password=password or self.password
+        )
+
+    def test_one_query(self):
+        for login in ('user1', 'USER1@example.com', '+79998887766',
+                      '8 (999) 888-77-66'):
+            with self.assertNumQueries(1):
+                self.assertEqual(self.authenticate(login), self.user)
+
+    def test_username_first(self):
+        self.user2.username = self.user.email
+        self.user2.set_password(self.password)
+        self.user2.save()
+        self.assertEqual(self.authenticate(self.user.email), self.user2)
+
+    def test_failed_logins_limit(self):
+        for _i in range(MAX_FAILED_LOGINS):
+            self.assertIsNone(self.authenticate('user1', 'wrong'))
+        # valid password doesn't help until the window is over
+        self.assertIsNone(self.authenticate('user1'))
+        cache.delete(get_failed_logins_key(user=self.user))
+        self.assertEqual(self.authenticate('user1'), self.user)
+
+    def test_failed_logins_shared_by_aliases(self):
+        aliases = ('user1', 'USER1@example.com', '+79998887766',
+                   '8 999 888-77-66', 'user1@example.com')
+        for login in aliases:
+            self.assertIsNone(self.authenticate(login, 'wrong'))
+        for login in aliases:
+            self.assertIsNone(self.authenticate(login))
+
+    def test_failed_login_key_expired(self):
+        key = get_failed_logins_key(user=self.user)
+        with patch('btr.auth.auth_backends.cache.incr',
+                   side_effect=ValueError):
+            self.assertIsNone(self.authenticate('user1', 'wrong'))
+        self.assertEqual(cache.get(key), 1)
+
+    def test_unknown_login(self):
+        for _i in range(MAX_FAILED_LOGINS):
+            self.assertIsNone(self.authenticate('unknown'))
+        with self.assertNumQueries(0):
+            self.assertIsNone(self.authenticate('unknown'))
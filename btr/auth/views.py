@@ -67,9 +67,9 @@ class ConfirmCodeView(SuccessMessageMixin, FormView):
         try:
             if verification_code == user_code:
                 password = SiteUser.objects.make_random_password(length=8)
-                user = SiteUser.objects.get(email=email)
+                user = SiteUser.objects.only('username').get(email=email)
                 user.set_password(password)
-                user.save()
+                user.save(update_fields=['password'])
                 # send recover message to user email with new sign in data
                 send_recover_message.delay(
                     email=email,
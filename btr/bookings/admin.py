@@ -1,13 +1,145 @@
-from django.contrib import admin
+from collections import defaultdict
+
+from celery import group
+from django.contrib import admin, messages
+from django.core.exceptions import ValidationError
+from django.db import transaction
 from django.urls import reverse
 from django.utils.html import format_html
 from django.utils.translation import gettext_lazy as _
 
+from btr.bookings.availability import AvailabilityCache
 from btr.bookings.models import Booking
 from btr.tasks.admin import send_vk_notify
 from btr.tasks.bookings import (send_confirm_message, send_cancel_message,
-                                send_edit_booking_message)
-from ..orm_utils import AsyncTools
+                                send_edit_booking_message,
+                                send_bulk_booking_messages)
+from ..orm_utils import AsyncTools, SlotsFinder
+
+
+def get_notify_data(booking: Booking) -> dict:
+    """
+    Collect booking details for notifications.
+
+    Args:
+        booking (Booking): Booking with selected related rider.
+
+    Returns:
+        dict: Booking details (see send_vk_notify).
+    """
+    f_phone = booking.foreign_number
+    date = booking.booking_date.strftime('%Y-%B-%d')
+    return {
+        'pk': booking.pk,
+        'client': booking.rider.username,
+        'email': booking.rider.email,
+        'date': AsyncTools().get_friendly_date(date),
+        'start': booking.start_time.strftime('%H:%M'),
+        'end': booking.end_time.strftime('%H:%M'),
+        'bikes': booking.bike_count,
+        # check if foreign booking
+        'phone': str(f_phone if f_phone else booking.rider.phone_number),
+        'status': str(booking.status),
+    }
+
+
+def format_ids(ids) -> str:
+    """
+    Format booking ids for admin messages (e.g. '#1, #2').
+    """
+    return ', '.join(f'#{pk}' for pk in ids)
+
+
+def change_status(modeladmin, request, queryset, status: str,
+                  action: str) -> None:
+    """
+    Set status of selected bookings with one UPDATE and notify clients.
+
+    Completed bookings and bookings which already have the status are
+     skipped. Canceled bookings are admitted again (see SlotsFinder.admit)
+     before they get an active status, ones whose time is taken meanwhile
+     are skipped too. Notifications are sent as a single Celery group after the
+     transaction commits, emails of all clients are rendered in one task.
+     Outcomes are reported with admin messages.
+
+    Args:
+        modeladmin: The admin class instance.
+        request: The HTTP request object.
+        queryset: Queryset containing selected bookings.
+        status (str): New status of bookings.
+        action (str): Email action ('confirm' or 'cancel').
+    """
+    skipped = defaultdict(list)
+    unavailable, changed, admitted = [], [], set()
+    with transaction.atomic():
+        bookings = queryset.select_related('rider').select_for_update(
+            of=('self',)
+        ).order_by('pk')
+        for booking in bookings:
+            if booking.status in (status, _('completed')):
+                skipped[booking.status].append(booking.pk)
+            elif booking.status == _('canceled'):
+                # its bikes were released, the time may be taken since
+                booking.status = status
+                try:
+                    SlotsFinder(booking.booking_date.isoformat()).admit(
+                        booking
+                    )
+                except ValidationError:
+                    unavailable.append(booking.pk)
+                    continue
+                admitted.add(booking.pk)
+                changed.append(booking)
+            else:
+                changed.append(booking)
+        Booking.objects.filter(
+            pk__in=[booking.pk for booking in changed
+                    if booking.pk not in admitted]
+        ).update(status=status)
+        # bulk update skips signals
+        AvailabilityCache.invalidate(
+            *{booking.booking_date for booking in changed}
+        )
+        via = str(_('Admin panel'))
+        notifications, emails = [], []
+        for booking in changed:
+            booking.status = status
+            data = get_notify_data(booking)
+            notifications.append(
+                send_vk_notify.s(via, False, data, is_admin=True)
+            )
+            emails.append(data)
+        if emails:
+            notifications.append(send_bulk_booking_messages.s(action, emails))
+            transaction.on_commit(group(notifications).apply_async)
+    if changed:
+        modeladmin.message_user(
+            request,
+            _('Bookings {ids}: status changed to "{status}"').format(
+                ids=format_ids(booking.pk for booking in changed),
+                status=status,
+            ),
+            messages.SUCCESS,
+            fail_silently=True,
+        )
+    for old_status, ids in skipped.items():
+        modeladmin.message_user(
+            request,
+            _('Bookings {ids} skipped: status is already "{status}"').format(
+                ids=format_ids(ids),
+                status=old_status,
+            ),
+            messages.WARNING,
+            fail_silently=True,
+        )
+    if unavailable:
+        modeladmin.message_user(
+            request,
+            _('Bookings {ids} skipped: their time is no longer '
+              'available').format(ids=format_ids(unavailable)),
+            messages.WARNING,
+            fail_silently=True,
+        )
 
 
 @admin.action(description=_('Confirm selected bookings'))
@@ -29,29 +161,7 @@ def make_confirm(modeladmin, request, queryset) -> None:
         This will mark the selected bookings as 'confirmed' and trigger
          notifications to the client.
     """
-    for booking in queryset:
-        booking.status = _('confirmed')
-        booking.save()
-        f_phone = booking.foreign_number
-        # check if foreign booking
-        phone = f_phone if f_phone else booking.rider.phone_number
-        date = booking.booking_date.strftime('%Y-%B-%d')
-        via = _('Admin panel')
-        data = {
-            'pk': booking.pk,
-            'client': booking.rider.username,
-            'date': AsyncTools().get_friendly_date(date),
-            'start': booking.start_time.strftime('%H:%M'),
-            'end': booking.end_time.strftime('%H:%M'),
-            'bikes': booking.bike_count,
-            'phone': str(phone),
-            'status': booking.status,
-            'email': booking.rider.email,
-        }
-        # send message to admin
-        send_vk_notify.delay(via, False, data, is_admin=True)
-        # send confirm message to user email
-        send_confirm_message.delay(**data)
+    change_status(modeladmin, request, queryset, _('confirmed'), 'confirm')
 
 
 @admin.action(description=_('Cancel selected bookings'))
@@ -73,25 +183,7 @@ def make_cancel(modeladmin, request, queryset) -> None:
         This will mark the selected bookings as 'canceled' and trigger
          notifications to the client.
     """
-    for booking in queryset:
-        booking.status = _('canceled')
-        booking.save()
-        f_phone = booking.foreign_number
-        date = booking.booking_date.strftime('%Y-%B-%d')
-        via = _('Admin panel')
-        data = {
-            'pk': booking.pk,
-            'client': booking.rider.username,
-            'email': booking.rider.email,
-            'date': AsyncTools().get_friendly_date(date),
-            'start': booking.start_time.strftime('%H:%M'),
-            'end': booking.end_time.strftime('%H:%M'),
-            'bikes': booking.bike_count,
-            'phone': str(f_phone if f_phone else booking.rider.phone_number),
-            'status': booking.status,
-        }
-        send_vk_notify.delay(via, False, data, is_admin=True)
-        send_cancel_message.delay(**data)
+    change_status(modeladmin, request, queryset, _('canceled'), 'cancel')
 
 
 class RiderAdminFilter(admin.SimpleListFilter):
@@ -0,0 +1,199 @@
+import hashlib
+import time
+from datetime import date, datetime
+from typing import Callable, Iterable, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from btr.metrics import record_cache
+
+
+class AvailabilityCache:
+    """
+    Per-date availability cache built on Django's cache framework.
+
+    Every entry is stamped with the global version (bumped on work hours
+     changes) and the day version (bumped on booking or day settings
+     changes). An entry is only valid while both versions are unchanged, so
+     a single get_many round trip is enough to read an unchanged day.
+
+    Example:
+        cache = AvailabilityCache()
+        value = cache.get_or_set('2024-03-29', compute_day)
+    """
+
+    prefix = 'availability'
+    # bump when the layout of cached values changes
+    schema = 3
+    timeout = 60 * 60 * 24
+
+    @staticmethod
+    def normalize(day: date | str) -> str:
+        """
+        Bring a date or a 'YYYY-M-D' string to ISO format.
+
+        Args:
+            day (date | str): The date to normalize.
+
+        Returns:
+            str: Date in the format 'YYYY-MM-DD'.
+        """
+        if isinstance(day, datetime):
+            return day.date().isoformat()
+        if isinstance(day, date):
+            return day.isoformat()
+        return datetime.strptime(day, '%Y-%m-%d').date().isoformat()
+
+    @classmethod
+    def global_key(cls) -> str:
+        return f'{cls.prefix}:version'
+
+    @classmethod
+    def version_key(cls, day: str) -> str:
+        return f'{cls.prefix}:version:{day}'
+
+    @classmethod
+    def entry_key(cls, day: str) -> str:
+        # values depend on the fleet size, so it is a part of the layout
+        return f'{cls.prefix}:{cls.schema}:{settings.FLEET_SIZE}:{day}'
+
+    def get_many(self, days: Iterable[date | str]) -> Tuple[dict, dict]:
+        """
+        Read cached entries for several dates in one round trip.
+
+        Args:
+            days (Iterable): Dates to read.
+
+        Returns:
+            tuple: A dict of valid cached values and a dict of version stamps
+             to store freshly computed values with (both keyed by the
+             original date).
+        """
+        days = {day: self.normalize(day) for day in days}
+        keys = [self.global_key()]
+        for day in days.values():
+            keys.extend((self.version_key(day), self.entry_key(day)))
+        data = cache.get_many(keys)
+        found, missing = {}, {}
+        for original, day in days.items():
+            stamp = (data.get(self.global_key()),
+                     data.get(self.version_key(day)))
+            entry = data.get(self.entry_key(day))
+            if None not in stamp and entry and entry['version'] == stamp:
+                found[original] = entry['value']
+            else:
+                missing[original] = day
+        record_cache(hits=len(found), misses=len(missing))
+        return found, self._get_stamps(missing, data)
+
+    def get_version(self, days: Iterable[date | str]) -> str:
+        """
+        Get a version of several dates (e.g. a month), which changes when
+         any of them or the global version is bumped.
+
+        Args:
+            days (Iterable): Dates of the version.
+
+        Returns:
+            str: Short digest of the version stamps.
+        """
+        days = {day: self.normalize(day) for day in days}
+        keys = [self.global_key()]
+        keys.extend(self.version_key(day) for day in days.values())
+        stamps = self._get_stamps(days, cache.get_many(keys))
+        digest = hashlib.md5(repr(
+            [settings.FLEET_SIZE] + [stamps[day] for day in days]
+        ).encode())
+        return digest.hexdigest()
+
+    def set_many(self, values: dict, stamps: dict) -> None:
+        """
+        Store computed values with stamps taken before the computation.
+
+        Args:
+            values (dict): Computed values keyed by date.
+            stamps (dict): Stamps returned by get_many for the same dates.
+        """
+        cache.set_many({
+            self.entry_key(self.normalize(day)): {
+                'version': stamps[day],
+                'value': value,
+            } for day, value in values.items()
+        }, self.timeout)
+
+    def get_or_set(self, day: date | str, compute: Callable):
+        """
+        Get a cached value for the date or compute and store it.
+
+        Args:
+            day (date | str): The date of the entry.
+            compute (Callable): Function without arguments producing value.
+
+        Returns:
+            Any: The cached or computed value.
+        """
+        found, stamps = self.get_many([day])
+        if day in found:
+            return found[day]
+        value = compute()
+        self.set_many({day: value}, stamps)
+        return value
+
+    def _get_stamps(self, days: dict, data: dict) -> dict:
+        """
+        Get current version stamps, creating missing version keys.
+
+        Version keys are created with a time based value so an evicted key
+         never comes back with a value an old entry was stamped with.
+        """
+        if not days:
+            return {}
+        keys = [self.global_key()]
+        keys.extend(self.version_key(day) for day in days.values())
+        if any(key not in data for key in keys):
+            for key in keys:
+                if key not in data:
+                    cache.add(key, time.time_ns(), None)
+            data = cache.get_many(keys)
+        return {
+            original: (data.get(self.global_key()),
+                       data.get(self.version_key(day)))
+            for original, day in days.items()
+        }
+
+    @staticmethod
+    def _bump(key: str) -> None:
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, time.time_ns(), None)
+
+    @classmethod
+    def invalidate(cls, *days: date | str | None) -> None:
+        """
+        Bump day versions now and once more after the transaction commits.
+
+        The second bump drops entries which concurrent readers could compute
+         from not yet committed data.
+
+        Args:
+            *days: Dates to invalidate, None values are ignored.
+        """
+        keys = {cls.version_key(cls.normalize(day)) for day in days if day}
+
+        def bump():
+            for key in keys:
+                cls._bump(key)
+
+        bump()
+        transaction.on_commit(bump)
+
+    @classmethod
+    def invalidate_all(cls) -> None:
+        """
+        Bump the global version, which drops every cached date.
+        """
+        cls._bump(cls.global_key())
+        transaction.on_commit(lambda: cls._bump(cls.global_key()))
@@ -1,9 +1,38 @@
 from django import forms
+from django.conf import settings
 from django.utils.translation import gettext_lazy as _
 
 from .models import Booking
+from .occupancy import RidePolicy
+from ..orm_utils import SlotsFinder
 from .validators import (validate_slots, validate_start_time,
-                         validate_equal_hour, validate_bikes)
+                         validate_ride_time, validate_bikes)
+
+
+def ride_time_error(policy: RidePolicy) -> str:
+    """
+    Explain the ride time rules of the policy.
+
+    Args:
+        policy (RidePolicy): Scheduling policy of the track.
+
+    Returns:
+        str: Error message for the end time field.
+    """
+    if (policy.step, policy.min_ride, policy.max_ride) == (60, 60, None):
+        return _('Common ride time must be equal to hour')
+    limit = policy.max_ride or '∞'
+    return _(
+        'Ride must start and last in steps of {step} min, '
+        '{min_ride}-{max_ride} min long'
+    ).format(step=policy.step, min_ride=policy.min_ride, max_ride=limit)
+
+
+def bikes_error() -> str:
+    """Explain the bikes limit of the fleet"""
+    return _('Bikes count must be at 1-{fleet}').format(
+        fleet=settings.FLEET_SIZE
+    )
 
 
 class BookingForm(forms.ModelForm):
@@ -11,14 +40,12 @@ class BookingForm(forms.ModelForm):
     Custom form for booking management.
 
     Usage:
-        Form automatically get available slots and set chosen date from view.
+        Form gets chosen date from view and checks the desired time against
+         free slots of the date found on the server.
     """
     def __init__(self, *args, **kwargs):
-        available_slots = kwargs.pop('available_slots', None)
         current_date = kwargs.pop('current_date', None)
         super(BookingForm, self).__init__(*args, **kwargs)
-        if available_slots:
-            self.initial['available_slots'] = available_slots
         self.initial['date'] = current_date
 
     class Meta:
@@ -35,8 +62,8 @@ class BookingForm(forms.ModelForm):
         Custom validation for booking form fields.
 
         Example:
-            Validate start and end times, slot availability, and equal ride
-             duration.
+            Validate start and end times, slot availability, and ride
+             duration against the scheduling policy.
         """
         cleaned_data = super().clean()
         start_time = cleaned_data.get('start_time')
@@ -44,11 +71,13 @@ class BookingForm(forms.ModelForm):
         bikes = cleaned_data.get('bike_count')
 
         if start_time and end_time:
-            start = start_time.strftime('%H:%M')
-            end = end_time.strftime('%H:%M')
-            desired_slot = (start, end)
-            available_slots = self.initial.get('available_slots')
+            desired_slot = (start_time, end_time)
             current_date = self.initial.get('date')
+            finder = SlotsFinder(current_date)
+            # slots with enough free bikes (at least one if count is wrong)
+            available_slots = finder.find_available_slots(
+                bikes if validate_bikes(bikes) else 1
+            )
             # validate time format
             if not validate_start_time(start_time, current_date):
                 self.add_error(
@@ -56,7 +85,7 @@ class BookingForm(forms.ModelForm):
                     _('Selected start time can\'t be in past')
                 )
             # check if chosen time are available
-            if not validate_slots(eval(available_slots), desired_slot):
+            if not validate_slots(available_slots, desired_slot):
                 self.add_error(
                     'start_time',
                     _('Selected time is not available for booking')
@@ -65,18 +94,12 @@ class BookingForm(forms.ModelForm):
                     'end_time',
                     _('Selected time is not available for booking')
                 )
-            # check if ride time are equal 1 hour
-            if not validate_equal_hour(start_time, end_time):
-                self.add_error(
-                    'end_time',
-                    _('Common ride time must be equal to hour')
-                )
+            # check ride time against the granularity and length limits
+            if not validate_ride_time(start_time, end_time, finder.policy):
+                self.add_error('end_time', ride_time_error(finder.policy))
             # validate bikes count
             if not validate_bikes(bikes):
-                self.add_error(
-                    'bike_count',
-                    _('Bikes count must be at 1-4')
-                )
+                self.add_error('bike_count', bikes_error())
         return cleaned_data
 
 
@@ -85,11 +108,8 @@ class BookingEditForm(forms.ModelForm):
     Custom form for edit booking details.
     """
     def __init__(self, *args, **kwargs):
-        slots = kwargs.pop('slots', None)
         date = kwargs.pop('date', None)
         super(BookingEditForm, self).__init__(*args, **kwargs)
-        if slots:
-            self.initial['slots'] = slots
         self.initial['date'] = date
 
     class Meta:
@@ -108,11 +128,14 @@ class BookingEditForm(forms.ModelForm):
         bikes = cleaned_data.get('bike_count')
 
         if start_time and end_time:
-            start = start_time.strftime('%H:%M')
-            end = end_time.strftime('%H:%M')
-            desired_slot = (start, end)
-            available_slots = self.initial.get('slots')
+            desired_slot = (start_time, end_time)
             current_date = self.initial.get('date')
+            finder = SlotsFinder(current_date)
+            # the edited booking doesn't take bikes from itself
+            available_slots = finder.find_available_slots(
+                bikes if validate_bikes(bikes) else 1,
+                excluded_pk=self.instance.pk,
+            )
             if not validate_start_time(start_time, current_date):
                 self.add_error(
                     'start_time',
@@ -127,16 +150,10 @@ class BookingEditForm(forms.ModelForm):
                     'end_time',
                     _('Selected time is not available for booking')
                 )
-            if not validate_equal_hour(start_time, end_time):
-                self.add_error(
-                    'end_time',
-                    _('Common ride time must be equal to hour')
-                )
+            if not validate_ride_time(start_time, end_time, finder.policy):
+                self.add_error('end_time', ride_time_error(finder.policy))
             if not validate_bikes(bikes):
-                self.add_error(
-                    'bike_count',
-                    _('Bikes count must be at 1-4')
-                )
+                self.add_error('bike_count', bikes_error())
         return cleaned_data
 
 
@@ -0,0 +1,84 @@
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator
+
+from django.core.cache import cache
+
+from btr.metrics import record_cache
+
+
+# rendered calendar fragments, names are used in the stats
+FRAGMENTS = ('calendar-current', 'calendar-next', 'calendar-modals')
+# keys change with availability versions, old ones just expire
+FRAGMENT_TIMEOUT = 60 * 60 * 24
+
+STATS_PREFIX = 'fragments:stats'
+STATS_FIELDS = ('hits', 'misses', 'hit_us', 'miss_us')
+
+
+def get_stats_key(name: str, field: str) -> str:
+    return f'{STATS_PREFIX}:{name}:{field}'
+
+
+def incr(key: str, delta: int = 1) -> None:
+    cache.add(key, 0, None)
+    try:
+        cache.incr(key, delta)
+    except ValueError:
+        # evicted between add and incr
+        cache.set(key, delta, None)
+
+
+@contextmanager
+def track(name: str) -> Iterator[dict]:
+    """
+    Count a fragment render as a hit or a miss and add up its time.
+
+    Example:
+        with track('calendar-current') as render:
+            render['hit'] = value is not None
+    """
+    render = {'hit': False}
+    started = time.perf_counter()
+    yield render
+    elapsed = int((time.perf_counter() - started) * 1e6)
+    record_cache(hits=int(render['hit']), misses=int(not render['hit']))
+    if render['hit']:
+        incr(get_stats_key(name, 'hits'))
+        incr(get_stats_key(name, 'hit_us'), elapsed)
+    else:
+        incr(get_stats_key(name, 'misses'))
+        incr(get_stats_key(name, 'miss_us'), elapsed)
+
+
+def get_stats() -> Dict[str, dict]:
+    """
+    Get hit ratio and mean render times of calendar fragments.
+
+    Returns:
+        dict: Stats keyed by fragment name: 'hits', 'misses', 'hit_ratio',
+         'hit_ms' and 'miss_ms' (mean time of a cached and a rendered
+          fragment).
+    """
+    keys = [get_stats_key(name, field)
+            for name in FRAGMENTS for field in STATS_FIELDS]
+    data = cache.get_many(keys)
+    stats = {}
+    for name in FRAGMENTS:
+        hits, misses, hit_us, miss_us = (
+            data.get(get_stats_key(name, field), 0) for field in STATS_FIELDS
+        )
+        total = hits + misses
+        stats[name] = {
+            'hits': hits,
+            'misses': misses,
+            'hit_ratio': hits / total if total else 0.0,
+            'hit_ms': hit_us / hits / 1000 if hits else 0.0,
+            'miss_ms': miss_us / misses / 1000 if misses else 0.0,
+        }
+    return stats
+
+
+def reset_stats() -> None:
+    cache.delete_many([get_stats_key(name, field)
+                       for name in FRAGMENTS for field in STATS_FIELDS])
@@ -0,0 +1,317 @@
+import calendar
+import json
+import platform
+import random
+import time
+import tracemalloc
+from datetime import date, datetime, timedelta
+
+import django
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import Client
+from django.urls import reverse
+from django.utils.translation import gettext as _
+
+from btr.bookings.availability import AvailabilityCache
+from btr.bookings.models import Booking
+from btr.orm_utils import AsyncTools, LoadCalc, SlotsFinder
+from btr.tg_bot.utils.handlers import (check_available_hours, extract_hours,
+                                       extract_start_times, get_end_time)
+from btr.users.models import SiteUser
+from btr.workhours.models import DayControl
+
+
+SCALES = {'1k': 1_000, '100k': 100_000, '1m': 1_000_000}
+
+
+class QueryCounter:
+    """
+    Database execute wrapper counting queries. Unlike the debug queries log
+     it isn't reset by requests of the test client.
+    """
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+class Command(BaseCommand):
+    """
+    Benchmark the availability, calendar and booking hot paths on seeded
+     data of several sizes.
+
+    Every scale is seeded inside a transaction which is always rolled back.
+     Bookings are spread to keep about 25 of them per day, so bigger
+     scales grow the tables rather than the days. Every path reports the
+     median, min and max wall time, the query count and the peak of
+     traced allocations (measured in a separate run, tracing slows the
+     code down). Cold runs bump the availability version before each run,
+     the cache itself is never cleared.
+
+    Results can be written as JSON and compared with a previous file,
+     the command fails if a path got slower than the threshold or makes
+     more queries.
+
+    Usage:
+        python manage.py bench --scale 1k 100k --json bench.json
+        python manage.py bench --scale 1k --compare bench.json
+    """
+
+    help = 'Benchmark availability, calendar and booking hot paths'
+
+    bookings_per_day = 25
+    bookings_per_rider = 50
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scale', nargs='+', choices=SCALES,
+                            default=['1k'])
+        parser.add_argument('--bookings', type=int, nargs='+',
+                            help='custom scales, overrides --scale')
+        parser.add_argument('--repeat', type=int, default=5)
+        parser.add_argument('--json', help='write results to the file')
+        parser.add_argument('--compare',
+                            help='previous results to compare with')
+        parser.add_argument('--threshold', type=float, default=0.2,
+                            help='allowed slowdown of the median')
+
+    def handle(self, *args, **options):
+        scales = options['bookings'] or [SCALES[name]
+                                         for name in options['scale']]
+        results = []
+        for bookings in scales:
+            with transaction.atomic():
+                self.seed(bookings)
+                results.extend(self.run(bookings, options['repeat']))
+                transaction.set_rollback(True)
+        report = {'meta': self.get_meta(options['repeat']),
+                  'results': results}
+        if options['json']:
+            with open(options['json'], 'w') as file:
+                json.dump(report, file, indent=2)
+            self.stdout.write(f'Results are written to {options["json"]}')
+        if options['compare']:
+            with open(options['compare']) as file:
+                previous = json.load(file)
+            regressions = self.compare(previous['results'], results,
+                                       options['threshold'])
+            if regressions:
+                raise CommandError(
+                    f'{len(regressions)} regressions: '
+                    + ', '.join(regressions)
+                )
+
+    @staticmethod
+    def get_meta(repeat: int) -> dict:
+        return {
+            'created': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'database': connection.vendor,
+            'fleet': settings.FLEET_SIZE,
+            'repeat': repeat,
+        }
+
+    def seed(self, bookings: int) -> None:
+        """
+        Create riders, bookings and day settings from the current month on.
+
+        Args:
+            bookings (int): Count of bookings.
+        """
+        started = time.perf_counter()
+        rnd = random.Random(0)
+        self.first_date = date.today().replace(day=1)
+        days = max(bookings // self.bookings_per_day, 62)
+        riders = SiteUser.objects.bulk_create([
+            SiteUser(
+                username=f'bench_{i}',
+                email=f'bench_{i}@bench.local',
+                phone_number=f'+7900{i:07d}',
+                first_name='bench',
+            ) for i in range(max(bookings // self.bookings_per_rider, 10))
+        ], batch_size=1000)
+        self.rider = riders[0]
+        statuses = [_('pending'), _('confirmed'), _('completed'),
+                    _('canceled')]
+        batch = []
+        for _i in range(bookings):
+            start = rnd.randint(10, 20)
+            batch.append(Booking(
+                rider=rnd.choice(riders),
+                booking_date=self.first_date + timedelta(
+                    days=rnd.randrange(days)
+                ),
+                start_time=f'{start}:00',
+                end_time=f'{start + 1}:00',
+                bike_count=rnd.randint(1, settings.FLEET_SIZE),
+                status=rnd.choice(statuses),
+            ))
+            if len(batch) == 10_000:
+                Booking.objects.bulk_create(batch)
+                batch = []
+        Booking.objects.bulk_create(batch)
+        # closed days and days with short hours
+        DayControl.objects.bulk_create([
+            DayControl(date=self.first_date + timedelta(days=day),
+                       is_closed=True)
+            if day % 30 == 29 else
+            DayControl(date=self.first_date + timedelta(days=day),
+                       open='12:00', close='20:00')
+            for day in range(3, days, 7)
+        ], ignore_conflicts=True)
+        # a day after the seeded ones for bookings made by the bot flow
+        self.free_date = self.first_date + timedelta(days=days)
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            f'{bookings} bookings, {days} days, {len(riders)} riders '
+            f'seeded in {time.perf_counter() - started:.1f}s'
+        ))
+
+    def get_paths(self) -> dict:
+        """
+        Hot paths as name: (prepare, run), prepare is called before every
+         run and isn't measured.
+        """
+        day = (self.first_date + timedelta(days=10)).isoformat()
+        month_cal = calendar.monthcalendar(self.first_date.year,
+                                           self.first_date.month)
+        client = Client(HTTP_HOST='localhost')
+        client.force_login(self.rider)
+        profile_url = reverse('profile', args=[self.rider.pk])
+
+        def cold():
+            AvailabilityCache.invalidate_all()
+
+        def warm():
+            pass
+
+        def month_load():
+            LoadCalc(month_cal, self.first_date.year,
+                     self.first_date.month).get_month_load()
+
+        def day_slots():
+            SlotsFinder(day).find_available_slots()
+
+        def index_view():
+            client.get(reverse('bookings'))
+
+        def user_view():
+            client.get(profile_url)
+
+        def bot_book_flow():
+            # savepoint keeps every run on the same data
+            with transaction.atomic():
+                async_to_sync(self.book_flow)(self.rider.email,
+                                              self.free_date.isoformat())
+                transaction.set_rollback(True)
+
+        return {
+            'month_load_cold': (cold, month_load),
+            'month_load_warm': (warm, month_load),
+            'day_slots_cold': (cold, day_slots),
+            'day_slots_warm': (warm, day_slots),
+            'index_view_cold': (cold, index_view),
+            'index_view_warm': (warm, index_view),
+            'user_view': (warm, user_view),
+            'bot_book_flow': (cold, bot_book_flow),
+        }
+
+    @staticmethod
+    async def book_flow(email: str, day: str) -> None:
+        """
+        Data layer of the bot /book dialog: rider, free slots, start times,
+         hours and the booking admission.
+        """
+        tools = AsyncTools()
+        user_info = await tools.get_user_info(email=email)
+        finder = SlotsFinder(day)
+        free_slots = await finder.find_free_intervals_as(bikes=1)
+        policy = await finder.get_policy_as()
+        start = extract_start_times(free_slots, policy)[0]
+        hours = extract_hours(free_slots, start, policy)[0]
+        check_available_hours(start, hours, free_slots, policy)
+        await tools.make_booking({
+            'pk': user_info.get('pk'),
+            'date': day,
+            'start': start,
+            'end': get_end_time(start, hours),
+            'bikes': 1,
+        })
+
+    def run(self, bookings: int, repeat: int) -> list:
+        results = []
+        for name, (prepare, path) in self.get_paths().items():
+            # warm up imports, templates and the cache of warm paths
+            prepare()
+            path()
+            timings = []
+            for _i in range(repeat):
+                prepare()
+                queries = QueryCounter()
+                with connection.execute_wrapper(queries):
+                    started = time.perf_counter()
+                    path()
+                    timings.append(time.perf_counter() - started)
+            prepare()
+            tracemalloc.start()
+            path()
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            timings.sort()
+            result = {
+                'path': name,
+                'bookings': bookings,
+                'median_ms': round(timings[len(timings) // 2] * 1000, 3),
+                'min_ms': round(timings[0] * 1000, 3),
+                'max_ms': round(timings[-1] * 1000, 3),
+                'queries': queries.count,
+                'peak_kb': round(peak / 1024, 1),
+            }
+            results.append(result)
+            self.stdout.write(
+                f'{name:<16} median {result["median_ms"]:9.2f}ms  '
+                f'max {result["max_ms"]:9.2f}ms  '
+                f'{result["queries"]:3d} queries  '
+                f'peak {result["peak_kb"]:9.1f}KB'
+            )
+        return results
+
+    def compare(self, previous: list, current: list,
+                threshold: float) -> list:
+        """
+        Print changes against previous results.
+
+        Args:
+            previous (list): Results of an earlier run.
+            current (list): Results of this run.
+            threshold (float): Allowed slowdown of the median (0.2 = 20%).
+
+        Returns:
+            list: Names of regressed paths.
+        """
+        before = {(result['path'], result['bookings']): result
+                  for result in previous}
+        regressions = []
+        self.stdout.write(self.style.MIGRATE_HEADING('Compared to previous'))
+        for result in current:
+            key = (result['path'], result['bookings'])
+            if key not in before:
+                continue
+            old = before[key]
+            change = result['median_ms'] / max(old['median_ms'], 0.001) - 1
+            line = (f'{result["path"]:<16} {result["bookings"]:>8} '
+                    f'{change:+8.1%}  queries {old["queries"]} -> '
+                    f'{result["queries"]}')
+            if change > threshold or result['queries'] > old['queries']:
+                regressions.append(f'{result["path"]}@{result["bookings"]}')
+                self.stdout.write(self.style.ERROR(line))
+            else:
+                self.stdout.write(line)
+        return regressions
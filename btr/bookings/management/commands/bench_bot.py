@@ -0,0 +1,98 @@
+import asyncio
+import time
+
+from asgiref.sync import async_to_sync
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils.translation import gettext as _
+
+from btr.bookings.models import Booking
+from btr.orm_utils import AsyncTools, SlotsFinder
+from btr.users.models import SiteUser
+
+
+class Command(BaseCommand):
+    """
+    Load test of the bot data layer: N chats run the "my bookings" flow
+     concurrently (user info, bookings list, booking details and free
+     slots of the day), every step is followed by a Telegram round trip.
+
+    Data is seeded inside a transaction which is always rolled back.
+
+    Usage:
+        python manage.py bench_bot --chats 1 4 16 64 --latency-ms 20
+    """
+
+    help = 'Load test bot ORM calls with concurrent simulated chats'
+
+    date = '9999-01-15'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chats', type=int, nargs='+',
+                            default=[1, 4, 16, 64])
+        parser.add_argument('--flows', type=int, default=5,
+                            help='flows run by every chat')
+        parser.add_argument('--latency-ms', type=float, default=20,
+                            help='simulated Telegram round trip per step')
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            emails = self.seed(max(options['chats']))
+            for chats in options['chats']:
+                started = time.perf_counter()
+                steps = async_to_sync(self.run)(
+                    emails[:chats],
+                    options['flows'],
+                    options['latency_ms'] / 1000,
+                )
+                self.report(chats, steps, started)
+            transaction.set_rollback(True)
+
+    def seed(self, count: int) -> list:
+        riders = SiteUser.objects.bulk_create([
+            SiteUser(
+                username=f'bench_{i}',
+                email=f'bench_{i}@bench.local',
+                phone_number=f'+7900{i:07d}',
+                first_name='bench',
+            ) for i in range(count)
+        ])
+        Booking.objects.bulk_create([
+            Booking(
+                rider=rider,
+                booking_date=self.date,
+                start_time='10:00',
+                end_time='11:00',
+                bike_count=1,
+                status=_('pending'),
+            ) for rider in riders
+        ])
+        return [rider.email for rider in riders]
+
+    async def run(self, emails: list, flows: int, latency: float) -> int:
+        results = await asyncio.gather(*(
+            self.chat(email, flows, latency) for email in emails
+        ))
+        return sum(results)
+
+    async def chat(self, email: str, flows: int, latency: float) -> int:
+        tools = AsyncTools()
+        steps = 0
+        for _i in range(flows):
+            await tools.get_user_info(email=email)
+            await asyncio.sleep(latency)
+            bookings = await tools.get_user_bookings(email=email)
+            await asyncio.sleep(latency)
+            await tools.get_booking_info(pk=bookings['bookings_id'][0])
+            await asyncio.sleep(latency)
+            await SlotsFinder(self.date).find_free_intervals_as()
+            await asyncio.sleep(latency)
+            steps += 4
+        return steps
+
+    def report(self, chats: int, steps: int, started: float) -> None:
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            f'{chats:>4} chats: {steps} steps in {elapsed:.3f}s '
+            f'({steps / elapsed:.0f} steps/s)'
+        )
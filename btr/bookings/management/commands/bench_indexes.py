@@ -0,0 +1,154 @@
+import random
+import time
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import connection, models, transaction
+from django.utils.translation import gettext as _
+
+from btr.bookings.models import Booking
+from btr.users.models import SiteUser
+from btr.workhours.models import DayControl
+
+
+class Command(BaseCommand):
+    """
+    Compare query plans and timings of the booking hot paths with and
+     without indexes.
+
+    Data is seeded inside a transaction which is always rolled back. The
+     "before" run drops the indexes with the schema editor and the "after"
+     run creates them back (DDL is transactional on SQLite and PostgreSQL),
+     so the database is left untouched.
+
+    Usage:
+        python manage.py bench_indexes --bookings 100000
+    """
+
+    help = 'Benchmark booking queries on seeded data with and without indexes'
+
+    first_date = date(9000, 1, 1)
+
+    def add_arguments(self, parser):
+        parser.add_argument('--bookings', type=int, default=100_000)
+        parser.add_argument('--riders', type=int, default=1000)
+        parser.add_argument('--days', type=int, default=1000)
+        parser.add_argument('--repeat', type=int, default=20)
+        parser.add_argument('--no-explain', action='store_true')
+
+    def handle(self, *args, **options):
+        # SQLite schema editor refuses to work inside atomic with
+        # foreign key checks enabled
+        disabled = connection.disable_constraint_checking()
+        try:
+            with transaction.atomic():
+                self.seed(options)
+                self.toggle_indexes(drop=True)
+                self.run('before (without indexes)', options)
+                self.toggle_indexes(drop=False)
+                self.run('after (with indexes)', options)
+                transaction.set_rollback(True)
+        finally:
+            if disabled:
+                connection.enable_constraint_checking()
+
+    def seed(self, options) -> None:
+        """
+        Create riders, bookings and day settings for the benchmark.
+        """
+        started = time.perf_counter()
+        random.seed(0)
+        riders = SiteUser.objects.bulk_create([
+            SiteUser(
+                username=f'bench_{i}',
+                email=f'bench_{i}@bench.local',
+                phone_number=f'+7900{i:07d}',
+                first_name='bench',
+            ) for i in range(options['riders'])
+        ], batch_size=1000)
+        statuses = [_('pending'), _('confirmed'), _('completed'),
+                    _('canceled')]
+        bookings = []
+        for _i in range(options['bookings']):
+            start = random.randint(10, 20)
+            bookings.append(Booking(
+                rider=random.choice(riders),
+                booking_date=self.first_date + timedelta(
+                    days=random.randrange(options['days'])
+                ),
+                start_time=f'{start}:00',
+                end_time=f'{start + 1}:00',
+                bike_count=1,
+                status=random.choice(statuses),
+            ))
+        Booking.objects.bulk_create(bookings, batch_size=5000)
+        DayControl.objects.bulk_create([
+            DayControl(date=self.first_date + timedelta(days=day),
+                       is_closed=True)
+            for day in range(0, options['days'], 7)
+        ])
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+        self.stdout.write(
+            f'Seeded {options["bookings"]} bookings '
+            f'in {time.perf_counter() - started:.1f}s'
+        )
+
+    def get_queries(self) -> dict:
+        day = self.first_date + timedelta(days=10)
+        rider = SiteUser.objects.filter(username='bench_0').first()
+        return {
+            'day slots': Booking.objects.filter(
+                booking_date=day).exclude(status=_('canceled')),
+            'month load': Booking.objects.filter(
+                booking_date__range=(day, day + timedelta(days=30))
+            ).exclude(status=_('canceled')),
+            'rider bookings': Booking.objects.filter(rider=rider).exclude(
+                status__in=[_('completed'), _('canceled')]),
+            'status sweep': Booking.objects.filter(
+                status=_('confirmed'), booking_date__lte=day),
+            'day settings': DayControl.objects.filter(date=day),
+        }
+
+    def run(self, title: str, options) -> None:
+        self.stdout.write(self.style.MIGRATE_HEADING(title))
+        for name, queryset in self.get_queries().items():
+            timings = []
+            for _i in range(options['repeat']):
+                started = time.perf_counter()
+                list(queryset.all())
+                timings.append(time.perf_counter() - started)
+            timings.sort()
+            self.stdout.write(
+                f'{name:<16} median {timings[len(timings) // 2] * 1000:8.2f}ms'
+                f'  max {timings[-1] * 1000:8.2f}ms'
+            )
+            if not options['no_explain']:
+                self.stdout.write(f'    {queryset.explain()}')
+
+    @staticmethod
+    def toggle_indexes(drop: bool) -> None:
+        """
+        Drop or restore the hot path indexes inside current transaction.
+
+        Args:
+            drop (bool): Drop indexes if True, create them back otherwise.
+        """
+        date_field = DayControl._meta.get_field('date')
+        name, path, args, kwargs = date_field.deconstruct()
+        kwargs['unique'] = False
+        plain_field = models.DateField(*args, **kwargs)
+        plain_field.set_attributes_from_name(name)
+        plain_field.model = DayControl
+        with connection.schema_editor() as editor:
+            for index in Booking._meta.indexes:
+                if drop:
+                    editor.remove_index(Booking, index)
+                else:
+                    editor.add_index(Booking, index)
+            if drop:
+                editor.alter_field(DayControl, date_field, plain_field)
+            else:
+                editor.alter_field(DayControl, plain_field, date_field)
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
@@ -0,0 +1,76 @@
+import time
+
+from aiogram.fsm.context import FSMContext
+from aiogram.fsm.storage.base import StorageKey
+from aiogram.fsm.storage.memory import MemoryStorage
+from aiogram.types import Chat, Message, User
+from asgiref.sync import async_to_sync
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from btr.tg_bot.keyboards.inline_menu import InlineMenuKB, get_menu_markup
+from btr.tg_bot.keyboards.kb_cancel import CancelKB, get_cancel_markup
+from btr.tg_bot.keyboards.kb_dialog import DialogKB, get_dialog_markup
+from btr.tg_bot.utils.decorators import validators
+
+
+@validators
+async def ask_hours(message: Message, state: FSMContext, bot=None):
+    # keyboards of a typical dialog step
+    hours = ['1', '2', '3', '4']
+    CancelKB().place()
+    DialogKB(hours).place()
+    await state.update_data(start=message.text, kb=hours)
+
+
+class Command(BaseCommand):
+    """
+    Measure keyboard overhead of a bot dialog step: the validators
+     decorator rebuilding the last reply keyboard, the cancel keyboard
+     and a new options keyboard, plus the main menu.
+
+    'cold' clears the keyboard caches before every message, the way
+     markup was built before it was memoized.
+
+    Usage:
+        python manage.py bench_keyboards --messages 10000
+    """
+
+    help = 'Benchmark per-message keyboard overhead of bot handlers'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--messages', type=int, default=5000)
+
+    def handle(self, *args, **options):
+        for title, cold in (('cold', True), ('memoized', False)):
+            count = options['messages']
+            started = time.perf_counter()
+            async_to_sync(self.run)(count, cold)
+            self.report(title, count, started)
+
+    @staticmethod
+    async def run(count: int, cold: bool) -> None:
+        user = User(id=1, is_bot=False, first_name='bench')
+        message = Message(
+            message_id=1,
+            date=timezone.now(),
+            chat=Chat(id=1, type='private'),
+            from_user=user,
+            text='10:00',
+        )
+        state = FSMContext(MemoryStorage(), StorageKey(1, 1, 1))
+        await state.update_data(kb=['10:00', '11:00', '12:00'])
+        for _i in range(count):
+            if cold:
+                get_cancel_markup.cache_clear()
+                get_dialog_markup.cache_clear()
+                get_menu_markup.cache_clear()
+            await ask_hours(message, state, None)
+            InlineMenuKB().place()
+
+    def report(self, title: str, count: int, started: float) -> None:
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            f'{title:<10} {count} messages in {elapsed:.3f}s '
+            f'({elapsed / count * 1e6:.1f} us/message)'
+        )
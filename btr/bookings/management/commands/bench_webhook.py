@@ -0,0 +1,79 @@
+import asyncio
+import time
+
+from aiohttp import web
+from django.core.management.base import BaseCommand
+
+from btr.tg_bot.bot import BookingBot
+from btr.tg_bot.fake_server import FakeTelegramServer
+
+
+TOKEN = '123456:BENCH'
+PATH = '/tg/webhook/'
+
+
+async def start_site(app: web.Application) -> tuple:
+    """
+    Serve the application on a free local port.
+
+    Returns:
+        tuple: Runner and base url of the site.
+    """
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    host, port = runner.addresses[0][:2]
+    return runner, f'http://{host}:{port}'
+
+
+class Command(BaseCommand):
+    """
+    Throughput of the webhook mode against a local fake Telegram server.
+
+    Updates are delivered to the webhook like Telegram does and every
+     /start answer is a Bot API call with a simulated round trip.
+
+    Usage:
+        python manage.py bench_webhook --updates 2000 --concurrency 1 10 40
+    """
+
+    help = 'Benchmark webhook update handling with a fake Telegram server'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--updates', type=int, default=500)
+        parser.add_argument('--concurrency', type=int, nargs='+',
+                            default=[1, 10, 40])
+        parser.add_argument('--connections', type=int, default=40,
+                            help='parallel webhook connections of Telegram')
+        parser.add_argument('--latency-ms', type=float, default=50,
+                            help='simulated Bot API round trip')
+
+    def handle(self, *args, **options):
+        for concurrency in options['concurrency']:
+            elapsed = asyncio.run(self.run(concurrency, options))
+            count = options['updates']
+            self.stdout.write(
+                f'concurrency {concurrency:>4}: {count} updates in '
+                f'{elapsed:.3f}s ({count / elapsed:.0f} updates/s)'
+            )
+
+    async def run(self, concurrency: int, options: dict) -> float:
+        telegram = FakeTelegramServer(latency=options['latency_ms'] / 1000)
+        telegram_runner, api_url = await start_site(telegram.make_app())
+        bot = BookingBot(TOKEN, api_url)
+        webhook_runner, webhook_url = await start_site(
+            bot.get_webhook_app(PATH, concurrency=concurrency)
+        )
+        updates = [FakeTelegramServer.make_update(i, 1000 + i)
+                   for i in range(options['updates'])]
+        try:
+            started = time.perf_counter()
+            await FakeTelegramServer.send_updates(
+                webhook_url + PATH, updates, options['connections']
+            )
+            await telegram.wait_messages(len(updates), timeout=600)
+            return time.perf_counter() - started
+        finally:
+            await webhook_runner.cleanup()
+            await telegram_runner.cleanup()
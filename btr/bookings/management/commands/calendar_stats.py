@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+
+from btr.bookings.fragments import get_stats, reset_stats
+
+
+class Command(BaseCommand):
+    """
+    Show hit ratio and render times of the cached booking calendar
+     fragments.
+
+    Usage:
+        python manage.py calendar_stats [--reset]
+    """
+
+    help = 'Show booking calendar fragment cache stats'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--reset', action='store_true',
+                            help='reset counters after showing them')
+
+    def handle(self, *args, **options):
+        for name, stats in get_stats().items():
+            self.stdout.write(
+                f'{name:<18} hits {stats["hits"]:>7} '
+                f'misses {stats["misses"]:>7} '
+                f'ratio {stats["hit_ratio"]:>6.1%} '
+                f'hit {stats["hit_ms"]:>7.2f}ms '
+                f'miss {stats["miss_ms"]:>7.2f}ms'
+            )
+        if options['reset']:
+            reset_stats()
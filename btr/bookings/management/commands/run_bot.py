@@ -9,6 +9,24 @@ class Command(BaseCommand):
 
     help = 'Command for run booking tg bot'
 
+    def add_arguments(self, parser):
+        parser.add_argument('--mode', choices=('polling', 'webhook'),
+                            default=settings.TG_BOT_MODE)
+        parser.add_argument('--host', default=settings.TG_WEBHOOK_HOST)
+        parser.add_argument('--port', type=int,
+                            default=settings.TG_WEBHOOK_PORT)
+
     def handle(self, *args, **options):
-        bot = BookingBot(settings.TG_BOT_TOKEN)
-        asyncio.run(bot.run())
+        bot = BookingBot(settings.TG_BOT_TOKEN, settings.TG_API_URL)
+        if options['mode'] == 'webhook':
+            bot.run_webhook(
+                settings.TG_WEBHOOK_URL,
+                settings.TG_WEBHOOK_PATH,
+                options['host'],
+                options['port'],
+                secret=settings.TG_WEBHOOK_SECRET,
+                concurrency=settings.TG_CONCURRENCY,
+                drain_timeout=settings.TG_DRAIN_TIMEOUT,
+            )
+        else:
+            asyncio.run(bot.run())
@@ -0,0 +1,161 @@
+import random
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, time as clock
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand
+from django.db import OperationalError, connection
+from django.utils.translation import gettext as _
+
+from btr.bookings.models import Booking, BookingDay
+from btr.bookings.occupancy import (MINUTES_IN_DAY, DayCapacity, to_clock,
+                                    to_minutes)
+from btr.orm_utils import SlotsFinder
+from btr.users.models import SiteUser
+
+
+class Command(BaseCommand):
+    """
+    Fire parallel booking attempts on a single date and check that active
+     bookings never use more bikes than the fleet has.
+
+    Every attempt runs in its own thread with its own database connection.
+     With --naive attempts check free slots and save without the date lock
+     (the old behaviour), which shows that the harness catches overbooking.
+     Created rows are removed afterwards.
+
+    Usage:
+        python manage.py stress_bookings --attempts 500 --workers 32
+    """
+
+    help = 'Check that concurrent booking attempts never overbook the fleet'
+
+    day = date(9000, 1, 3)
+    retries = 100
+
+    def add_arguments(self, parser):
+        parser.add_argument('--attempts', type=int, default=300)
+        parser.add_argument('--workers', type=int, default=32)
+        parser.add_argument('--naive', action='store_true')
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        rider = SiteUser.objects.create(
+            username='stress_rider',
+            email='stress_rider@stress.local',
+            phone_number='+79000000000',
+        )
+        try:
+            started = time.perf_counter()
+            results = self.run_attempts(rider.pk, options['attempts'],
+                                        options['workers'], options['naive'],
+                                        options['seed'])
+            elapsed = time.perf_counter() - started
+            overbooked = self.find_overbooked()
+        finally:
+            Booking.objects.filter(rider=rider).delete()
+            BookingDay.objects.filter(date=self.day).delete()
+            rider.delete()
+        self.stdout.write(
+            f'{options["attempts"]} attempts, {options["workers"]} workers, '
+            f'{"naive" if options["naive"] else "admission"}: '
+            f'{results["created"]} created, {results["rejected"]} rejected, '
+            f'{results["errors"]} errors in {elapsed:.2f} s'
+        )
+        if overbooked:
+            self.stdout.write(self.style.ERROR(
+                f'{len(overbooked)} overbooked minutes, '
+                f'first at {overbooked[0]}'
+            ))
+        else:
+            self.stdout.write(self.style.SUCCESS('no overbooking'))
+
+    def run_attempts(self, rider_id: int, attempts: int, workers: int,
+                     naive: bool = False, seed: int = 0) -> Counter:
+        """
+        Run booking attempts in parallel threads.
+
+        Args:
+            rider_id (int): Rider of the bookings.
+            attempts (int): Count of attempts.
+            workers (int): Count of threads.
+            naive (bool): Check and save without the date lock.
+            seed (int): Seed of random start times, durations and bikes.
+
+        Returns:
+            Counter: Counts of 'created', 'rejected' and 'errors'.
+        """
+        rnd = random.Random(seed)
+        slots = []
+        for _i in range(attempts):
+            start = rnd.randint(10, 20)
+            slots.append((clock(start), clock(min(start + rnd.randint(1, 2),
+                                                  23)),
+                          rnd.randint(1, settings.FLEET_SIZE)))
+
+        def attempt(slot):
+            booking = Booking(
+                rider_id=rider_id,
+                booking_date=self.day,
+                start_time=slot[0],
+                end_time=slot[1],
+                bike_count=slot[2],
+                status=_('pending'),
+            )
+            try:
+                for _retry in range(self.retries):
+                    try:
+                        if naive:
+                            self.naive_admit(booking)
+                        else:
+                            SlotsFinder(self.day.isoformat()).admit(booking)
+                        return 'created'
+                    except ValidationError:
+                        return 'rejected'
+                    except OperationalError as error:
+                        # shared cache SQLite (test database) doesn't wait
+                        # for locks, a client would retry the request
+                        if 'locked' not in str(error):
+                            return 'errors'
+                        time.sleep(rnd.random() / 100)
+                return 'errors'
+            finally:
+                connection.close()
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return Counter(pool.map(attempt, slots))
+
+    def naive_admit(self, booking: Booking) -> None:
+        """
+        Check the time against free bikes and save it without any lock.
+        """
+        finder = SlotsFinder(self.day.isoformat())
+        day = DayCapacity.from_segments(
+            finder.calc_day_availability().get('capacity'),
+            settings.FLEET_SIZE,
+        )
+        free_bikes = day.free_bikes(booking.start_time, booking.end_time)
+        if free_bikes < booking.bike_count:
+            raise ValidationError('Selected time is not available')
+        booking.save()
+
+    def find_overbooked(self) -> list:
+        """
+        Find minutes of the date when active bookings use more bikes
+         than the fleet has.
+
+        Returns:
+            list: Overbooked minutes in the format 'HH:MM'.
+        """
+        bookings = Booking.objects.filter(booking_date=self.day).exclude(
+            status=_('canceled')
+        ).values_list('start_time', 'end_time', 'bike_count')
+        in_use = [0] * MINUTES_IN_DAY
+        for start, end, bikes in bookings:
+            for minute in range(to_minutes(start), to_minutes(end)):
+                in_use[minute] += bikes
+        return [to_clock(minute) for minute, bikes in enumerate(in_use)
+                if bikes > settings.FLEET_SIZE]
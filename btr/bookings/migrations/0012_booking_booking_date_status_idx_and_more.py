@@ -0,0 +1,21 @@
+# Generated by Django 4.2.6 on 2026-10-18 11:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0011_alter_booking_bike_count'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(fields=['booking_date', 'status'], name='booking_date_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(fields=['rider', 'status'], name='booking_rider_status_idx'),
+        ),
+    ]
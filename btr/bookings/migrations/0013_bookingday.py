@@ -0,0 +1,25 @@
+# Generated by Django 4.2.6 on 2026-10-18 12:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0012_booking_booking_date_status_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BookingDay',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(unique=True, verbose_name='Book day')),
+                ('admissions', models.PositiveIntegerField(default=0, verbose_name='Admissions')),
+            ],
+            options={
+                'verbose_name': 'Booking day',
+                'verbose_name_plural': 'Booking days',
+            },
+        ),
+    ]
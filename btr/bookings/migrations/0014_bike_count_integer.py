@@ -0,0 +1,18 @@
+# Generated by Django 4.2.6 on 2026-10-18 12:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0013_bookingday'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='booking',
+            name='bike_count',
+            field=models.PositiveSmallIntegerField(verbose_name='bikes in rent'),
+        ),
+    ]
@@ -1,4 +1,4 @@
-from django.db import models
+from django.db import IntegrityError, models, transaction
 from django.utils.translation import gettext_lazy as _
 
 from phonenumber_field.modelfields import PhoneNumberField
@@ -34,8 +34,7 @@ class Booking(models.Model):
         verbose_name=_('Time of end')
     )
 
-    bike_count = models.CharField(
-        max_length=2,
+    bike_count = models.PositiveSmallIntegerField(
         blank=False,
         verbose_name=_('bikes in rent')
     )
@@ -61,3 +60,75 @@ class Booking(models.Model):
     class Meta:
         verbose_name = _('Booking')
         verbose_name_plural = _('Bookings')
+        # statuses are stored translated, so they are indexed as a column
+        # instead of partial index conditions
+        indexes = [
+            models.Index(
+                fields=['booking_date', 'status'],
+                name='booking_date_status_idx',
+            ),
+            models.Index(
+                fields=['rider', 'status'],
+                name='booking_rider_status_idx',
+            ),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        # keep loaded values to detect changed fields in signals
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        # signals have seen previous values, remember the saved ones
+        self._loaded_values = {field.attname: getattr(self, field.attname)
+                               for field in self._meta.concrete_fields}
+
+
+class BookingDay(models.Model):
+    """
+    Lock row of a booking date. Admission of a booking updates the row of
+     its date first, so checks and writes of the same date run one by one
+     (a row lock on Postgres, the write lock on SQLite).
+    """
+
+    date = models.DateField(
+        unique=True,
+        verbose_name=_('Book day'),
+    )
+
+    admissions = models.PositiveIntegerField(
+        default=0,
+        verbose_name=_('Admissions'),
+    )
+
+    class Meta:
+        verbose_name = _('Booking day')
+        verbose_name_plural = _('Booking days')
+
+    def __str__(self):
+        return f'{self.date}: {self.admissions}'
+
+    @classmethod
+    def lock(cls, date) -> None:
+        """
+        Lock the date until the end of the current transaction.
+
+        Args:
+            date: The date to lock (date or 'YYYY-MM-DD' string).
+        """
+        locked = cls.objects.filter(date=date).update(
+            admissions=models.F('admissions') + 1
+        )
+        if locked:
+            return
+        try:
+            with transaction.atomic():
+                cls.objects.create(date=date, admissions=1)
+        except IntegrityError:
+            # created by a concurrent admission meanwhile
+            cls.objects.filter(date=date).update(
+                admissions=models.F('admissions') + 1
+            )
@@ -0,0 +1,489 @@
+from datetime import time
+from functools import lru_cache
+from typing import Iterable, List, Tuple
+
+
+MINUTES_IN_DAY = 24 * 60
+DAY_MASK = (1 << MINUTES_IN_DAY) - 1
+
+
+def to_minutes(value: time | str | int) -> int:
+    """
+    Convert a time of day to minutes since midnight.
+
+    Args:
+        value (time | str | int): datetime.time, 'HH:MM' string or minutes.
+
+    Returns:
+        int: Minutes since midnight.
+    """
+    if isinstance(value, int):
+        return value
+    if isinstance(value, str):
+        hours, minutes = value.split(':')[:2]
+        return int(hours) * 60 + int(minutes)
+    return value.hour * 60 + value.minute
+
+
+def to_clock(minutes: int) -> str:
+    """
+    Convert minutes since midnight to 'HH:MM' string.
+
+    Args:
+        minutes (int): Minutes since midnight.
+
+    Returns:
+        str: Formatted time (e.g. '10:00').
+    """
+    return f'{minutes // 60:02d}:{minutes % 60:02d}'
+
+
+def format_duration(minutes: int) -> str:
+    """
+    Format a ride duration for bot buttons and messages.
+
+    Args:
+        minutes (int): Duration in minutes.
+
+    Returns:
+        str: Whole hours as '2', other durations as 'H:MM' (e.g. '1:30').
+    """
+    if minutes % 60 == 0:
+        return str(minutes // 60)
+    return f'{minutes // 60}:{minutes % 60:02d}'
+
+
+def parse_duration(value: str) -> int:
+    """
+    Parse a ride duration made by format_duration.
+
+    Args:
+        value (str): Hours ('2') or hours and minutes ('1:30').
+
+    Returns:
+        int: Duration in minutes.
+
+    Raises:
+        ValueError: If the value is not a duration.
+    """
+    hours, _, minutes = str(value).partition(':')
+    if minutes and len(minutes) != 2:
+        raise ValueError(value)
+    return int(hours) * 60 + int(minutes or 0)
+
+
+def format_intervals(intervals: Iterable[Tuple]) -> List[Tuple[str, str]]:
+    """
+    Format minute intervals for templates and messages.
+
+    Args:
+        intervals (Iterable): Intervals as (start, end) in minutes.
+
+    Returns:
+        list: Intervals as ('HH:MM', 'HH:MM') tuples.
+    """
+    return [(to_clock(start), to_clock(end)) for start, end in intervals]
+
+
+def format_capacity(segments: Iterable[Tuple]) -> List[Tuple[str, str, int]]:
+    """
+    Format free bikes segments for templates and the API.
+
+    Args:
+        segments (Iterable): Segments as (start, end, free bikes)
+         in minutes.
+
+    Returns:
+        list: Segments with free bikes as ('HH:MM', 'HH:MM', bikes) tuples.
+    """
+    return [(to_clock(start), to_clock(end), free)
+            for start, end, free in segments if free > 0]
+
+
+def _mask(start: int, end: int) -> int:
+    start = max(start, 0)
+    end = min(end, MINUTES_IN_DAY)
+    if start >= end:
+        return 0
+    return ((1 << (end - start)) - 1) << start
+
+
+@lru_cache
+def _grid(step: int) -> int:
+    # minutes of the day which are multiples of the step
+    return sum(1 << minute for minute in range(0, MINUTES_IN_DAY, step))
+
+
+class DayOccupancy:
+    """
+    Minute bitmap of a single day.
+
+    A set bit means the minute can't be booked: the track is closed or the
+     minute is taken by a booking together with its service buffer.
+     All checks are plain integer operations on minutes since midnight.
+
+    Args:
+        open_time (time | str | int): Open time of the day.
+        close_time (time | str | int): Close time of the day.
+
+    Example:
+        day = DayOccupancy('10:00', '22:00')
+        day.book('17:00', '18:00')
+        day.free_intervals()  # [(600, 960), (1140, 1320)]
+    """
+
+    SERVICE_BUFFER = 60
+    RIDE_STEP = 60
+
+    def __init__(self, open_time=None, close_time=None):
+        self.busy = DAY_MASK
+        if open_time is not None and close_time is not None:
+            self.release(open_time, close_time)
+
+    @classmethod
+    def from_free_intervals(cls, intervals: Iterable[Tuple]) -> 'DayOccupancy':
+        """
+        Rebuild occupancy from already calculated free intervals.
+
+        Args:
+            intervals (Iterable): Free intervals as (start, end) in minutes,
+             'HH:MM' strings or datetime.time objects.
+
+        Returns:
+            DayOccupancy: Occupancy with only given intervals free.
+        """
+        day = cls()
+        for start, end in intervals:
+            day.release(start, end)
+        return day
+
+    def release(self, start, end) -> None:
+        """
+        Mark [start, end) as free.
+        """
+        self.busy &= ~_mask(to_minutes(start), to_minutes(end))
+
+    def book(self, start, end, buffer: int = SERVICE_BUFFER) -> None:
+        """
+        Mark [start - buffer, end + buffer) as busy.
+
+        Args:
+            start: Booking start time.
+            end: Booking end time.
+            buffer (int): Service interval around the booking in minutes.
+        """
+        start, end = to_minutes(start), to_minutes(end)
+        self.busy |= _mask(start - buffer, end + buffer)
+
+    def is_free(self, start, end) -> bool:
+        """
+        Check if [start, end) can be booked.
+
+        Returns:
+            bool: True if every minute of the range is free.
+        """
+        start, end = to_minutes(start), to_minutes(end)
+        if not 0 <= start < end <= MINUTES_IN_DAY:
+            return False
+        return not self.busy & _mask(start, end)
+
+    def free_intervals(self) -> List[Tuple[int, int]]:
+        """
+        Get maximal free intervals of the day.
+
+        Returns:
+            list: Free intervals as (start, end) in minutes.
+        """
+        intervals = []
+        free = ~self.busy & DAY_MASK
+        while free:
+            start = (free & -free).bit_length() - 1
+            run = free >> start
+            length = (run ^ (run + 1)).bit_length() - 1
+            intervals.append((start, start + length))
+            free &= ~_mask(start, start + length)
+        return intervals
+
+    def free_until(self, start) -> int:
+        """
+        Get the end of the free interval which contains start.
+
+        Returns:
+            int: End of the free run in minutes, start if start is busy.
+        """
+        start = to_minutes(start)
+        run = (~self.busy & DAY_MASK) >> start
+        return start + (run ^ (run + 1)).bit_length() - 1
+
+    def start_times(self, duration: int = RIDE_STEP,
+                    step: int = RIDE_STEP) -> List[int]:
+        """
+        Get valid start times for a ride of given duration.
+
+        The free bitmap is narrowed to minutes followed by the whole ride
+         (log(duration) shifts) and crossed with the precomputed grid of
+         the step, so no candidate start is checked one by one.
+
+        Args:
+            duration (int): Ride duration in minutes.
+            step (int): Granularity of start times from midnight.
+
+        Returns:
+            list: Start times in minutes.
+        """
+        fits, length = ~self.busy & DAY_MASK, 1
+        while length < duration:
+            shift = min(length, duration - length)
+            fits &= fits >> shift
+            length += shift
+        fits &= _grid(step)
+        starts = []
+        while fits:
+            lowest = fits & -fits
+            starts.append(lowest.bit_length() - 1)
+            fits ^= lowest
+        return starts
+
+    def durations(self, start, step: int = RIDE_STEP,
+                  shortest: int = None, longest: int = None) -> List[int]:
+        """
+        Get available ride durations from the start time.
+
+        Args:
+            start: Ride start time.
+            step (int): Duration step in minutes.
+            shortest (int, optional): Shortest ride, the step by default.
+            longest (int, optional): Longest ride, no limit by default.
+
+        Returns:
+            list: Durations in minutes (e.g. [60, 120]).
+        """
+        start = to_minutes(start)
+        available = self.free_until(start) - start
+        if longest is not None:
+            available = min(available, longest)
+        return list(range(shortest or step, available + 1, step))
+
+
+class RidePolicy:
+    """
+    Scheduling rules compiled for the availability engine.
+
+    Built once from the stored policy and applied to whole days: the buffer
+     is taken by every booking alike and start times are read from the
+     precomputed grid of the granularity.
+
+    Args:
+        buffer (int): Service interval around every booking in minutes.
+        step (int): Slot granularity in minutes.
+        min_ride (int): Shortest ride in minutes.
+        max_ride (int | None): Longest ride in minutes, None for no limit.
+
+    Example:
+        policy = RidePolicy(buffer=30, step=15, min_ride=30, max_ride=120)
+        policy.start_times(day)  # [600, 615, 630, ...]
+    """
+
+    def __init__(self, buffer: int = DayOccupancy.SERVICE_BUFFER,
+                 step: int = DayOccupancy.RIDE_STEP,
+                 min_ride: int = DayOccupancy.RIDE_STEP,
+                 max_ride: int | None = None):
+        self.buffer = buffer
+        self.step = step
+        self.min_ride = min_ride
+        self.max_ride = max_ride
+
+    def start_times(self, day: DayOccupancy) -> List[int]:
+        """
+        Get start times of the shortest ride on the granularity grid.
+
+        Args:
+            day (DayOccupancy): Free minutes of the day.
+
+        Returns:
+            list: Start times in minutes.
+        """
+        return day.start_times(self.min_ride, self.step)
+
+    def durations(self, day: DayOccupancy, start) -> List[int]:
+        """
+        Get ride durations allowed from the start time.
+
+        Args:
+            day (DayOccupancy): Free minutes of the day.
+            start: Ride start time.
+
+        Returns:
+            list: Durations in minutes.
+        """
+        if to_minutes(start) % self.step:
+            return []
+        return day.durations(start, self.step, self.min_ride, self.max_ride)
+
+    def allows(self, start, end) -> bool:
+        """
+        Check the ride against the granularity and ride length limits.
+
+        Returns:
+            bool: True if the ride fits the policy.
+        """
+        start, end = to_minutes(start), to_minutes(end)
+        length = end - start
+        return (
+            start % self.step == 0
+            and length % self.step == 0
+            and length >= self.min_ride
+            and (self.max_ride is None or length <= self.max_ride)
+        )
+
+
+class DayCapacity:
+    """
+    Free bikes of a single day.
+
+    The open hours are kept as sorted segments (start, end, free bikes) in
+     minutes since midnight. A booking takes its bikes for the ride and the
+     service buffer around it, so rides share the track while bikes are
+     left. Closed minutes are not covered by any segment.
+
+    Args:
+        open_time (time | str | int): Open time of the day.
+        close_time (time | str | int): Close time of the day.
+        fleet (int): Count of bikes in the fleet.
+
+    Example:
+        day = DayCapacity('10:00', '22:00', fleet=4)
+        day.book('17:00', '18:00', bikes=3)
+        day.segments  # [(600, 960, 4), (960, 1140, 1), (1140, 1320, 4)]
+        day.free_intervals(bikes=2)  # [(600, 960), (1140, 1320)]
+    """
+
+    def __init__(self, open_time=None, close_time=None, fleet: int = 1):
+        self.fleet = fleet
+        self.segments = []
+        if open_time is not None and close_time is not None:
+            start, end = to_minutes(open_time), to_minutes(close_time)
+            if start < end:
+                self.segments.append((start, end, fleet))
+
+    @classmethod
+    def from_segments(cls, segments: Iterable[Tuple],
+                      fleet: int) -> 'DayCapacity':
+        """
+        Rebuild capacity from already calculated segments.
+
+        Args:
+            segments (Iterable): Segments as (start, end, free bikes).
+            fleet (int): Count of bikes in the fleet.
+
+        Returns:
+            DayCapacity: Capacity with given segments.
+        """
+        day = cls(fleet=fleet)
+        day.segments = [tuple(segment) for segment in segments]
+        return day
+
+    def book(self, start, end, bikes: int = 1,
+             buffer: int = DayOccupancy.SERVICE_BUFFER) -> None:
+        """
+        Take bikes for [start - buffer, end + buffer).
+
+        Args:
+            start: Booking start time.
+            end: Booking end time.
+            bikes (int): Count of bikes of the booking.
+            buffer (int): Service interval around the booking in minutes.
+        """
+        start = to_minutes(start) - buffer
+        end = to_minutes(end) + buffer
+        segments = []
+        for begin, finish, free in self.segments:
+            for part_start, part_end, taken in (
+                (begin, min(finish, start), 0),
+                (max(begin, start), min(finish, end), int(bikes)),
+                (max(begin, end), finish, 0),
+            ):
+                if part_start < part_end:
+                    segments.append((part_start, part_end, free - taken))
+        self.segments = self._merge(segments)
+
+    @staticmethod
+    def _merge(segments: List[Tuple]) -> List[Tuple]:
+        merged = []
+        for segment in segments:
+            if merged and merged[-1][1] == segment[0] and \
+                    merged[-1][2] == segment[2]:
+                merged[-1] = (merged[-1][0], segment[1], segment[2])
+            else:
+                merged.append(segment)
+        return merged
+
+    def free_intervals(self, bikes: int = 1) -> List[Tuple[int, int]]:
+        """
+        Get maximal intervals with at least the given count of free bikes.
+
+        Args:
+            bikes (int): Count of required bikes.
+
+        Returns:
+            list: Free intervals as (start, end) in minutes.
+        """
+        intervals = []
+        for start, end, free in self.segments:
+            if free < int(bikes):
+                continue
+            if intervals and intervals[-1][1] == start:
+                intervals[-1] = (intervals[-1][0], end)
+            else:
+                intervals.append((start, end))
+        return intervals
+
+    def occupancy(self, bikes: int = 1) -> DayOccupancy:
+        """
+        Get the minute bitmap of a ride with the given count of bikes.
+
+        Args:
+            bikes (int): Count of required bikes.
+
+        Returns:
+            DayOccupancy: Occupancy where busy minutes lack bikes.
+        """
+        return DayOccupancy.from_free_intervals(self.free_intervals(bikes))
+
+    def free_bikes(self, start, end) -> int:
+        """
+        Get the count of bikes free during the whole [start, end).
+
+        Returns:
+            int: Free bikes, 0 if the range is not fully open.
+        """
+        start, end = to_minutes(start), to_minutes(end)
+        covered, free_bikes = start, self.fleet
+        for begin, finish, free in self.segments:
+            if finish <= start or begin >= end:
+                continue
+            if begin > covered:
+                return 0
+            covered = finish
+            free_bikes = min(free_bikes, free)
+        if start >= end or covered < end:
+            return 0
+        return max(free_bikes, 0)
+
+    @property
+    def load(self) -> int:
+        """
+        Workload of the day as a percentage of bike minutes.
+
+        Returns:
+            int: Workload percentage (rounded down), 100 if the day
+             is closed.
+        """
+        open_minutes = sum(end - start for start, end, _ in self.segments)
+        if not open_minutes or not self.fleet:
+            return 100
+        free_minutes = sum(
+            (end - start) * min(max(free, 0), self.fleet)
+            for start, end, free in self.segments
+        )
+        return int((1 - free_minutes / (open_minutes * self.fleet)) * 100)
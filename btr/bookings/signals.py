@@ -1,12 +1,17 @@
-from django.db.models.signals import post_save
+from collections import Counter
+
+from django.db.models.signals import post_save, post_delete
 from django.db.models import Model
 from django.dispatch import receiver
 from django.utils.translation import gettext as _
 
+from btr.users.levels import add_completed_rides
+from .availability import AvailabilityCache
 from .models import Booking
 
 
 @receiver(post_save, sender=Booking)
+@receiver(post_delete, sender=Booking)
 def update_user_status(sender: Model, instance: Booking, **kwargs) -> None:
     """
     Custom signal receiver to update user status based on completed bookings.
@@ -22,21 +27,39 @@ def update_user_status(sender: Model, instance: Booking, **kwargs) -> None:
         None
 
     Example:
-        When a booking is saved, this signal receiver checks the user's
-         completed bookings count and updates their status accordingly
-          (e.g., 'Newbie', 'Amateur', etc.). Exclude admin account.
+        When a booking status moves into or out of 'completed' (or a
+         completed booking is deleted), the rider's completed rides counter
+          and status (e.g., 'Newbie', 'Amateur', etc.) are changed in a
+           single UPDATE. Other saves don't touch the rider at all.
+    """
+    completed = _('completed')
+    loaded_values = getattr(instance, '_loaded_values', {})
+    deltas = Counter()
+    if loaded_values.get('status') == completed:
+        deltas[loaded_values.get('rider_id')] -= 1
+    if instance.status == completed and 'created' in kwargs:
+        deltas[instance.rider_id] += 1
+    add_completed_rides(deltas)
+
+
+@receiver(post_save, sender=Booking)
+@receiver(post_delete, sender=Booking)
+def invalidate_availability(sender: Model, instance: Booking,
+                            **kwargs) -> None:
+    """
+    Drop cached availability for the booking date (and the previous date
+     if the booking was moved to another day).
+
+    Args:
+        sender (Model): The model class that sends the signal.
+        instance (Booking): The saved or deleted booking.
+        **kwargs: Additional keyword arguments.
+
+    Returns:
+        None
     """
-    rider = instance.rider
-    # check if user are not admin
-    if not rider.is_superuser:
-        book_count = rider.booking_set.filter(status=_('completed')).count()
-        match book_count:
-            case count if count < 3:
-                rider.status = _('Newbie')
-            case count if 3 <= count < 5:
-                rider.status = _('Amateur')
-            case count if 5 <= count < 10:
-                rider.status = _('Professional')
-            case _:
-                rider.status = _('Master')
-        rider.save()
+    loaded_values = getattr(instance, '_loaded_values', {})
+    AvailabilityCache.invalidate(
+        instance.booking_date,
+        loaded_values.get('booking_date'),
+    )
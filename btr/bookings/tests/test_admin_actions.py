@@ -1,6 +1,11 @@
+from unittest.mock import patch
+
+from django.contrib.messages import get_messages
+from django.contrib.messages.storage.fallback import FallbackStorage
 from django.utils.translation import gettext as _
 
 from btr.bookings.models import Booking
+from btr.orm_utils import SlotsFinder
 from btr.test_init import BTRAdminTestCase
 
 
@@ -33,3 +38,66 @@ class TestAdminBookings(BTRAdminTestCase):
 
         self.assertEqual(self.booking.status, _('canceled'))
         self.assertEqual(self.booking2.status, _('canceled'))
+
+    @patch('btr.bookings.admin.group')
+    def test_actions_batch(self, notify_group):
+        Booking.objects.filter(pk=3).update(status=_('completed'))
+        actions = self.model_admin.get_actions(self.request)
+        make_confirm_action = actions['make_confirm'][0]
+        request = self.request_factory.get('/')
+        request.session = {}
+        request._messages = FallbackStorage(request)
+        # lock and load with riders, one update
+        with self.captureOnCommitCallbacks(execute=True):
+            with self.assertNumQueries(4):
+                make_confirm_action(self.model_admin, request,
+                                    Booking.objects.all())
+        # vk notification for every changed booking, emails in one task
+        notifications = notify_group.call_args.args[0]
+        self.assertEqual(len(notifications), 3)
+        emails = notifications[-1]
+        self.assertEqual(emails.args[0], 'confirm')
+        self.assertEqual([data['pk'] for data in emails.args[1]], [1, 2])
+        notify_group.return_value.apply_async.assert_called_once()
+        messages = [str(m) for m in get_messages(request)]
+        self.assertIn('#1, #2', messages[0])
+        self.assertIn('#3', messages[1])
+        completed = Booking.objects.get(pk=3)
+        self.assertEqual(completed.status, _('completed'))
+
+    @patch('btr.bookings.admin.group')
+    def test_cancel_invalidates_availability(self, notify_group):
+        finder = SlotsFinder('9999-02-10')
+        self.assertEqual(len(finder.find_available_slots(bikes=3)), 2)
+        actions = self.model_admin.get_actions(self.request)
+        make_cancel_action = actions['make_cancel'][0]
+        make_cancel_action(self.model_admin, self.request,
+                           Booking.objects.filter(pk=self.booking.pk))
+        self.assertEqual(finder.find_available_slots(bikes=3),
+                         [('11:00', '22:00')])
+
+    @patch('btr.bookings.admin.group')
+    def test_confirm_canceled_into_full_slot(self, notify_group):
+        Booking.objects.filter(pk__in=[1, 2]).update(status=_('canceled'))
+        # the whole fleet takes the time of the canceled booking
+        Booking.objects.create(
+            rider=self.user2, booking_date='9999-02-10',
+            start_time='17:00', end_time='18:00', bike_count=4,
+            status=_('confirmed'),
+        )
+        request = self.request_factory.get('/')
+        request.session = {}
+        request._messages = FallbackStorage(request)
+        actions = self.model_admin.get_actions(self.request)
+        make_confirm_action = actions['make_confirm'][0]
+        make_confirm_action(self.model_admin, request,
+                            Booking.objects.filter(pk__in=[1, 2]))
+        self.booking.refresh_from_db()
+        self.booking2.refresh_from_db()
+        self.assertEqual(self.booking.status, _('canceled'))
+        self.assertEqual(self.booking2.status, _('confirmed'))
+        messages = [str(m) for m in get_messages(request)]
+        self.assertIn('#2', messages[0])
+        self.assertIn('#1 skipped', messages[1])
+        emails = notify_group.call_args.args[0][-1]
+        self.assertEqual([data['pk'] for data in emails.args[1]], [2])
@@ -0,0 +1,90 @@
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.test import TransactionTestCase
+from django.utils.translation import gettext as _
+
+from btr.orm_utils import AsyncTools, SlotsFinder
+from btr.test_init import BTRTestCase
+from btr.tg_bot.utils import exceptions as e
+from btr.users.models import SiteUser
+from ..management.commands.stress_bookings import Command
+from ..models import Booking, BookingDay
+
+
+class TestBookingAdmission(BTRTestCase):
+
+    date = '9999-02-10'
+
+    def make_booking(self, start: str, end: str, bikes: int = 1) -> Booking:
+        return Booking(rider=self.user, booking_date=self.date,
+                       start_time=start, end_time=end, bike_count=bikes,
+                       status=_('pending'))
+
+    def test_admit_free_time(self):
+        booking = SlotsFinder(self.date).admit(self.make_booking('20:00',
+                                                                 '21:00'))
+        self.assertIsNotNone(booking.pk)
+        self.assertEqual(BookingDay.objects.get(date=self.date).admissions, 1)
+
+    def test_reject_busy_time(self):
+        # 2 of 4 bikes are booked by the fixture at 17:00 - 18:00
+        with self.assertRaises(ValidationError):
+            SlotsFinder(self.date).admit(self.make_booking('17:00', '19:00',
+                                                           bikes=3))
+        SlotsFinder(self.date).admit(self.make_booking('17:00', '19:00',
+                                                       bikes=2))
+        self.assertEqual(Booking.objects.count(), self.count + 1)
+
+    def test_reject_more_bikes_than_fleet(self):
+        with self.assertRaises(ValidationError):
+            SlotsFinder(self.date).admit(self.make_booking('11:00', '12:00',
+                                                           bikes=5))
+        self.assertEqual(Booking.objects.count(), self.count)
+
+    def test_rejection_ignores_stale_cache(self):
+        SlotsFinder(self.date).find_available_slots()
+        Booking.objects.filter(pk=self.booking.pk).update(start_time='20:00',
+                                                          end_time='21:00')
+        with self.assertRaises(ValidationError):
+            SlotsFinder(self.date).admit(self.make_booking('20:00', '21:00',
+                                                           bikes=3))
+
+    def test_edit_own_time(self):
+        self.booking.end_time = '19:00'
+        SlotsFinder(self.date).admit(self.booking)
+        self.booking.refresh_from_db()
+        self.assertEqual(self.booking.end_time.hour, 19)
+
+    def test_bot_booking_taken_meanwhile(self):
+        with self.assertRaises(e.TimeIsNotAvailable):
+            async_to_sync(AsyncTools().create_booking)(
+                rider=self.user.pk, booking_date=self.date,
+                start_time='16:00', end_time='17:00', bike_count=3,
+                status=_('pending'),
+            )
+        self.assertEqual(Booking.objects.count(), self.count)
+
+
+class TestConcurrentAdmission(TransactionTestCase):
+
+    attempts = 200
+    workers = 16
+
+    def setUp(self):
+        cache.clear()
+        self.rider = SiteUser.objects.create(username='rider',
+                                             email='rider@example.com')
+        self.command = Command()
+
+    def test_no_overbooking(self):
+        results = self.command.run_attempts(self.rider.pk, self.attempts,
+                                            self.workers)
+        self.assertEqual(sum(results.values()), self.attempts)
+        self.assertEqual(results['errors'], 0)
+        self.assertGreater(results['created'], 0)
+        self.assertEqual(self.command.find_overbooked(), [])
+        self.assertEqual(
+            BookingDay.objects.get(date=self.command.day).admissions,
+            results['created'],
+        )
@@ -0,0 +1,105 @@
+from django.urls import reverse_lazy
+from django.utils.translation import gettext as _
+
+from btr.test_init import BTRTestCase
+from btr.workhours.models import DayControl, SchedulingPolicy
+
+
+class TestBookingAvailability(BTRTestCase):
+
+    availability_url = reverse_lazy('book_availability')
+
+    def test_single_day(self):
+        self.client.logout()
+        response = self.client.get(self.availability_url,
+                                   {'date': '9999-02-10'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {'fleet': 4, 'days': [{
+            'date': '9999-02-10',
+            'load': 13,
+            'capacity': [['11:00', '16:00', 4], ['16:00', '19:00', 2],
+                         ['19:00', '22:00', 4]],
+            'intervals': [['11:00', '22:00']],
+            'starts': ['11:00', '12:00', '13:00', '14:00', '15:00', '16:00',
+                       '17:00', '18:00', '19:00', '20:00', '21:00'],
+        }]})
+
+    def test_bikes_filter(self):
+        response = self.client.get(self.availability_url,
+                                   {'date': '9999-02-10', 'bikes': 3})
+        day = response.json()['days'][0]
+        self.assertEqual(day['intervals'],
+                         [['11:00', '16:00'], ['19:00', '22:00']])
+        self.assertEqual(day['starts'][-3:], ['19:00', '20:00', '21:00'])
+        for bikes in ('0', '5', 'many'):
+            response = self.client.get(self.availability_url,
+                                       {'date': '9999-02-10',
+                                        'bikes': bikes})
+            self.assertEqual(response.status_code, 400, bikes)
+
+    def test_range_over_months(self):
+        DayControl.objects.create(date='9999-03-01', is_closed=True)
+        response = self.client.get(self.availability_url,
+                                   {'start': '9999-02-27',
+                                    'end': '9999-03-10'})
+        days = response.json()['days']
+        self.assertEqual(
+            [day['date'] for day in days][:4],
+            ['9999-02-27', '9999-02-28', '9999-03-01', '9999-03-02'],
+        )
+        self.assertEqual(len(days), 12)
+        self.assertEqual(days[2]['load'], 100)
+        self.assertEqual((days[2]['intervals'], days[2]['starts']), ([], []))
+        # the whole fleet is booked on 10 Mar
+        self.assertEqual(days[-1]['capacity'],
+                         [['11:00', '16:00', 4], ['19:00', '22:00', 4]])
+        self.assertEqual(days[-1]['intervals'],
+                         [['11:00', '16:00'], ['19:00', '22:00']])
+
+    def test_policy_granularity(self):
+        SchedulingPolicy.objects.create(buffer=30, granularity=15,
+                                        min_ride=30)
+        response = self.client.get(self.availability_url,
+                                   {'date': '9999-02-10', 'bikes': 3})
+        day = response.json()['days'][0]
+        self.assertEqual(day['intervals'],
+                         [['11:00', '16:30'], ['18:30', '22:00']])
+        self.assertEqual(day['starts'][:2], ['11:00', '11:15'])
+        self.assertIn('16:00', day['starts'])
+        self.assertNotIn('16:15', day['starts'])
+        self.assertEqual(day['starts'][-1], '21:30')
+
+    def test_cached_day(self):
+        self.client.get(self.availability_url, {'date': '9999-02-10'})
+        with self.assertNumQueries(0):
+            self.client.get(self.availability_url, {'date': '9999-02-10'})
+
+    def test_booking_write_refreshes_day(self):
+        self.client.get(self.availability_url, {'date': '9999-02-10'})
+        self.booking.status = _('canceled')
+        self.booking.save()
+        response = self.client.get(self.availability_url,
+                                   {'date': '9999-02-10'})
+        day = response.json()['days'][0]
+        self.assertEqual(day['intervals'], [['11:00', '22:00']])
+        self.assertIn('no-cache', response['Cache-Control'])
+
+    def test_bad_requests(self):
+        for params in ({}, {'date': '9999-02-30'}, {'start': '9999-02-10'},
+                       {'start': '9999-02-10', 'end': '9999-02-01'},
+                       {'start': '9999-01-01', 'end': '9999-12-31'}):
+            response = self.client.get(self.availability_url, params)
+            self.assertEqual(response.status_code, 400, params)
+            self.assertIn('error', response.json())
+
+    def test_calendar_modals_lazy(self):
+        response = self.client.get(reverse_lazy('bookings'))
+        self.assertContains(response, f'data-url="{self.availability_url}"')
+        self.assertNotContains(response, '&slots=')
+
+    def test_query_budget(self):
+        # the longest range spans 3 months
+        response = self.client.get(self.availability_url,
+                                   {'start': '9999-01-31',
+                                    'end': '9999-03-31'})
+        self.assertQueryBudget(response)
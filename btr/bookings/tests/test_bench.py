@@ -0,0 +1,43 @@
+import json
+import tempfile
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+from btr.test_init import BTRTestCase
+from ..models import Booking
+
+
+class TestBench(BTRTestCase):
+
+    paths = {'month_load_cold', 'month_load_warm', 'day_slots_cold',
+             'day_slots_warm', 'index_view_cold', 'index_view_warm',
+             'user_view', 'bot_book_flow'}
+
+    def bench(self, **options) -> dict:
+        with tempfile.NamedTemporaryFile('r', suffix='.json') as file:
+            call_command('bench', bookings=[200], repeat=1, json=file.name,
+                         stdout=StringIO(), **options)
+            return json.load(file)
+
+    def test_results(self):
+        report = self.bench()
+        results = {result['path']: result for result in report['results']}
+        self.assertEqual(set(results), self.paths)
+        self.assertEqual(results['month_load_warm']['queries'], 0)
+        self.assertGreater(results['bot_book_flow']['queries'], 0)
+        self.assertGreater(results['index_view_cold']['peak_kb'], 0)
+        self.assertEqual(report['meta']['fleet'], 4)
+        # seeded data is rolled back
+        self.assertEqual(Booking.objects.count(), self.count)
+
+    def test_compare_regressions(self):
+        report = self.bench()
+        for result in report['results']:
+            result['queries'] -= 1
+        with tempfile.NamedTemporaryFile('w', suffix='.json') as file:
+            json.dump(report, file)
+            file.flush()
+            with self.assertRaises(CommandError):
+                self.bench(compare=file.name, threshold=100)
@@ -0,0 +1,132 @@
+import calendar
+
+from django.urls import reverse_lazy
+from django.utils.translation import gettext as _
+
+from btr.bookings.fragments import FRAGMENTS, get_stats
+from btr.orm_utils import LoadCalc, SlotsFinder
+from btr.test_init import BTRTestCase
+from btr.workhours.models import DayControl
+
+
+class TestBookingCalendar(BTRTestCase):
+
+    calendar_url = reverse_lazy('bookings')
+    year = 9999
+    month = 2
+
+    def get_load(self) -> LoadCalc:
+        month_cal = calendar.monthcalendar(self.year, self.month)
+        return LoadCalc(month_cal, self.year, self.month)
+
+    def test_month_load_constant_queries(self):
+        load = self.get_load()
+        # work hours, scheduling policy, day overrides and bookings
+        with self.assertNumQueries(4):
+            load.get_month_load()
+
+    def test_query_budget(self):
+        # cold cache, then rendered from cached fragments
+        self.assertQueryBudget(self.client.get(self.calendar_url))
+        self.assertQueryBudget(self.client.get(self.calendar_url))
+
+    def test_month_load_matches_finder(self):
+        DayControl.objects.create(date='9999-02-11', is_closed=True)
+        for week in self.get_load().get_month_load():
+            for day, load, slots in week:
+                if not day:
+                    self.assertEqual((load, slots), (-1, []))
+                    continue
+                date = f'{self.year}-{self.month}-{day}'
+                self.assertEqual(
+                    slots,
+                    SlotsFinder(date).find_available_slots()
+                )
+
+    def test_day_load(self):
+        month_load = self.get_load().get_month_load()
+        days = {day: (load, slots) for week in month_load
+                for day, load, slots in week}
+        # 10 Feb 9999 is a weekday: 11:00 - 22:00, 2 of 4 bikes booked
+        # 17:00 - 18:00 with the service buffer around
+        self.assertEqual(days[10][0], 13)
+        self.assertEqual(days[10][1], [('11:00', '22:00')])
+        self.assertEqual(days[9], (0, [('11:00', '22:00')]))
+
+    def test_closed_day_load(self):
+        DayControl.objects.create(date='9999-02-11', is_closed=True)
+        month_load = self.get_load().get_month_load()
+        days = {day: (load, slots) for week in month_load
+                for day, load, slots in week}
+        self.assertEqual(days[11], (100, []))
+
+    def test_calendar_page(self):
+        response = self.client.get(self.calendar_url)
+        self.assertEqual(response.status_code, 200)
+        self.assertTemplateUsed(response, 'bookings/calendar.html')
+
+    def test_calendar_fragments_cached(self):
+        self.client.get(self.calendar_url)
+        with self.assertNumQueries(2):
+            # session and user, no month loads
+            response = self.client.get(self.calendar_url)
+        self.assertTemplateNotUsed(response, 'bookings/calendar.html')
+        stats = get_stats()
+        for name in FRAGMENTS:
+            self.assertEqual((stats[name]['hits'], stats[name]['misses']),
+                             (1, 1))
+        self.assertEqual(stats['calendar-next']['hit_ratio'], 0.5)
+
+    def test_calendar_fragments_per_language(self):
+        response = self.client.get(self.calendar_url,
+                                   HTTP_ACCEPT_LANGUAGE='en')
+        self.assertContains(response, 'Monday')
+        response = self.client.get(self.calendar_url,
+                                   HTTP_ACCEPT_LANGUAGE='ru')
+        self.assertContains(response, 'Понедельник')
+        self.assertEqual(get_stats()['calendar-current']['misses'], 2)
+
+    def test_booking_write_changes_month_version(self):
+        load = self.get_load()
+        version = load.get_version()
+        self.assertEqual(self.get_load().get_version(), version)
+        self.booking.status = _('canceled')
+        self.booking.save()
+        self.assertNotEqual(self.get_load().get_version(), version)
+
+    def test_cached_month_load(self):
+        self.get_load().get_month_load()
+        with self.assertNumQueries(0):
+            self.get_load().get_month_load()
+
+    def test_booking_write_invalidates_day(self):
+        date = f'{self.year}-{self.month}-10'
+        self.assertEqual(
+            SlotsFinder(date).find_available_slots(bikes=3),
+            [('11:00', '16:00'), ('19:00', '22:00')],
+        )
+        self.booking.status = _('canceled')
+        self.booking.save()
+        self.assertEqual(
+            SlotsFinder(date).find_available_slots(bikes=3),
+            [('11:00', '22:00')],
+        )
+
+    def test_moved_booking_invalidates_both_days(self):
+        self.get_load().get_month_load()
+        self.booking.booking_date = '9999-02-20'
+        self.booking.save()
+        days = {day: load for week in self.get_load().get_month_load()
+                for day, load, slots in week}
+        self.assertEqual(days[10], 0)
+        self.assertGreater(days[20], 0)
+        self.assertEqual(
+            SlotsFinder('9999-02-20').find_available_slots(bikes=3),
+            [('10:00', '16:00'), ('19:00', '22:00')],
+        )
+
+    def test_day_settings_invalidate_day(self):
+        date = f'{self.year}-{self.month}-10'
+        SlotsFinder(date).find_available_slots()
+        DayControl.objects.create(date='9999-02-10', is_closed=True)
+        self.assertEqual(SlotsFinder(date).find_available_slots(), [])
@@ -1,7 +1,12 @@
+from unittest.mock import patch
+
+from django.db.models.signals import post_save
+from django.test import override_settings
 from django.urls import reverse_lazy
 
 from btr.fixtures_loader import load_json
 from btr.test_init import BTRTestCase
+from btr.workhours.models import SchedulingPolicy
 from ..models import Booking
 
 
@@ -12,11 +17,9 @@ class TestBookingCreate(BTRTestCase):
 
     def test_success_create(self):
         post_data = self.cases['correct']
-        slots = "[('10:00', '22:00')]"
 
         response = self.client.post(
-            f"{self.create_url}?slots={slots}&selected_date="
-            f"{post_data['booking_date']}",
+            f"{self.create_url}?selected_date={post_data['booking_date']}",
             data=post_data,
             follow=True,
         )
@@ -37,14 +40,33 @@ class TestBookingCreate(BTRTestCase):
         )
         self.assertEqual(Booking.objects.count(), self.count + 1)
 
+    def test_saved_once(self):
+        post_data = self.cases['correct']
+        saves = []
+
+        def count(sender, instance, **kwargs):
+            saves.append(instance.pk)
+
+        post_save.connect(count, sender=Booking)
+        self.addCleanup(post_save.disconnect, count, sender=Booking)
+        with patch('btr.bookings.views.send_vk_notify'), \
+                patch('btr.bookings.views.send_booking_details'):
+            response = self.client.post(
+                f"{self.create_url}?selected_date="
+                f"{post_data['booking_date']}",
+                data=post_data,
+            )
+        # written once by the admission, not by the form again
+        self.assertEqual(len(saves), 1)
+        self.assertRedirects(response,
+                             reverse_lazy('profile', args=[self.user.pk]))
+
     def test_with_unauthenticated(self):
         self.client.logout()
         post_data = self.cases['correct']
-        slots = "[('10:00', '22:00')]"
 
         response = self.client.post(
-            f"{self.create_url}?slots={slots}&selected_date="
-            f"{post_data['booking_date']}",
+            f"{self.create_url}?selected_date={post_data['booking_date']}",
             data=post_data,
             follow=True,
         )
@@ -66,21 +88,74 @@ class TestBookingCreate(BTRTestCase):
 
     def test_time_already_booked(self):
         post_data = self.cases['busy_time']
-        slots = "[('10:00', '11:00')]"
+        Booking.objects.create(
+            rider=self.user2,
+            booking_date=post_data['booking_date'],
+            start_time='19:00',
+            end_time='20:00',
+            bike_count=3,
+        )
+        response = self.client.post(
+            f"{self.create_url}?selected_date={post_data['booking_date']}",
+            data=post_data,
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(Booking.objects.count(), self.count + 1)
+
+    def test_forged_slots_ignored(self):
+        post_data = self.cases['busy_time']
+        Booking.objects.create(
+            rider=self.user2,
+            booking_date=post_data['booking_date'],
+            start_time='19:00',
+            end_time='20:00',
+            bike_count=3,
+        )
+        slots = "[('00:00', '23:59')]"
         response = self.client.post(
             f"{self.create_url}?slots={slots}&selected_date="
             f"{post_data['booking_date']}",
             data=post_data,
         )
         self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.context['ranges'],
+            [('11:00', '18:00', 4), ('18:00', '21:00', 1),
+             ('21:00', '22:00', 4)],
+        )
+        self.assertEqual(Booking.objects.count(), self.count + 1)
+
+    def test_remaining_bikes_booked(self):
+        post_data = {**self.cases['busy_time'], 'bike_count': 1}
+        Booking.objects.create(
+            rider=self.user2,
+            booking_date=post_data['booking_date'],
+            start_time='19:00',
+            end_time='20:00',
+            bike_count=3,
+        )
+        self.client.post(
+            f"{self.create_url}?selected_date={post_data['booking_date']}",
+            data=post_data,
+        )
+        self.assertEqual(Booking.objects.count(), self.count + 2)
+        self.assertEqual(Booking.objects.last().bike_count, 1)
+
+    def test_ride_time_follows_policy(self):
+        post_data = {**self.cases['correct'], 'end_time': '20:30'}
+        url = f"{self.create_url}?selected_date={post_data['booking_date']}"
+        response = self.client.post(url, data=post_data)
+        self.assertEqual(response.status_code, 200)
         self.assertEqual(Booking.objects.count(), self.count)
+        SchedulingPolicy.objects.create(granularity=30, min_ride=30)
+        self.client.post(url, data=post_data)
+        self.assertEqual(Booking.objects.count(), self.count + 1)
 
     def test_book_on_past(self):
         post_data = self.cases['past_date']
         date = '2000-01-03'
-        slots = "[('10:00', '22:00')]"
         response = self.client.post(
-            f"{self.create_url}?slots={slots}&selected_date={date}",
+            f"{self.create_url}?selected_date={date}",
             data=post_data,
         )
         self.assertEqual(response.status_code, 200)
@@ -88,11 +163,19 @@ class TestBookingCreate(BTRTestCase):
 
     def test_bikes_overcounted(self):
         post_data = self.cases['to_many_bikes']
-        slots = "[('10:00', '22:00')]"
         response = self.client.post(
-            f"{self.create_url}?slots={slots}&selected_date="
-            f"{post_data['booking_date']}",
+            f"{self.create_url}?selected_date={post_data['booking_date']}",
             data=post_data,
         )
         self.assertEqual(response.status_code, 200)
         self.assertEqual(Booking.objects.count(), self.count)
+
+    @override_settings(FLEET_SIZE=6)
+    def test_bikes_limit_follows_fleet(self):
+        post_data = {**self.cases['correct'], 'bike_count': 7}
+        response = self.client.post(
+            f"{self.create_url}?selected_date={post_data['booking_date']}",
+            data=post_data,
+        )
+        self.assertFormError(response.context['form'], 'bike_count',
+                             'Bikes count must be at 1-6')
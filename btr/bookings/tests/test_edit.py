@@ -1,5 +1,8 @@
+from django.db.models.signals import post_save
 from django.urls import reverse
 
+from btr.bookings.models import Booking
+
 from btr.fixtures_loader import load_json
 from btr.test_init import BTRTestCase
 
@@ -55,6 +58,18 @@ class TestBookingEdit(BTRTestCase):
             'users/profile.html',
         )
 
+    def test_saved_once(self):
+        saves = []
+
+        def count(sender, instance, **kwargs):
+            saves.append(instance.pk)
+
+        post_save.connect(count, sender=Booking)
+        self.addCleanup(post_save.disconnect, count, sender=Booking)
+        self.client.post(reverse('book_edit', kwargs={'pk': 1}),
+                         self.edit_cases['same_time'])
+        self.assertEqual(saves, [1])
+
     def test_with_same_start(self):
         response = self.client.post(
             reverse('book_edit', kwargs={'pk': 1}),
@@ -0,0 +1,188 @@
+from datetime import time
+
+from django.test import SimpleTestCase
+
+from btr.bookings.occupancy import (DayCapacity, DayOccupancy, RidePolicy,
+                                    format_capacity, format_duration,
+                                    parse_duration, to_clock, to_minutes)
+from btr.bookings.validators import validate_ride_time, validate_slots
+from btr.orm_utils import SlotsFinder
+from btr.tg_bot.utils.exceptions import TimeIsNotAvailable
+from btr.tg_bot.utils.handlers import (check_available_hours,
+                                       check_available_start_time,
+                                       extract_hours, extract_start_times,
+                                       get_bikes_options)
+
+
+class TestDayOccupancy(SimpleTestCase):
+
+    def setUp(self):
+        self.day = DayOccupancy(time(11), time(22))
+        self.day.book(time(17), time(18))
+
+    def test_conversions(self):
+        self.assertEqual(to_minutes('09:30'), 570)
+        self.assertEqual(to_minutes(time(9, 30)), 570)
+        self.assertEqual(to_clock(570), '09:30')
+
+    def test_free_intervals(self):
+        self.assertEqual(self.day.free_intervals(), [(660, 960), (1140, 1320)])
+
+    def test_closed_day(self):
+        self.assertEqual(DayOccupancy().free_intervals(), [])
+        self.assertEqual(
+            SlotsFinder.get_capacity((None, None), []).segments, []
+        )
+
+    def test_overlapping_bookings(self):
+        self.day.book('12:00', '13:00')
+        self.day.book('12:30', '14:00')
+        self.assertEqual(self.day.free_intervals(), [(900, 960), (1140, 1320)])
+
+    def test_buffer_out_of_day(self):
+        day = DayOccupancy('00:00', '23:59')
+        day.book('00:00', '01:00')
+        day.book('23:00', '23:59')
+        self.assertEqual(day.free_intervals(), [(120, 1320)])
+
+    def test_is_free(self):
+        self.assertTrue(self.day.is_free('11:00', '16:00'))
+        self.assertTrue(self.day.is_free(time(19), time(22)))
+        self.assertFalse(self.day.is_free('15:00', '17:00'))
+        self.assertFalse(self.day.is_free('12:00', '12:00'))
+        self.assertFalse(self.day.is_free('13:00', '12:00'))
+
+    def test_start_times(self):
+        self.assertEqual(
+            [to_clock(start) for start in self.day.start_times()],
+            ['11:00', '12:00', '13:00', '14:00', '15:00',
+             '19:00', '20:00', '21:00'],
+        )
+        self.assertEqual(self.day.start_times(duration=240), [660, 720])
+
+    def test_durations(self):
+        self.assertEqual(self.day.durations('14:00'), [60, 120])
+        self.assertEqual(self.day.durations('17:00'), [])
+
+    def test_from_free_intervals(self):
+        day = DayOccupancy.from_free_intervals([('11:00', '16:00'),
+                                                ('19:00', '22:00')])
+        self.assertEqual(day.busy, self.day.busy)
+
+
+class TestRidePolicy(SimpleTestCase):
+
+    def setUp(self):
+        self.policy = RidePolicy(buffer=30, step=15, min_ride=30,
+                                 max_ride=90)
+        self.day = DayOccupancy('10:00', '13:00')
+        self.day.book('11:00', '11:30', buffer=self.policy.buffer)
+
+    def test_start_times_on_grid(self):
+        self.assertEqual(
+            [to_clock(start) for start in self.policy.start_times(self.day)],
+            ['10:00', '12:00', '12:15', '12:30'],
+        )
+        # off-grid free interval starts at the next grid minute
+        day = DayOccupancy('10:10', '11:00')
+        self.assertEqual(self.policy.start_times(day), [615, 630])
+
+    def test_durations_limits(self):
+        day = DayOccupancy('10:00', '22:00')
+        self.assertEqual(self.policy.durations(day, '10:00'), [30, 45, 60,
+                                                               75, 90])
+        self.assertEqual(self.policy.durations(self.day, '12:15'), [30, 45])
+        self.assertEqual(self.policy.durations(day, '10:05'), [])
+
+    def test_allows(self):
+        self.assertTrue(self.policy.allows('10:15', '11:00'))
+        self.assertFalse(self.policy.allows('10:10', '11:10'))
+        self.assertFalse(self.policy.allows('10:00', '10:15'))
+        self.assertFalse(self.policy.allows('10:00', '12:00'))
+
+    def test_durations_format(self):
+        self.assertEqual([format_duration(minutes) for minutes in (60, 90)],
+                         ['1', '1:30'])
+        self.assertEqual(parse_duration('2'), 120)
+        self.assertEqual(parse_duration('1:30'), 90)
+        with self.assertRaises(ValueError):
+            parse_duration('1:3')
+
+    def test_bot_helpers(self):
+        intervals = self.day.free_intervals()
+        self.assertEqual(extract_hours(intervals, '12:15', self.policy),
+                         ['0:30', '0:45'])
+        self.assertEqual(extract_start_times(intervals, self.policy)[:2],
+                         ['10:00', '12:00'])
+        self.assertTrue(check_available_hours('12:00', '0:45', intervals,
+                                              self.policy))
+        with self.assertRaises(TimeIsNotAvailable):
+            check_available_hours('12:00', '0:15', intervals, self.policy)
+
+
+class TestDayCapacity(SimpleTestCase):
+
+    def setUp(self):
+        self.day = DayCapacity(time(10), time(22), fleet=4)
+        self.day.book(time(17), time(18), bikes=3)
+
+    def test_segments(self):
+        self.assertEqual(self.day.segments,
+                         [(600, 960, 4), (960, 1140, 1), (1140, 1320, 4)])
+        self.assertEqual(format_capacity(self.day.segments)[1],
+                         ('16:00', '19:00', 1))
+        self.assertEqual(self.day.load, 18)
+
+    def test_free_intervals_per_bikes(self):
+        self.assertEqual(self.day.free_intervals(), [(600, 1320)])
+        self.assertEqual(self.day.free_intervals(bikes=2),
+                         [(600, 960), (1140, 1320)])
+        self.assertEqual(self.day.occupancy(2).durations('14:00'), [60, 120])
+
+    def test_full_fleet(self):
+        self.day.book('17:00', '18:00')
+        self.assertEqual(self.day.free_intervals(),
+                         [(600, 960), (1140, 1320)])
+        self.assertEqual(self.day.free_bikes('12:00', '13:00'), 4)
+        self.assertEqual(self.day.free_bikes('15:00', '17:00'), 0)
+
+    def test_free_bikes_out_of_hours(self):
+        self.assertEqual(self.day.free_bikes('09:00', '11:00'), 0)
+        self.assertEqual(self.day.free_bikes('21:00', '21:00'), 0)
+        self.assertEqual(DayCapacity().free_bikes('12:00', '13:00'), 0)
+
+    def test_from_segments(self):
+        day = DayCapacity.from_segments(self.day.segments, 4)
+        self.assertEqual(day.free_intervals(bikes=2),
+                         self.day.free_intervals(bikes=2))
+        self.assertEqual(day.load, self.day.load)
+
+
+class TestSharedSlotChecks(SimpleTestCase):
+
+    intervals = [(660, 960), (1140, 1320)]
+    slots = [('11:00', '16:00'), ('19:00', '22:00')]
+
+    def test_web_validators(self):
+        self.assertTrue(validate_slots(self.slots, (time(12), time(14))))
+        self.assertFalse(validate_slots(self.slots, (time(15), time(17))))
+        policy = RidePolicy()
+        self.assertTrue(validate_ride_time(time(12), time(14), policy))
+        self.assertFalse(validate_ride_time(time(12), time(13, 30), policy))
+
+    def test_bot_helpers(self):
+        self.assertEqual(extract_start_times(self.intervals)[-3:],
+                         ['19:00', '20:00', '21:00'])
+        self.assertEqual(extract_hours(self.intervals, '13:00'),
+                         ['1', '2', '3'])
+        self.assertTrue(check_available_start_time('15:00', self.intervals))
+        self.assertTrue(check_available_hours('19:00', '3', self.intervals))
+        with self.assertRaises(TimeIsNotAvailable):
+            check_available_start_time('16:00', self.intervals)
+        with self.assertRaises(TimeIsNotAvailable):
+            check_available_hours('15:00', '2', self.intervals)
+
+    def test_bikes_options(self):
+        self.assertEqual(get_bikes_options(), ['1', '2', '3', '4'])
+        self.assertEqual(get_bikes_options(2), ['1', '2'])
+        self.assertEqual(get_bikes_options(0), [])
@@ -0,0 +1,79 @@
+from datetime import timedelta
+
+from django.utils import timezone
+from django.utils.translation import gettext as _
+
+from btr.bookings.models import Booking
+from btr.tasks.bookings import check_booking_status
+from btr.test_init import BTRTestCase
+
+
+class TestCheckBookingStatus(BTRTestCase):
+
+    def create_booking(self, days: int, status: str, **kwargs) -> Booking:
+        booking_date = timezone.localdate() + timedelta(days=days)
+        data = {
+            'rider': self.user3,
+            'booking_date': booking_date,
+            'start_time': '10:00',
+            'end_time': '11:00',
+            'bike_count': 1,
+            'status': status,
+        }
+        data.update(kwargs)
+        return Booking.objects.create(**data)
+
+    def test_complete_finished_bookings(self):
+        finished = [self.create_booking(-1, _('confirmed')) for _i in range(3)]
+        pending = self.create_booking(-1, _('pending'))
+        upcoming = self.create_booking(1, _('confirmed'))
+        self.assertEqual(check_booking_status(), 3)
+        for booking in finished:
+            booking.refresh_from_db()
+            self.assertEqual(booking.status, _('completed'))
+        pending.refresh_from_db()
+        upcoming.refresh_from_db()
+        self.assertEqual(pending.status, _('pending'))
+        self.assertEqual(upcoming.status, _('confirmed'))
+        # nothing left to complete
+        self.assertEqual(check_booking_status(), 0)
+
+    def test_today_bookings(self):
+        now = timezone.localtime()
+        if now.hour in (0, 23):
+            self.skipTest('booking would cross midnight')
+        past_end = (now - timedelta(minutes=30)).time()
+        future_end = (now + timedelta(minutes=30)).time()
+        ended = self.create_booking(0, _('confirmed'), start_time='00:00',
+                                    end_time=past_end)
+        running = self.create_booking(0, _('confirmed'), start_time='00:00',
+                                      end_time=future_end)
+        check_booking_status()
+        ended.refresh_from_db()
+        running.refresh_from_db()
+        self.assertEqual(ended.status, _('completed'))
+        self.assertEqual(running.status, _('confirmed'))
+
+    def test_constant_queries(self):
+        for _i in range(5):
+            self.create_booking(-1, _('confirmed'))
+            self.create_booking(-2, _('confirmed'), rider=self.user2)
+        # savepoint, claim, update bookings, update riders counters
+        # and levels, release savepoint
+        with self.assertNumQueries(5):
+            check_booking_status()
+
+    def test_rider_level(self):
+        for _i in range(3):
+            self.create_booking(-1, _('confirmed'))
+        check_booking_status()
+        self.user3.refresh_from_db()
+        self.user2.refresh_from_db()
+        self.assertEqual(self.user3.status, _('Amateur'))
+        self.assertEqual(self.user2.status, _('Newbie'))
+
+    def test_batch_size(self):
+        for _i in range(3):
+            self.create_booking(-1, _('confirmed'))
+        self.assertEqual(check_booking_status(batch_size=2), 2)
+        self.assertEqual(check_booking_status(batch_size=2), 1)
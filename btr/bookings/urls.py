@@ -1,9 +1,12 @@
 from django.urls import path
 from .views import (BookingCreateView, BookingEditView, BookingCancelView,
-                    BookingIndexView, BookingDetailView)
+                    BookingIndexView, BookingDetailView,
+                    BookingAvailabilityView)
 
 urlpatterns = [
     path('', BookingIndexView.as_view(), name='bookings'),
+    path('availability/', BookingAvailabilityView.as_view(),
+         name='book_availability'),
     path('create/', BookingCreateView.as_view(), name='book_create'),
     path('<int:pk>/show/', BookingDetailView.as_view(), name='book_show'),
     path('<int:pk>/cancel/', BookingCancelView.as_view(), name='book_cancel'),
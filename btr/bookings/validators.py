@@ -1,4 +1,8 @@
-from datetime import datetime, timedelta
+from datetime import datetime
+
+from django.conf import settings
+
+from .occupancy import DayOccupancy, RidePolicy
 
 
 def validate_slots(available_slots: list, desired_slot: tuple) -> bool:
@@ -12,13 +16,8 @@ def validate_slots(available_slots: list, desired_slot: tuple) -> bool:
     Returns:
         bool: True if the slot is available, False otherwise.
     """
-    desired_start, desired_end = desired_slot
-    if desired_start >= desired_end:
-        return False
-    for start, end in available_slots:
-        if desired_start >= start and desired_end <= end:
-            return True
-    return False
+    day = DayOccupancy.from_free_intervals(available_slots)
+    return day.is_free(*desired_slot)
 
 
 def validate_start_time(time: datetime.time, date: str) -> bool:
@@ -41,35 +40,31 @@ def validate_start_time(time: datetime.time, date: str) -> bool:
     return full_date > now
 
 
-def validate_equal_hour(start: datetime.time, end: datetime.time) -> bool:
+def validate_ride_time(start: datetime.time, end: datetime.time,
+                       policy: RidePolicy) -> bool:
     """
-    Check if the common ride time is equal to an hour.
+    Check the ride against the slot granularity and ride length limits.
 
     Args:
         start (datetime.time): The start time.
         end (datetime.time): The end time.
+        policy (RidePolicy): Scheduling policy of the track.
 
     Returns:
-        bool: True if the duration is equal to an hour, False otherwise.
+        bool: True if the ride fits the policy, False otherwise.
 
     Example:
-        validate_equal_hour(start_time, end_time)
+        validate_ride_time(start_time, end_time, finder.policy)
     """
-    start_datetime = datetime.combine(datetime.today(), start)
-    end_datetime = datetime.combine(datetime.today(), end)
+    return policy.allows(start, end)
 
-    diff = end_datetime - start_datetime
-    one_hour = timedelta(hours=1)
 
-    return diff.total_seconds() % one_hour.total_seconds() == 0
-
-
-def validate_bikes(bikes: str) -> bool:
+def validate_bikes(bikes: int | str) -> bool:
     """
-    Validate the number of bikes requested.
+    Validate the number of bikes requested against the fleet size.
 
     Args:
-        bikes (str): The number of bikes requested.
+        bikes (int | str): The number of bikes requested.
 
     Returns:
         bool: True if the bike count is valid, False otherwise.
@@ -77,4 +72,6 @@ def validate_bikes(bikes: str) -> bool:
     Example:
         validate_bikes('3')
     """
-    return 1 <= int(bikes) <= 4
+    if bikes is None:
+        return False
+    return 1 <= int(bikes) <= settings.FLEET_SIZE
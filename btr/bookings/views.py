@@ -1,25 +1,38 @@
 from datetime import datetime, date
 import calendar
-import ast
 
+from django.conf import settings
 from django.contrib.messages.views import SuccessMessageMixin
+from django.core.exceptions import ValidationError
+from django.http import JsonResponse
 from django.urls import reverse_lazy, reverse
+from django.utils.functional import SimpleLazyObject
+from django.views import View
+from django.views.decorators.cache import never_cache
+from django.utils.decorators import method_decorator
 from django.views.generic import (CreateView, UpdateView, TemplateView,
                                   DetailView)
 from django.utils.translation import gettext as _
 
-from ..mixins import UserAuthRequiredMixin, BookingPermissionMixin
+from ..mixins import (AdmittedSuccessMixin, BookingPermissionMixin,
+                      UserAuthRequiredMixin)
 from .models import Booking
+from .occupancy import (DayCapacity, RidePolicy, format_capacity,
+                        format_intervals, to_clock)
+from .validators import validate_bikes
 from .forms import BookingForm, BookingEditForm, BookingCancelForm
 from ..orm_utils import LoadCalc, SlotsFinder, AsyncTools
 from ..tasks.admin import send_vk_notify
 from ..tasks.bookings import (send_booking_details, send_cancel_self_message,
                               send_self_edit_booking_message)
+from ..workhours.models import SchedulingPolicy
 
 
 class BookingIndexView(TemplateView):
 
     template_name = 'bookings/index.html'
+    # session, rider and month loads on a cold cache (see MetricsMiddleware)
+    query_budget = 9
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -43,16 +56,105 @@ class BookingIndexView(TemplateView):
         update_context = {
             'current_month': date(current_year, current_month, 1),
             'current_year': current_year,
-            'current_calendar': current_load.get_month_load(),
+            # loads are computed only if the rendered fragments of
+            # the months are not cached for the availability versions
+            'current_calendar': SimpleLazyObject(current_load.get_month_load),
+            'current_version': current_load.get_version(),
+            # day modals are empty shells, slots are loaded on open
+            'current_days': range(
+                1, calendar.monthrange(current_year, current_month)[1] + 1
+            ),
             'today': current_day,
             'next_month': date(next_year, next_month, 1),
             'next_year': next_year,
-            'next_calendar': next_load.get_month_load(),
+            'next_calendar': SimpleLazyObject(next_load.get_month_load),
+            'next_version': next_load.get_version(),
+            'next_days': range(
+                1, calendar.monthrange(next_year, next_month)[1] + 1
+            ),
         }
         context.update(update_context)
         return context
 
 
+@method_decorator(never_cache, name='dispatch')
+class BookingAvailabilityView(View):
+    """
+    Free slots and bikes of a day or a range of days as JSON.
+
+    Usage:
+        GET ?date=YYYY-MM-DD or ?start=YYYY-MM-DD&end=YYYY-MM-DD,
+         optional &bikes=N for intervals and start times of N bikes.
+    """
+
+    max_days = 62
+    # policy and 3 queries per month, a range spans up to 3 months
+    query_budget = 10
+
+    def get(self, request, *args, **kwargs):
+        try:
+            if 'date' in request.GET:
+                first = last = self.parse_date(request.GET['date'])
+            else:
+                first = self.parse_date(request.GET.get('start'))
+                last = self.parse_date(request.GET.get('end'))
+        except (TypeError, ValueError):
+            return JsonResponse(
+                {'error': 'Expected date or start and end as YYYY-MM-DD'},
+                status=400,
+            )
+        if last < first or (last - first).days >= self.max_days:
+            return JsonResponse(
+                {'error': f'Range must be 1-{self.max_days} days'},
+                status=400,
+            )
+        bikes = request.GET.get('bikes', '1')
+        if not bikes.isdigit() or not validate_bikes(bikes):
+            return JsonResponse(
+                {'error': f'Bikes must be 1-{settings.FLEET_SIZE}'},
+                status=400,
+            )
+        availability = SlotsFinder.get_range_availability(first, last)
+        policy = SchedulingPolicy.get_policy()
+        return JsonResponse({
+            'fleet': settings.FLEET_SIZE,
+            'days': [self.serialize(day, availability[day], policy,
+                                    int(bikes))
+                     for day in sorted(availability)],
+        })
+
+    @staticmethod
+    def parse_date(value: str) -> date:
+        return datetime.strptime(value, '%Y-%m-%d').date()
+
+    @staticmethod
+    def serialize(day: date, availability: dict, policy: RidePolicy,
+                  bikes: int = 1) -> dict:
+        """
+        Convert day availability to the API format.
+
+        Args:
+            day (date): The day.
+            availability (dict): 'capacity' and 'load' of the day.
+            policy (RidePolicy): Scheduling policy for start times.
+            bikes (int): Count of bikes for intervals and start times.
+
+        Returns:
+            dict: Date, load, ranges with free bikes, free intervals and
+             ride start times of the bikes as 'HH:MM' strings.
+        """
+        capacity = DayCapacity.from_segments(availability.get('capacity'),
+                                             settings.FLEET_SIZE)
+        starts = policy.start_times(capacity.occupancy(bikes))
+        return {
+            'date': day.isoformat(),
+            'load': availability.get('load'),
+            'capacity': format_capacity(capacity.segments),
+            'intervals': format_intervals(capacity.free_intervals(bikes)),
+            'starts': [to_clock(start) for start in starts],
+        }
+
+
 class BookingDetailView(UserAuthRequiredMixin, BookingPermissionMixin,
                         DetailView):
 
@@ -64,7 +166,7 @@ class BookingDetailView(UserAuthRequiredMixin, BookingPermissionMixin,
     foreign_book_url = reverse_lazy('home')
 
 
-class BookingCreateView(UserAuthRequiredMixin, SuccessMessageMixin,
+class BookingCreateView(UserAuthRequiredMixin, AdmittedSuccessMixin,
                         CreateView):
 
     model = Booking
@@ -77,23 +179,17 @@ class BookingCreateView(UserAuthRequiredMixin, SuccessMessageMixin,
 
     def get_form_kwargs(self):
         """
-        Provide chosen date and time slots to form.
+        Provide chosen date to form, the form finds free slots itself.
         """
         kwargs = super().get_form_kwargs()
-        kwargs['available_slots'] = self.request.GET.get('slots')
         kwargs['current_date'] = self.request.GET.get('selected_date')
         return kwargs
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         selected_date = self.request.GET.get('selected_date')
-        slots: str = self.request.GET.get('slots')
-        try:
-            parsed_slots = ast.literal_eval(slots)
-        except (ValueError, SyntaxError):
-            parsed_slots = []
         update_context = {
-            'ranges': parsed_slots,
+            'ranges': SlotsFinder(selected_date).find_capacity_slots(),
             'date': datetime.strptime(selected_date, '%Y-%m-%d').date()
         }
         context.update(update_context)
@@ -106,16 +202,18 @@ class BookingCreateView(UserAuthRequiredMixin, SuccessMessageMixin,
         user = self.request.user
         form.instance.booking_date = selected_date
         form.instance.rider = user
-        # automatically set status as confirmed if executor are admin
-        if user.is_superuser:
-            status = _('confirmed')
-            form.instance.status = status
-            form.save()
+        # automatically set status as confirmed if executor are admin,
         # otherwise, status are pending
-        else:
-            status = _('pending')
-            form.instance.status = status
-            instance = form.save()
+        status = _('confirmed') if user.is_superuser else _('pending')
+        form.instance.status = status
+        # the form checked cached slots, admission checks them again
+        # with the date locked
+        try:
+            instance = SlotsFinder(selected_date).admit(form.instance)
+        except ValidationError as error:
+            form.add_error(None, error)
+            return self.form_invalid(form)
+        if not user.is_superuser:
             data = {
                 'pk': instance.pk,
                 'client': instance.rider.username,
@@ -131,15 +229,15 @@ class BookingCreateView(UserAuthRequiredMixin, SuccessMessageMixin,
             via = _('Web Site')
             send_vk_notify.delay(via, True, data, is_admin=False)
             send_booking_details.delay(**data)
-
-        return super().form_valid(form)
+        # saved by the admission
+        return self.admitted(form, instance)
 
     def get_success_url(self):
         return reverse('profile', kwargs={'pk': self.request.user.id})
 
 
 class BookingEditView(UserAuthRequiredMixin, BookingPermissionMixin,
-                      SuccessMessageMixin, UpdateView):
+                      AdmittedSuccessMixin, UpdateView):
 
     model = Booking
     form_class = BookingEditForm
@@ -153,24 +251,26 @@ class BookingEditView(UserAuthRequiredMixin, BookingPermissionMixin,
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        booking = Booking.objects.get(pk=self.kwargs['pk'])
+        booking = self.object
         slots = SlotsFinder(booking.booking_date.strftime('%Y-%m-%d'))
-        excluded_slot = (booking.start_time, booking.end_time)
-        context['slots'] = slots.find_available_slots(excluded_slot)
+        context['slots'] = slots.find_capacity_slots(excluded_pk=booking.pk)
         return context
 
     def get_form_kwargs(self):
         kwargs = super().get_form_kwargs()
-        booking = Booking.objects.get(pk=self.kwargs['pk'])
-        booking_date = booking.booking_date.strftime('%Y-%m-%d')
-        slots = SlotsFinder(booking_date)
-        excluded_slot = (booking.start_time, booking.end_time)
-        kwargs['slots'] = slots.find_available_slots(excluded_slot)
-        kwargs['date'] = booking_date
+        kwargs['date'] = self.object.booking_date.strftime('%Y-%m-%d')
         return kwargs
 
     def form_valid(self, form):
         user = self.request.user
+        if not user.is_superuser:
+            form.instance.status = _('pending')
+        booking_date = form.instance.booking_date.strftime('%Y-%m-%d')
+        try:
+            instance = SlotsFinder(booking_date).admit(form.instance)
+        except ValidationError as error:
+            form.add_error(None, error)
+            return self.form_invalid(form)
         if not user.is_superuser:
             date_obj = form.instance.booking_date.strftime('%Y-%B-%d')
             via = _('Web Site')
@@ -188,9 +288,8 @@ class BookingEditView(UserAuthRequiredMixin, BookingPermissionMixin,
             }
             send_vk_notify.delay(via, False, data, False)
             send_self_edit_booking_message(**data)
-            form.instance.status = _('pending')
-            form.save()
-        return super().form_valid(form)
+        # saved by the admission
+        return self.admitted(form, instance)
 
     def get_success_url(self):
         return reverse('profile', kwargs={'pk': self.request.user.id})
@@ -1,7 +1,122 @@
-from django.core.mail import EmailMessage
-from django.template.loader import render_to_string
+from typing import List
+
 from django.utils.translation import gettext as _
 
+from btr.notifications.outbox import enqueue, get_last_dedupe_key
+from btr.notifications.rendering import render, render_many
+
+
+def get_booking_headers(action: str) -> dict:
+    """
+    Get subject and headers of a booking email.
+
+    Args:
+        action (str): Email action (e.g. 'confirm', 'self-cancel').
+
+    Returns:
+        dict: 'subject', 'pre_header' and 'header' texts.
+    """
+    headers = {
+        'create': (
+            _('New Booking Created'),
+            _('An new booking created nearly'),
+            _('New Booking Created'),
+        ),
+        'confirm': (
+            _('Booking Confirmed'),
+            _('Booking confirmed successfully'),
+            _('Booking Confirmed'),
+        ),
+        'cancel': (
+            _('Booking Canceled'),
+            _('Booking was canceled'),
+            _('Booking Canceled'),
+        ),
+        'self-cancel': (
+            _('Booking Canceled'),
+            _('You are canceled booking'),
+            _('Booking Canceled'),
+        ),
+        'edit': (
+            _('Booking edited'),
+            _('Booking was edited'),
+            _('Booking Edited'),
+        ),
+        'self-edit': (
+            _('Booking edited'),
+            _('You are edit the booking'),
+            _('Booking Edited'),
+        ),
+    }
+    subject, pre_header, header = headers[action]
+    return {'subject': subject, 'pre_header': pre_header, 'header': header}
+
+
+def get_booking_dedupe_key(action: str, booking: dict) -> str:
+    """
+    Get the outbox dedupe key of a booking email.
+
+    Emails of a booking are numbered ('booking:{pk}:{number}:{change}'),
+     only a repeat of the latest one is a duplicate. So confirm, cancel
+     and confirm again are all sent, while a repeated confirm is dropped.
+     Edits are only equal when the new booking details are the same.
+    """
+    pk = booking.get('pk')
+    if action in ('edit', 'self-edit'):
+        change = (f'edit:{booking.get("date")}:{booking.get("start")}:'
+                  f'{booking.get("end")}')
+    elif action == 'self-cancel':
+        change = 'cancel'
+    else:
+        change = action
+    prefix = f'booking:{pk}:'
+    last = get_last_dedupe_key(prefix)
+    if last is None:
+        return f'{prefix}0:{change}'
+    number, last_change = last[len(prefix):].split(':', 1)
+    if last_change == change:
+        # enqueue drops it
+        return last
+    return f'{prefix}{int(number) + 1}:{change}'
+
+
+def booking_mail(action: str, email: str, booking: dict) -> None:
+    """
+    Render and queue a booking email.
+
+    Args:
+        action (str): Email action (e.g. 'confirm', 'self-cancel').
+        email (str): The recipient email address.
+        booking (dict): Booking details (pk, date, start, end, bikes, etc.).
+
+    Returns:
+        None
+    """
+    headers = get_booking_headers(action)
+    html_content = render(action, {**booking, **headers})
+    enqueue(email, headers['subject'], html_content,
+            dedupe_key=get_booking_dedupe_key(action, booking))
+
+
+def bulk_booking_mail(action: str, bookings: List[dict]) -> None:
+    """
+    Render and queue booking emails for many recipients in one pass
+     (e.g. for admin mass actions).
+
+    Args:
+        action (str): Email action (e.g. 'confirm', 'cancel').
+        bookings (list): Booking details with recipient 'email'.
+
+    Returns:
+        None
+    """
+    headers = get_booking_headers(action)
+    contexts = [{**booking, **headers} for booking in bookings]
+    for booking, html_content in zip(bookings,
+                                     render_many(action, contexts)):
+        enqueue(booking.get('email'), headers['subject'], html_content,
+                dedupe_key=get_booking_dedupe_key(action, booking))
+
 
 def verification_code_mail(email: str, code: str) -> None:
     """
@@ -15,22 +130,12 @@ def verification_code_mail(email: str, code: str) -> None:
         None
     """
     subject = _('Password reset')
-    html_content = render_to_string(
-        'emails/email_base.html', {
-            'action': 'password-reset',
-            'pre_header': _('Verification code for password reset'),
-            'header': _('Password reset'),
-            'code': code,
-        }
-    )
-    msg = EmailMessage(
-        subject,
-        html_content,
-        'broteamracing@yandex.ru',
-        [email]
-    )
-    msg.content_subtype = "html"
-    msg.send()
+    html_content = render('password-reset', {
+        'pre_header': _('Verification code for password reset'),
+        'header': _('Password reset'),
+        'code': code,
+    })
+    enqueue(email, subject, html_content)
 
 
 def recover_message_mail(email: str, password: str, username: str) -> None:
@@ -46,23 +151,13 @@ def recover_message_mail(email: str, password: str, username: str) -> None:
         None
     """
     subject = _('Recovered Sign-In message')
-    html_content = render_to_string(
-        'emails/email_base.html', {
-            'action': 'recover-data',
-            'pre_header': _('Mail with recovered sign-in data'),
-            'header': _('Recovered Sign-In Info'),
-            'username': username,
-            'password': password
-        }
-    )
-    msg = EmailMessage(
-        subject,
-        html_content,
-        'broteamracing@yandex.ru',
-        [email]
-    )
-    msg.content_subtype = "html"
-    msg.send()
+    html_content = render('recover-data', {
+        'pre_header': _('Mail with recovered sign-in data'),
+        'header': _('Recovered Sign-In Info'),
+        'username': username,
+        'password': password
+    })
+    enqueue(email, subject, html_content)
 
 
 def registration_mail(email: str, name: str, login: str,
@@ -80,23 +175,14 @@ def registration_mail(email: str, name: str, login: str,
         None
     """
     subject = _('Hello from BroTeamRacing')
-    html_content = render_to_string(
-        'emails/email_base.html', {
-            'header': _('Welcome'),
-            'name': name,
-            'username': login,
-            'password': password,
-            'action': 'registration',
-        }
-    )
-    msg = EmailMessage(
-        subject,
-        html_content,
-        'broteamracing@yandex.ru',
-        [email]
-    )
-    msg.content_subtype = "html"
-    msg.send()
+    html_content = render('registration', {
+        'header': _('Welcome'),
+        'name': name,
+        'username': login,
+        'password': password,
+    })
+    enqueue(email, subject, html_content,
+            dedupe_key=f'registration:{email}')
 
 
 def create_booking_mail(email: str, name: str, date: str, status: str,
@@ -117,29 +203,15 @@ def create_booking_mail(email: str, name: str, date: str, status: str,
     Returns:
         None
     """
-    subject = _('New Booking Created')
-    html_content = render_to_string(
-        'emails/email_base.html', {
-            'pre_header': _('An new booking created nearly'),
-            'header': _('New Booking Created'),
-            'action': 'create',
-            'name': name,
-            'date': date,
-            'start': start,
-            'end': end,
-            'bikes': bikes,
-            'status': status,
-            'pk': pk,
-        }
-    )
-    msg = EmailMessage(
-        subject,
-        html_content,
-        'broteamracing@yandex.ru',
-        [email]
-    )
-    msg.content_subtype = "html"
-    msg.send()
+    booking_mail('create', email, {
+        'name': name,
+        'date': date,
+        'start': start,
+        'end': end,
+        'bikes': bikes,
+        'status': status,
+        'pk': pk,
+    })
 
 
 def confirm_booking_mail(email: str, pk: str, bikes: str,
@@ -158,27 +230,13 @@ def confirm_booking_mail(email: str, pk: str, bikes: str,
     Returns:
         None
     """
-    subject = _('Booking Confirmed')
-    html_content = render_to_string(
-        'emails/email_base.html', {
-            'pre_header': _('Booking confirmed successfully'),
-            'header': _('Booking Confirmed'),
-            'action': 'confirm',
-            'date': date,
-            'start': start,
-            'end': end,
-            'bikes': bikes,
-            'pk': pk,
-        }
-    )
-    msg = EmailMessage(
-        subject,
-        html_content,
-        'broteamracing@yandex.ru',
-        [email]
-    )
-    msg.content_subtype = "html"
-    msg.send()
+    booking_mail('confirm', email, {
+        'date': date,
+        'start': start,
+        'end': end,
+        'bikes': bikes,
+        'pk': pk,
+    })
 
 
 def cancel_booking_mail(email: str, pk: str, bikes: str, date: str,
@@ -199,41 +257,13 @@ def cancel_booking_mail(email: str, pk: str, bikes: str, date: str,
     Returns:
         None
     """
-    subject = _('Booking Canceled')
-    if not self_cancel:
-        html_content = render_to_string(
-            'emails/email_base.html', {
-                'pre_header': _('Booking was canceled'),
-                'header': _('Booking Canceled'),
-                'action': 'cancel',
-                'date': date,
-                'pk': pk,
-                'start': start,
-                'end': end,
-                'bikes': bikes,
-            }
-        )
-    else:
-        html_content = render_to_string(
-            'emails/email_base.html', {
-                'pre_header': _('You are canceled booking'),
-                'header': _('Booking Canceled'),
-                'action': 'self-cancel',
-                'date': date,
-                'pk': pk,
-                'start': start,
-                'end': end,
-                'bikes': bikes,
-            }
-        )
-    msg = EmailMessage(
-        subject,
-        html_content,
-        'broteamracing@yandex.ru',
-        [email]
-    )
-    msg.content_subtype = "html"
-    msg.send()
+    booking_mail('self-cancel' if self_cancel else 'cancel', email, {
+        'date': date,
+        'pk': pk,
+        'start': start,
+        'end': end,
+        'bikes': bikes,
+    })
 
 
 def edit_booking_mail(email: str, pk: str, bikes: str, date: str, start: str,
@@ -254,38 +284,10 @@ def edit_booking_mail(email: str, pk: str, bikes: str, date: str, start: str,
     Returns:
         None
     """
-    subject = _('Booking edited')
-    if not self_edit:
-        html_content = render_to_string(
-            'emails/email_base.html', {
-                'pre_header': _('Booking was edited'),
-                'header': _('Booking Edited'),
-                'action': 'edit',
-                'date': date,
-                'pk': pk,
-                'start': start,
-                'end': end,
-                'bikes': bikes,
-            }
-        )
-    else:
-        html_content = render_to_string(
-            'emails/email_base.html', {
-                'pre_header': _('You are edit the booking'),
-                'header': _('Booking Edited'),
-                'action': 'self-edit',
-                'date': date,
-                'pk': pk,
-                'start': start,
-                'end': end,
-                'bikes': bikes,
-            }
-        )
-    msg = EmailMessage(
-        subject,
-        html_content,
-        'broteamracing@yandex.ru',
-        [email]
-    )
-    msg.content_subtype = "html"
-    msg.send()
+    booking_mail('self-edit' if self_edit else 'edit', email, {
+        'date': date,
+        'pk': pk,
+        'start': start,
+        'end': end,
+        'bikes': bikes,
+    })
@@ -0,0 +1,85 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+
+
+class FakeVKHandler(BaseHTTPRequestHandler):
+    """
+    Answer VK api calls like 'POST /method/messages.send' and record them.
+    """
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        params = {
+            key: values[0] for key, values in
+            parse_qs(self.rfile.read(length).decode()).items()
+        }
+        method = self.path.rstrip('/').rsplit('/', 1)[-1]
+        server = self.server
+        with server.lock:
+            server.calls.append((method, params))
+            error = server.errors.pop(0) if server.errors else None
+        if server.on_call:
+            server.on_call(method, params)
+        if error:
+            payload = {'error': {
+                'error_code': error,
+                'error_msg': 'Fake VK error',
+                'request_params': [],
+            }}
+        else:
+            payload = {'response': server.responses.get(method, 1)}
+        body = json.dumps(payload).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FakeVKServer(ThreadingHTTPServer):
+    """
+    Local VK api endpoint to run notifications offline. Point VK_API_URL
+     setting to the server url.
+
+    Example:
+        with FakeVKServer() as vk:
+            ...
+            vk.get_calls('messages.send')
+    """
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0,
+                 on_call=None):
+        super().__init__((host, port), FakeVKHandler)
+        self.on_call = on_call
+        self.lock = threading.Lock()
+        self.calls = []
+        # error codes of next calls (e.g. 6 is too many requests)
+        self.errors = []
+        # results of methods, default is 1
+        self.responses = {}
+        self.thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f'http://{host}:{port}/method/'
+
+    def get_calls(self, method: str) -> list:
+        with self.lock:
+            return [params for name, params in self.calls if name == method]
+
+    def __enter__(self):
+        self.thread = threading.Thread(target=self.serve_forever,
+                                       daemon=True)
+        self.thread.start()
+        return self
+
+    def __exit__(self, *args):
+        self.shutdown()
+        self.server_close()
+        self.thread.join()
@@ -0,0 +1,345 @@
+import logging
+import threading
+import time
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, List
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.redis import RedisCache
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+PREFIX = 'metrics'
+# upper bounds of histogram buckets, the last bucket is +Inf
+DURATION_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50)
+# summed per view, times in microseconds
+TOTALS = ('requests', 'duration_us', 'db_us', 'render_us', 'queries',
+          'cache_hits', 'cache_misses')
+
+_current: ContextVar['RequestStats | None'] = ContextVar('request_stats',
+                                                         default=None)
+
+
+class RequestStats:
+    """
+    Database queries, cache lookups and template rendering of a request
+     (or of any code run inside collect()).
+
+    The object is installed as an execute wrapper of every database
+     connection, so it counts queries without the DEBUG queries log.
+    """
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.render_time = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.db_time += time.perf_counter() - started
+
+
+@contextmanager
+def collect() -> Iterator[RequestStats]:
+    """
+    Record queries, cache lookups and render time of the wrapped code.
+
+    Example:
+        with collect() as stats:
+            LoadCalc(month_cal, 2024, 3).get_month_load()
+        stats.queries  # 4
+    """
+    stats = RequestStats()
+    token = _current.set(stats)
+    try:
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(stats))
+            yield stats
+    finally:
+        _current.reset(token)
+
+
+def record_cache(hits: int = 0, misses: int = 0) -> None:
+    """
+    Count cache lookups of the current request, no-op outside collect().
+
+    Args:
+        hits (int): Values found in cache.
+        misses (int): Values which had to be computed.
+    """
+    stats = _current.get()
+    if stats is not None:
+        stats.cache_hits += hits
+        stats.cache_misses += misses
+
+
+def _get_redis():
+    """Redis client of the default cache, None for other backends"""
+    backend = caches['default']
+    if isinstance(backend, RedisCache):
+        return backend._cache.get_client(write=True)
+    return None
+
+
+def _bucket(value: float, bounds: tuple) -> str:
+    for bound in bounds:
+        if value <= bound:
+            return str(bound)
+    return '+Inf'
+
+
+def _get_fields() -> List[str]:
+    return [*TOTALS,
+            *(f'duration:{bound}' for bound in DURATION_BUCKETS_MS),
+            'duration:+Inf',
+            *(f'queries:{bound}' for bound in QUERY_BUCKETS),
+            'queries:+Inf']
+
+
+class MetricsStore:
+    """
+    Per-view counters. With the Redis cache every view is a hash and the
+     views are a set, a request is recorded with one pipelined round trip
+     and concurrent workers never lose updates. Other cache backends are
+     local to the process, there counters are kept in the process.
+    """
+
+    lock = threading.Lock()
+    local: Dict[str, Dict[str, int]] = {}
+
+    @staticmethod
+    def views_key() -> str:
+        return caches['default'].make_key(f'{PREFIX}:views')
+
+    @staticmethod
+    def view_key(view: str) -> str:
+        return caches['default'].make_key(f'{PREFIX}:view:{view}')
+
+    @classmethod
+    def add(cls, view: str, deltas: Dict[str, int]) -> None:
+        redis = _get_redis()
+        if redis is None:
+            with cls.lock:
+                counters = cls.local.setdefault(view, {})
+                for field, delta in deltas.items():
+                    counters[field] = counters.get(field, 0) + delta
+            return
+        pipe = redis.pipeline(transaction=False)
+        pipe.sadd(cls.views_key(), view)
+        for field, delta in deltas.items():
+            pipe.hincrby(cls.view_key(view), field, delta)
+        pipe.execute()
+
+    @classmethod
+    def get_all(cls) -> Dict[str, Dict[str, int]]:
+        redis = _get_redis()
+        if redis is None:
+            with cls.lock:
+                return {view: dict(counters)
+                        for view, counters in cls.local.items()}
+        views = sorted(view.decode() for view in
+                       redis.smembers(cls.views_key()))
+        pipe = redis.pipeline(transaction=False)
+        for view in views:
+            pipe.hgetall(cls.view_key(view))
+        return {
+            view: {field.decode(): int(value)
+                   for field, value in counters.items()}
+            for view, counters in zip(views, pipe.execute())
+        }
+
+    @classmethod
+    def clear(cls) -> None:
+        redis = _get_redis()
+        if redis is None:
+            with cls.lock:
+                cls.local.clear()
+            return
+        views = redis.smembers(cls.views_key())
+        redis.delete(cls.views_key(),
+                     *(cls.view_key(view.decode()) for view in views))
+
+
+def record(view: str, duration: float, stats: RequestStats) -> None:
+    """
+    Add a request to the aggregated metrics of the view.
+
+    Args:
+        view (str): Name of the view (url name).
+        duration (float): Request time in seconds.
+        stats (RequestStats): Stats collected during the request.
+    """
+    deltas = {
+        'requests': 1,
+        'duration_us': int(duration * 1e6),
+        'db_us': int(stats.db_time * 1e6),
+        'render_us': int(stats.render_time * 1e6),
+        'queries': stats.queries,
+        'cache_hits': stats.cache_hits,
+        'cache_misses': stats.cache_misses,
+        f'duration:{_bucket(duration * 1000, DURATION_BUCKETS_MS)}': 1,
+        f'queries:{_bucket(stats.queries, QUERY_BUCKETS)}': 1,
+    }
+    MetricsStore.add(view, {field: delta for field, delta in deltas.items()
+                            if delta})
+
+
+def get_metrics() -> Dict[str, dict]:
+    """
+    Get aggregated metrics of every recorded view.
+
+    Returns:
+        dict: Metrics keyed by view name: totals (see TOTALS) and
+         'duration_buckets' and 'query_buckets' histograms as
+         non-cumulative counts keyed by bucket upper bound.
+    """
+    metrics = {}
+    for view, counters in MetricsStore.get_all().items():
+        values = {field: counters.get(field, 0) for field in _get_fields()}
+        metrics[view] = {field: values[field] for field in TOTALS}
+        for name, histogram in (('duration', 'duration_buckets'),
+                                ('queries', 'query_buckets')):
+            metrics[view][histogram] = {
+                field.split(':', 1)[1]: value
+                for field, value in values.items()
+                if field.startswith(f'{name}:')
+            }
+    return metrics
+
+
+def reset_metrics() -> None:
+    MetricsStore.clear()
+
+
+def get_query_budget(request) -> int | None:
+    """
+    Get the query budget of the view which served the request.
+
+    Views declare it as a query_budget attribute (class based views) or
+     function attribute.
+
+    Returns:
+        int | None: Max queries of a request, None if there is no budget.
+    """
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return None
+    view = getattr(match.func, 'view_class', match.func)
+    return getattr(view, 'query_budget', None)
+
+
+def format_prometheus(metrics: Dict[str, dict]) -> str:
+    """
+    Render metrics in the Prometheus text format.
+
+    Args:
+        metrics (dict): Metrics from get_metrics().
+
+    Returns:
+        str: Exposition text.
+    """
+    lines: List[str] = []
+    histograms = (
+        ('btr_request_duration_ms', 'duration_buckets', 'duration_us', 1000),
+        ('btr_request_queries', 'query_buckets', 'queries', 1),
+    )
+    for metric, name, total, scale in histograms:
+        lines.append(f'# TYPE {metric} histogram')
+        for view, values in metrics.items():
+            cumulative = 0
+            for bound, count in values[name].items():
+                cumulative += count
+                lines.append(
+                    f'{metric}_bucket{{view="{view}",le="{bound}"}} '
+                    f'{cumulative}'
+                )
+            lines.append(f'{metric}_sum{{view="{view}"}} '
+                         f'{values[total] / scale:g}')
+            lines.append(f'{metric}_count{{view="{view}"}} '
+                         f'{values["requests"]}')
+    counters = (
+        ('btr_db_time_ms_total', 'db_us', 1000),
+        ('btr_render_time_ms_total', 'render_us', 1000),
+        ('btr_cache_hits_total', 'cache_hits', 1),
+        ('btr_cache_misses_total', 'cache_misses', 1),
+    )
+    for metric, field, scale in counters:
+        lines.append(f'# TYPE {metric} counter')
+        for view, values in metrics.items():
+            lines.append(f'{metric}{{view="{view}"}} '
+                         f'{values[field] / scale:g}')
+    return '\n'.join(lines) + '\n'
+
+
+class MetricsMiddleware:
+    """
+    Record query count, database time, cache hits and template render time
+     of every request.
+
+    Stats are added to aggregated per-view metrics (see the metrics view)
+     and kept on the response as response.metrics. In DEBUG they are also
+     sent as X-* and Server-Timing headers. A request over the query budget
+     of its view is logged as a warning.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        started = time.perf_counter()
+        with collect() as stats:
+            response = self.get_response(request)
+        duration = time.perf_counter() - started
+        match = getattr(request, 'resolver_match', None)
+        view = match.view_name if match and match.view_name else 'unresolved'
+        try:
+            record(view, duration, stats)
+        except Exception as error:
+            # metrics must never fail the request (e.g. Redis is down)
+            logger.warning('Metrics of %s are not recorded: %r',
+                           view, error)
+        response.metrics = stats
+        budget = get_query_budget(request)
+        if budget is not None and stats.queries > budget:
+            logger.warning('%s made %s queries, the budget is %s',
+                           view, stats.queries, budget)
+        if settings.DEBUG:
+            self.add_headers(response, duration, stats)
+        return response
+
+    def process_template_response(self, request, response):
+        # the template is rendered right after the template response
+        # middleware, the callback runs when rendering is done
+        stats = _current.get()
+        if stats is not None:
+            started = time.perf_counter()
+
+            def rendered(response):
+                stats.render_time += time.perf_counter() - started
+
+            response.add_post_render_callback(rendered)
+        return response
+
+    @staticmethod
+    def add_headers(response, duration: float, stats: RequestStats) -> None:
+        response['X-DB-Queries'] = stats.queries
+        response['X-DB-Time-Ms'] = f'{stats.db_time * 1000:.1f}'
+        response['X-Cache-Hits'] = stats.cache_hits
+        response['X-Cache-Misses'] = stats.cache_misses
+        response['X-Render-Time-Ms'] = f'{stats.render_time * 1000:.1f}'
+        response['Server-Timing'] = (
+            f'db;dur={stats.db_time * 1000:.1f}, '
+            f'render;dur={stats.render_time * 1000:.1f}, '
+            f'total;dur={duration * 1000:.1f}'
+        )
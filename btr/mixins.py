@@ -1,7 +1,9 @@
 from django.contrib import messages
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
+from django.contrib.messages.views import SuccessMessageMixin
 from django.core.exceptions import ObjectDoesNotExist
 from django.db.models import ProtectedError
+from django.http import HttpResponseRedirect
 from django.shortcuts import redirect
 
 
@@ -120,3 +122,19 @@ class DeleteProtectionMixin:
         except ProtectedError:
             messages.error(request, self.protection_message)
             return redirect(self.protected_url)
+
+
+class AdmittedSuccessMixin(SuccessMessageMixin):
+    """
+    Success response of a form whose instance is already saved (e.g. by
+     a booking admission under the date lock).
+
+    The ModelForm isn't saved again, the view only shows the success
+     message and redirects.
+    """
+    def admitted(self, form, instance):
+        self.object = instance
+        success_message = self.get_success_message(form.cleaned_data)
+        if success_message:
+            messages.success(self.request, success_message)
+        return HttpResponseRedirect(self.get_success_url())
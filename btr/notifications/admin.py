@@ -0,0 +1,35 @@
+from django.contrib import admin
+
+from .models import OutboxMessage
+
+
+class OutboxMessageAdmin(admin.ModelAdmin):
+    """
+    Admin configuration for the notifications outbox (read only).
+
+    Attributes:
+        list_display (tuple): Fields to display in the admin list view.
+        list_filter (tuple): Fields to use for filtering in the
+         admin list view.
+    """
+    list_display = (
+        'id',
+        'channel',
+        'recipient',
+        'subject',
+        'status',
+        'attempts',
+        'send_after',
+        'sent_at',
+    )
+    list_filter = ('status', 'channel')
+    search_fields = ('recipient', 'dedupe_key')
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+admin.site.register(OutboxMessage, OutboxMessageAdmin)
@@ -0,0 +1,12 @@
+from django.apps import AppConfig
+from django.utils.translation import gettext_lazy as _
+
+
+class NotificationsConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'btr.notifications'
+    verbose_name = _('Notifications')
+
+    def ready(self) -> None:
+        # register the outbox drain task
+        import btr.tasks.notifications  # noqa: F401
@@ -0,0 +1,87 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.template.loader import render_to_string
+from django.utils.translation import override
+
+from btr.emails import get_booking_headers
+from btr.notifications.rendering import (TEMPLATE_NAME, get_stencil, render,
+                                         render_many)
+
+
+ACTIONS = (
+    'password-reset', 'recover-data', 'registration', 'create', 'confirm',
+    'cancel', 'self-cancel', 'edit', 'self-edit',
+)
+
+
+class Command(BaseCommand):
+    """
+    Compare email rendering speed of render_to_string with the cached
+     stencils for each of the nine mail types.
+
+    Usage:
+        python manage.py bench_emails --renders 2000 --language ru-ru
+    """
+
+    help = 'Benchmark email rendering for every mail type'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--renders', type=int, default=1000)
+        parser.add_argument('--language', default='ru-ru')
+
+    def handle(self, *args, **options):
+        count = options['renders']
+        language = options['language']
+        get_stencil.cache_clear()
+        self.stdout.write(
+            f'{"action":<16}{"template":>12}{"stencil":>12}{"bulk":>12}'
+            f'  (renders/s)'
+        )
+        with override(language):
+            for action in ACTIONS:
+                contexts = [self.get_context(action, i) for i in range(count)]
+                started = time.perf_counter()
+                for context in contexts:
+                    render_to_string(TEMPLATE_NAME,
+                                     {**context, 'action': action})
+                template = self.rate(count, started)
+
+                started = time.perf_counter()
+                for context in contexts:
+                    render(action, context)
+                stencil = self.rate(count, started)
+
+                started = time.perf_counter()
+                render_many(action, contexts)
+                bulk = self.rate(count, started)
+                self.stdout.write(
+                    f'{action:<16}{template:>12.0f}{stencil:>12.0f}'
+                    f'{bulk:>12.0f}'
+                )
+
+    @staticmethod
+    def get_context(action: str, i: int) -> dict:
+        context = {
+            'pre_header': 'Benchmark',
+            'header': 'Benchmark',
+            'name': f'Rider {i}',
+            'username': f'rider_{i}',
+            'password': f'secret_{i}',
+            'code': f'{i:04}',
+            'pk': i,
+            'date': '29 March 2024',
+            'start': '10:00',
+            'end': '11:00',
+            'bikes': 2,
+            'status': 'pending',
+        }
+        if action not in ('password-reset', 'recover-data', 'registration'):
+            headers = get_booking_headers(action)
+            context.update(pre_header=headers['pre_header'],
+                           header=headers['header'])
+        return context
+
+    @staticmethod
+    def rate(count: int, started: float) -> float:
+        return count / (time.perf_counter() - started)
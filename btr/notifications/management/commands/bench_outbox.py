@@ -0,0 +1,115 @@
+import tempfile
+import time
+
+from django.core.mail.backends import filebased, locmem
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test import override_settings
+
+from btr.notifications import outbox
+from btr.notifications.models import OutboxMessage
+
+
+def with_handshake(backend_class, latency: float):
+    """
+    Make a backend which connects like SMTP backend does: a handshake
+     delay on open and a new connection per send_messages call when it
+     was not opened explicitly.
+    """
+
+    class HandshakeBackend(backend_class):
+
+        connected = False
+
+        def open(self):
+            if self.connected:
+                return False
+            time.sleep(latency)
+            self.connected = True
+            super().open()
+            return True
+
+        def close(self):
+            self.connected = False
+            super().close()
+
+        def send_messages(self, email_messages):
+            new_connection = self.open()
+            try:
+                return super().send_messages(email_messages)
+            finally:
+                if new_connection:
+                    self.close()
+
+    return HandshakeBackend
+
+
+class Command(BaseCommand):
+    """
+    Compare email throughput of a connection per message (the old way)
+     with draining the outbox over one connection per batch.
+
+    Runs inside a transaction which is always rolled back. Local backends
+     have no connection cost, so a handshake delay is added to every
+     opened connection to model SSL handshake with the SMTP server.
+
+    Usage:
+        python manage.py bench_outbox --messages 1000 --backend file
+    """
+
+    help = 'Benchmark outbox delivery against locmem or file email backend'
+
+    backends = {
+        'locmem': locmem.EmailBackend,
+        'file': filebased.EmailBackend,
+    }
+
+    def add_arguments(self, parser):
+        parser.add_argument('--messages', type=int, default=500)
+        parser.add_argument('--batch-size', type=int,
+                            default=outbox.BATCH_SIZE)
+        parser.add_argument('--backend', choices=self.backends.keys(),
+                            default='locmem')
+        parser.add_argument('--handshake-ms', type=float, default=20)
+
+    def handle(self, *args, **options):
+        count = options['messages']
+        backend = with_handshake(self.backends[options['backend']],
+                                 options['handshake_ms'] / 1000)
+        with tempfile.TemporaryDirectory() as path, override_settings(
+                EMAIL_FILE_PATH=path):
+            with transaction.atomic():
+                messages = self.create_messages(count)
+                started = time.perf_counter()
+                for message in messages:
+                    email = outbox.build_email(message)
+                    email.connection = backend()
+                    email.send()
+                self.report('connection per message', count, started)
+
+                started = time.perf_counter()
+                sent = 0
+                while sent < count:
+                    result = outbox.drain(options['batch_size'], backend())
+                    if not result['sent']:
+                        break
+                    sent += result['sent']
+                self.report('outbox drain', sent, started)
+                transaction.set_rollback(True)
+
+    @staticmethod
+    def create_messages(count: int) -> list:
+        return OutboxMessage.objects.bulk_create([
+            OutboxMessage(
+                recipient=f'bench_{i}@bench.local',
+                subject='Benchmark',
+                body='<p>Benchmark</p>',
+            ) for i in range(count)
+        ])
+
+    def report(self, title: str, count: int, started: float) -> None:
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            f'{title:<24} {count} messages in {elapsed:.3f}s '
+            f'({count / elapsed:.0f} msg/s)'
+        )
@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+
+from btr.fake_vk import FakeVKServer
+
+
+class Command(BaseCommand):
+    """
+    Run a local fake VK api server which prints received messages.
+
+    Usage:
+        python manage.py run_fake_vk --port 8081
+        VK_API_URL=http://127.0.0.1:8081/method/ celery -A btr worker
+    """
+
+    help = 'Run a fake VK api server for offline development'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--host', default='127.0.0.1')
+        parser.add_argument('--port', type=int, default=8081)
+
+    def handle(self, *args, **options):
+        server = FakeVKServer(options['host'], options['port'],
+                              on_call=self.print_call)
+        self.stdout.write(f'Fake VK api on {server.url}')
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+
+    def print_call(self, method: str, params: dict) -> None:
+        self.stdout.write(f'{method}: {params.get("message", params)}')
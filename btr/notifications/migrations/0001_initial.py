@@ -0,0 +1,43 @@
+# Generated by Django 4.2.6 on 2026-10-18 11:52
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OutboxMessage',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('channel', models.CharField(choices=[('email', 'Email')], default='email', max_length=10, verbose_name='Channel')),
+                ('recipient', models.CharField(max_length=254, verbose_name='Recipient')),
+                ('subject', models.CharField(blank=True, max_length=255, verbose_name='Subject')),
+                ('body', models.TextField(blank=True, verbose_name='Body')),
+                ('dedupe_key', models.CharField(blank=True, max_length=200, null=True, verbose_name='Dedupe key')),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('sent', 'Sent'), ('failed', 'Failed')], default='pending', max_length=10, verbose_name='Status')),
+                ('attempts', models.PositiveSmallIntegerField(default=0, verbose_name='Attempts')),
+                ('send_after', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Send after')),
+                ('claimed_until', models.DateTimeField(blank=True, null=True)),
+                ('claim_token', models.UUIDField(blank=True, null=True)),
+                ('last_error', models.TextField(blank=True, verbose_name='Last error')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('sent_at', models.DateTimeField(blank=True, null=True, verbose_name='Sent at')),
+            ],
+            options={
+                'verbose_name': 'Outbox message',
+                'verbose_name_plural': 'Outbox',
+                'indexes': [models.Index(fields=['status', 'send_after'], name='outbox_status_send_after_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='outboxmessage',
+            constraint=models.UniqueConstraint(condition=models.Q(('status', 'pending')), fields=('dedupe_key',), name='outbox_pending_dedupe_key'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.6 on 2026-10-18 11:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='outboxmessage',
+            name='channel',
+            field=models.CharField(choices=[('email', 'Email'), ('vk', 'VK')], default='email', max_length=10, verbose_name='Channel'),
+        ),
+    ]
@@ -0,0 +1,111 @@
+from django.db import models
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+
+
+class OutboxMessage(models.Model):
+    """
+    Notification waiting to be delivered by the outbox drain task.
+
+    Messages with the same dedupe key are stored only once while pending.
+     The body is wiped after delivery, it may contain sign-in data.
+    """
+
+    PENDING = 'pending'
+    SENT = 'sent'
+    FAILED = 'failed'
+
+    STATUS_CHOICES = [
+        (PENDING, _('Pending')),
+        (SENT, _('Sent')),
+        (FAILED, _('Failed')),
+    ]
+
+    EMAIL = 'email'
+    VK = 'vk'
+
+    CHANNEL_CHOICES = [
+        (EMAIL, _('Email')),
+        (VK, _('VK')),
+    ]
+
+    channel = models.CharField(
+        max_length=10,
+        choices=CHANNEL_CHOICES,
+        default=EMAIL,
+        verbose_name=_('Channel'),
+    )
+    recipient = models.CharField(
+        max_length=254,
+        verbose_name=_('Recipient'),
+    )
+    subject = models.CharField(
+        max_length=255,
+        blank=True,
+        verbose_name=_('Subject'),
+    )
+    body = models.TextField(
+        blank=True,
+        verbose_name=_('Body'),
+    )
+    dedupe_key = models.CharField(
+        max_length=200,
+        blank=True,
+        null=True,
+        verbose_name=_('Dedupe key'),
+    )
+    status = models.CharField(
+        max_length=10,
+        choices=STATUS_CHOICES,
+        default=PENDING,
+        verbose_name=_('Status'),
+    )
+    attempts = models.PositiveSmallIntegerField(
+        default=0,
+        verbose_name=_('Attempts'),
+    )
+    send_after = models.DateTimeField(
+        default=timezone.now,
+        verbose_name=_('Send after'),
+    )
+    claimed_until = models.DateTimeField(
+        blank=True,
+        null=True,
+    )
+    claim_token = models.UUIDField(
+        blank=True,
+        null=True,
+    )
+    last_error = models.TextField(
+        blank=True,
+        verbose_name=_('Last error'),
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+    )
+    sent_at = models.DateTimeField(
+        blank=True,
+        null=True,
+        verbose_name=_('Sent at'),
+    )
+
+    def __str__(self):
+        return f'{self.channel}: {self.recipient} ({self.status})'
+
+    class Meta:
+        verbose_name = _('Outbox message')
+        verbose_name_plural = _('Outbox')
+        indexes = [
+            models.Index(
+                fields=['status', 'send_after'],
+                name='outbox_status_send_after_idx',
+            ),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['dedupe_key'],
+                condition=Q(status='pending'),
+                name='outbox_pending_dedupe_key',
+            ),
+        ]
@@ -0,0 +1,329 @@
+import hashlib
+import smtplib
+import uuid
+from datetime import timedelta
+from itertools import groupby
+from typing import List
+
+from requests import RequestException
+from vk_api.exceptions import VkApiError
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.mail import EmailMessage, get_connection
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from btr.vk import VK_MESSAGE_LIMIT, get_vk_client
+from .models import OutboxMessage
+
+
+SENDER = 'broteamracing@yandex.ru'
+BATCH_SIZE = 50
+MAX_ATTEMPTS = 8
+# seconds
+BACKOFF_BASE = 30
+BACKOFF_MAX = 60 * 60
+CLAIM_TIMEOUT = 5 * 60
+DEDUPE_WINDOW = 10 * 60
+DRAIN_DELAY = 1
+DIGEST_SEPARATOR = '\n\n〰〰〰〰〰〰〰〰〰〰\n\n'
+
+
+def get_backoff(attempts: int) -> timedelta:
+    """
+    Get delay before the next delivery attempt.
+
+    Args:
+        attempts (int): Count of failed attempts.
+
+    Returns:
+        timedelta: Exponential delay limited by BACKOFF_MAX.
+    """
+    seconds = BACKOFF_BASE * 2 ** max(attempts - 1, 0)
+    return timedelta(seconds=min(seconds, BACKOFF_MAX))
+
+
+def get_recent_filter() -> Q:
+    """Notifications which are pending or were sent recently"""
+    recently = timezone.now() - timedelta(seconds=DEDUPE_WINDOW)
+    return (Q(status=OutboxMessage.PENDING) |
+            Q(status=OutboxMessage.SENT, sent_at__gte=recently))
+
+
+def is_duplicate(dedupe_key: str) -> bool:
+    """
+    Check if the same notification is pending or was sent recently.
+    """
+    return OutboxMessage.objects.filter(
+        get_recent_filter(),
+        dedupe_key=dedupe_key,
+    ).exists()
+
+
+def get_last_dedupe_key(prefix: str) -> str | None:
+    """
+    Get the dedupe key of the latest pending or recently sent notification
+     whose key starts with the prefix (e.g. notifications of a booking).
+
+    Args:
+        prefix (str): Start of the dedupe key.
+
+    Returns:
+        str | None: The key, None if there is no such notification.
+    """
+    return OutboxMessage.objects.filter(
+        get_recent_filter(),
+        dedupe_key__startswith=prefix,
+    ).order_by('-created_at', '-pk').values_list(
+        'dedupe_key', flat=True
+    ).first()
+
+
+def schedule_drain(channel: str = OutboxMessage.EMAIL) -> None:
+    """
+    Run the drain task of the channel soon, bursts of notifications share
+     one run. VK notifications wait for the digest window to be sent as
+     one message.
+    """
+    from btr.tasks.notifications import send_outbox, send_vk_outbox
+    if channel == OutboxMessage.VK:
+        task, delay = send_vk_outbox, settings.VK_DIGEST_WINDOW
+    else:
+        task, delay = send_outbox, DRAIN_DELAY
+    if cache.add(f'outbox:drain:{channel}', True, max(delay, 1)):
+        task.apply_async(countdown=delay)
+
+
+def enqueue(recipient: str, subject: str, body: str,
+            dedupe_key: str = None,
+            channel: str = OutboxMessage.EMAIL) -> OutboxMessage | None:
+    """
+    Store a notification in the outbox, the drain task is scheduled after
+     the current transaction commits.
+
+    Args:
+        recipient (str): Email address of the recipient.
+        subject (str): Message subject.
+        body (str): Rendered message body.
+        dedupe_key (str, optional): Key of the notification
+         (e.g. 'confirm:123'), repeated notifications are dropped.
+        channel (str, optional): Delivery channel. Defaults to email.
+
+    Returns:
+        OutboxMessage | None: Stored message, None for duplicates.
+    """
+    if dedupe_key and is_duplicate(dedupe_key):
+        return None
+    try:
+        with transaction.atomic():
+            message = OutboxMessage.objects.create(
+                channel=channel,
+                recipient=recipient,
+                subject=subject,
+                body=body,
+                dedupe_key=dedupe_key or None,
+            )
+    except IntegrityError:
+        # the same notification was queued concurrently
+        return None
+    transaction.on_commit(lambda: schedule_drain(channel))
+    return message
+
+
+def claim(batch_size: int, channel: str) -> List[OutboxMessage]:
+    """
+    Claim due messages for delivery. Claimed rows are skipped by other
+     workers until the claim expires.
+
+    Args:
+        batch_size (int): Max count of messages.
+        channel (str): Delivery channel.
+
+    Returns:
+        list: Claimed messages.
+    """
+    now = timezone.now()
+    token = uuid.uuid4()
+    with transaction.atomic():
+        pks = list(OutboxMessage.objects.select_for_update(
+            skip_locked=True
+        ).filter(
+            Q(claimed_until__isnull=True) | Q(claimed_until__lt=now),
+            channel=channel,
+            status=OutboxMessage.PENDING,
+            send_after__lte=now,
+        ).order_by('send_after').values_list('pk', flat=True)[:batch_size])
+        if not pks:
+            return []
+        OutboxMessage.objects.filter(pk__in=pks).update(
+            claim_token=token,
+            claimed_until=now + timedelta(seconds=CLAIM_TIMEOUT),
+        )
+    return list(OutboxMessage.objects.filter(claim_token=token))
+
+
+def mark_sent(messages: List[OutboxMessage]) -> None:
+    OutboxMessage.objects.filter(
+        pk__in=[message.pk for message in messages]
+    ).update(
+        status=OutboxMessage.SENT,
+        sent_at=timezone.now(),
+        body='',
+        claim_token=None,
+        claimed_until=None,
+    )
+
+
+def mark_failed(errors: dict) -> None:
+    """
+    Schedule next attempts of failed messages with exponential backoff.
+
+    Args:
+        errors (dict): Exceptions keyed by failed messages.
+    """
+    now = timezone.now()
+    for message, error in errors.items():
+        message.attempts += 1
+        message.last_error = repr(error)
+        message.send_after = now + get_backoff(message.attempts)
+        message.claim_token = None
+        message.claimed_until = None
+        if message.attempts >= MAX_ATTEMPTS:
+            message.status = OutboxMessage.FAILED
+    OutboxMessage.objects.bulk_update(errors.keys(), [
+        'attempts', 'last_error', 'send_after', 'claim_token',
+        'claimed_until', 'status',
+    ])
+
+
+def build_email(message: OutboxMessage) -> EmailMessage:
+    email = EmailMessage(
+        message.subject,
+        message.body,
+        SENDER,
+        [message.recipient],
+    )
+    email.content_subtype = 'html'
+    return email
+
+
+def drain(batch_size: int = BATCH_SIZE, connection=None) -> dict:
+    """
+    Deliver one batch of pending emails over a single connection.
+
+    Args:
+        batch_size (int): Max count of messages in the batch.
+        connection (optional): Email backend instance. Defaults to
+         a new connection of EMAIL_BACKEND setting.
+
+    Returns:
+        dict: Count of 'sent' and 'failed' messages.
+    """
+    messages = claim(batch_size, OutboxMessage.EMAIL)
+    if not messages:
+        return {'sent': 0, 'failed': 0}
+    sent, errors = [], {}
+    connection = connection or get_connection()
+    try:
+        connection.open()
+    except (smtplib.SMTPException, OSError) as error:
+        errors = {message: error for message in messages}
+    else:
+        try:
+            for message in messages:
+                try:
+                    connection.send_messages([build_email(message)])
+                    sent.append(message)
+                except (smtplib.SMTPException, OSError) as error:
+                    errors[message] = error
+        finally:
+            connection.close()
+    if sent:
+        mark_sent(sent)
+    if errors:
+        mark_failed(errors)
+    return {'sent': len(sent), 'failed': len(errors)}
+
+
+def build_digests(messages: List[OutboxMessage]) -> List[tuple]:
+    """
+    Merge messages of every recipient into digests which fit into one
+     VK message, a digest longer than the limit is split.
+
+    Args:
+        messages (list): Claimed VK messages.
+
+    Returns:
+        list: Tuples of recipient, digest text and merged messages.
+    """
+    digests = []
+    messages = sorted(messages, key=lambda m: (m.recipient, m.created_at))
+    for recipient, group in groupby(messages, key=lambda m: m.recipient):
+        parts, merged, length = [], [], 0
+        for message in group:
+            body = message.body[:VK_MESSAGE_LIMIT]
+            if parts and (length + len(DIGEST_SEPARATOR) + len(body)
+                          > VK_MESSAGE_LIMIT):
+                digests.append((recipient, DIGEST_SEPARATOR.join(parts),
+                                merged))
+                parts, merged, length = [], [], 0
+            length += len(body) + (len(DIGEST_SEPARATOR) if parts else 0)
+            parts.append(body)
+            merged.append(message)
+        digests.append((recipient, DIGEST_SEPARATOR.join(parts), merged))
+    return digests
+
+
+def get_digest_id(merged: List[OutboxMessage]) -> int:
+    """
+    Get the VK random_id of a digest. It is stable for the same set of
+     messages, so a retry of an unchanged digest is dropped by VK, while a
+     digest merging other messages gets another id.
+
+    Args:
+        merged (list): Messages of the digest.
+
+    Returns:
+        int: Positive int32 id (0 would turn VK deduplication off).
+    """
+    pks = ','.join(str(pk) for pk in sorted(message.pk for message in merged))
+    digest = hashlib.sha1(pks.encode()).digest()
+    return int.from_bytes(digest[:4], 'big') & 0x7FFFFFFF or 1
+
+
+def drain_vk(batch_size: int = BATCH_SIZE, client=None) -> dict:
+    """
+    Deliver pending VK notifications, messages of one recipient are
+     merged into a digest.
+
+    Args:
+        batch_size (int): Max count of messages in the batch.
+        client (optional): VK client. Defaults to the client of
+         VK_BTR_KEY setting.
+
+    Returns:
+        dict: Count of 'sent' and 'failed' messages.
+    """
+    messages = claim(batch_size, OutboxMessage.VK)
+    if not messages:
+        return {'sent': 0, 'failed': 0}
+    sent, errors = [], {}
+    vk = (client or get_vk_client(settings.VK_BTR_KEY)).get_api()
+    for recipient, text, merged in build_digests(messages):
+        try:
+            vk.messages.send(
+                user_id=recipient,
+                message=text,
+                # VK drops repeated random_id, retries aren't duplicated
+                random_id=get_digest_id(merged),
+            )
+            sent.extend(merged)
+        except (VkApiError, RequestException) as error:
+            errors.update({message: error for message in merged})
+    if sent:
+        mark_sent(sent)
+    if errors:
+        mark_failed(errors)
+    return {'sent': len(sent), 'failed': len(errors)}
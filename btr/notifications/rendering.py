@@ -0,0 +1,89 @@
+import re
+from functools import lru_cache
+from typing import Iterable, List, Tuple
+
+from django.template.loader import render_to_string
+from django.utils.html import conditional_escape
+from django.utils.translation import get_language, override
+
+
+TEMPLATE_NAME = 'emails/email_base.html'
+
+# every variable of the template, the action switch is the only logic
+FIELDS = (
+    'pre_header', 'header', 'name', 'username', 'password', 'code', 'pk',
+    'date', 'start', 'end', 'bikes', 'status',
+)
+
+MARKER = '[[btr:{}]]'
+MARKER_RE = re.compile(r'\[\[btr:(\w+)\]\]')
+
+
+@lru_cache(maxsize=None)
+def get_stencil(language: str, action: str) -> Tuple[str, ...]:
+    """
+    Render the email template once for the language and action with
+     markers in place of variables and split it by the markers.
+
+    The template only branches on the action, so the result (including
+     all translated text) is the same for every recipient and only
+     variables have to be substituted. Built once per process.
+
+    Args:
+        language (str): Language code (e.g. 'ru-ru').
+        action (str): Email action (e.g. 'confirm').
+
+    Returns:
+        tuple: Static text and field names, field names at odd indexes.
+    """
+    context = {field: MARKER.format(field) for field in FIELDS}
+    context['action'] = action
+    with override(language):
+        html = render_to_string(TEMPLATE_NAME, context)
+    return tuple(MARKER_RE.split(html))
+
+
+def fill(stencil: Tuple[str, ...], context: dict) -> str:
+    """
+    Substitute escaped context values into the stencil.
+
+    Missing variables are rendered empty, as the template engine does.
+    """
+    parts = list(stencil)
+    for i in range(1, len(parts), 2):
+        field = parts[i]
+        parts[i] = (str(conditional_escape(context[field]))
+                    if field in context else '')
+    return ''.join(parts)
+
+
+def render(action: str, context: dict, language: str = None) -> str:
+    """
+    Render an email body from the cached stencil.
+
+    Args:
+        action (str): Email action (e.g. 'confirm').
+        context (dict): Template variables.
+        language (str, optional): Language code. Defaults to active one.
+
+    Returns:
+        str: Rendered html.
+    """
+    return fill(get_stencil(language or get_language(), action), context)
+
+
+def render_many(action: str, contexts: Iterable[dict],
+                language: str = None) -> List[str]:
+    """
+    Render email bodies for many recipients in one pass.
+
+    Args:
+        action (str): Email action (e.g. 'confirm').
+        contexts (Iterable): Template variables of every recipient.
+        language (str, optional): Language code. Defaults to active one.
+
+    Returns:
+        list: Rendered html in the order of contexts.
+    """
+    stencil = get_stencil(language or get_language(), action)
+    return [fill(stencil, context) for context in contexts]
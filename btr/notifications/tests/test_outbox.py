@@ -0,0 +1,120 @@
+import smtplib
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.core import mail
+from django.core.cache import cache
+from django.core.mail import get_connection
+from django.core.mail.backends.locmem import EmailBackend
+from django.test import TestCase
+from django.utils import timezone
+
+from btr.emails import cancel_booking_mail, confirm_booking_mail
+from btr.notifications import outbox
+from btr.notifications.models import OutboxMessage
+from btr.tasks.notifications import send_outbox
+
+
+class FailingBackend(EmailBackend):
+
+    def send_messages(self, messages):
+        if messages[0].to == ['broken@example.com']:
+            raise smtplib.SMTPRecipientsRefused({})
+        return super().send_messages(messages)
+
+
+class TestOutbox(TestCase):
+
+    def setUp(self):
+        cache.clear()
+
+    def enqueue(self, count: int, **kwargs) -> list:
+        return [outbox.enqueue(f'user{i}@example.com', 'Subject', '<p></p>',
+                               **kwargs) for i in range(count)]
+
+    def test_drain(self):
+        self.enqueue(3)
+        with patch('btr.notifications.outbox.get_connection',
+                   wraps=get_connection) as connection:
+            self.assertEqual(outbox.drain(), {'sent': 3, 'failed': 0})
+        # one connection for the whole batch
+        connection.assert_called_once()
+        self.assertEqual(len(mail.outbox), 3)
+        self.assertEqual(mail.outbox[0].content_subtype, 'html')
+        sent = OutboxMessage.objects.filter(status=OutboxMessage.SENT)
+        self.assertEqual(sent.count(), 3)
+        self.assertFalse(sent.exclude(body='').exists())
+        self.assertEqual(outbox.drain(), {'sent': 0, 'failed': 0})
+
+    def test_drain_after_commit(self):
+        with patch('btr.tasks.notifications.send_outbox.apply_async') as task:
+            with self.captureOnCommitCallbacks(execute=True):
+                self.enqueue(3)
+        # burst of messages is drained by one task
+        task.assert_called_once()
+
+    def test_task_drains_batches(self):
+        self.enqueue(5)
+        self.assertEqual(send_outbox(batch_size=2), {'sent': 5, 'failed': 0})
+        self.assertEqual(len(mail.outbox), 5)
+
+    def test_dedupe(self):
+        for _i in range(2):
+            confirm_booking_mail('user@example.com', '1', '2', '2024-03-29',
+                                 '10:00', '11:00')
+        self.assertEqual(OutboxMessage.objects.count(), 1)
+        outbox.drain()
+        # recently sent notification isn't repeated
+        confirm_booking_mail('user@example.com', '1', '2', '2024-03-29',
+                             '10:00', '11:00')
+        self.assertEqual(OutboxMessage.objects.count(), 1)
+
+    def test_dedupe_status_changes(self):
+        booking = ('user@example.com', '1', '2', '2024-03-29', '10:00',
+                   '11:00')
+        confirm_booking_mail(*booking)
+        cancel_booking_mail(*booking)
+        cancel_booking_mail(*booking, self_cancel=True)
+        outbox.drain()
+        # confirmed again within the dedupe window
+        confirm_booking_mail(*booking)
+        self.assertEqual(list(OutboxMessage.objects.order_by(
+            'pk').values_list('dedupe_key', flat=True)), [
+            'booking:1:0:confirm', 'booking:1:1:cancel',
+            'booking:1:2:confirm',
+        ])
+
+    def test_claimed_messages_skipped(self):
+        self.enqueue(2)
+        self.assertEqual(len(outbox.claim(1, OutboxMessage.EMAIL)), 1)
+        claimed = outbox.claim(10, OutboxMessage.EMAIL)
+        self.assertEqual(len(claimed), 1)
+        self.assertEqual(outbox.claim(10, OutboxMessage.EMAIL), [])
+
+    def test_retry_with_backoff(self):
+        self.enqueue(2)
+        broken = outbox.enqueue('broken@example.com', 'Subject', '')
+        result = outbox.drain(connection=FailingBackend())
+        self.assertEqual(result, {'sent': 2, 'failed': 1})
+        broken.refresh_from_db()
+        self.assertEqual(broken.status, OutboxMessage.PENDING)
+        self.assertEqual(broken.attempts, 1)
+        self.assertGreater(broken.send_after, timezone.now())
+        self.assertIn('SMTPRecipientsRefused', broken.last_error)
+        # not due yet
+        self.assertEqual(outbox.drain(connection=FailingBackend()),
+                         {'sent': 0, 'failed': 0})
+
+    def test_give_up(self):
+        broken = outbox.enqueue('broken@example.com', 'Subject', '')
+        for _i in range(outbox.MAX_ATTEMPTS):
+            OutboxMessage.objects.update(send_after=timezone.now())
+            outbox.drain(connection=FailingBackend())
+        broken.refresh_from_db()
+        self.assertEqual(broken.status, OutboxMessage.FAILED)
+        self.assertEqual(broken.attempts, outbox.MAX_ATTEMPTS)
+
+    def test_backoff(self):
+        self.assertEqual(outbox.get_backoff(1), timedelta(seconds=30))
+        self.assertEqual(outbox.get_backoff(3), timedelta(seconds=120))
+        self.assertEqual(outbox.get_backoff(20), timedelta(hours=1))
@@ -0,0 +1,65 @@
+from django.template.loader import render_to_string
+from django.test import SimpleTestCase
+from django.utils.translation import activate, override
+
+from btr.notifications.rendering import (TEMPLATE_NAME, get_stencil, render,
+                                         render_many)
+
+
+ACTIONS = (
+    'password-reset', 'recover-data', 'registration', 'create', 'confirm',
+    'cancel', 'self-cancel', 'edit', 'self-edit',
+)
+
+
+class TestRendering(SimpleTestCase):
+
+    context = {
+        'pre_header': 'Pre header',
+        'header': 'Header',
+        'name': 'John <b>Doe</b>',
+        'username': 'john & co',
+        'password': '"secret"',
+        'code': '1234',
+        'pk': 12,
+        'date': '29 March 2024',
+        'start': '10:00',
+        'end': '11:00',
+        'bikes': 2,
+        'status': 'pending',
+    }
+
+    def setUp(self):
+        activate('en')
+
+    def test_same_as_template(self):
+        for language in ('en', 'ru-ru'):
+            for action in ACTIONS:
+                with self.subTest(language=language, action=action):
+                    with override(language):
+                        expected = render_to_string(
+                            TEMPLATE_NAME, {**self.context, 'action': action}
+                        )
+                    self.assertEqual(
+                        render(action, self.context, language), expected
+                    )
+
+    def test_missing_variables(self):
+        expected = render_to_string(TEMPLATE_NAME, {
+            'action': 'confirm', 'pk': 1,
+        })
+        self.assertEqual(render('confirm', {'pk': 1}), expected)
+
+    def test_escaping(self):
+        html = render('registration', self.context)
+        self.assertIn('John &lt;b&gt;Doe&lt;/b&gt;', html)
+        self.assertIn('john &amp; co', html)
+        self.assertNotIn('[[btr:', html)
+
+    def test_render_many(self):
+        contexts = [{**self.context, 'pk': pk} for pk in range(3)]
+        get_stencil.cache_clear()
+        html = render_many('cancel', contexts)
+        self.assertEqual(html, [render('cancel', c) for c in contexts])
+        # compiled once for the language and action
+        self.assertEqual(get_stencil.cache_info().currsize, 1)
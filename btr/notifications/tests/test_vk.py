@@ -0,0 +1,117 @@
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from btr.fake_vk import FakeVKServer
+from btr.notifications import outbox
+from btr.notifications.models import OutboxMessage
+from btr.tasks.admin import send_vk_notify
+from btr.tasks.notifications import send_vk_outbox
+from btr.vk import VK_MESSAGE_LIMIT, RateLimiter, VKClient, get_vk_client
+
+
+@override_settings(VK_ADMIN_ID='100', VK_BTR_KEY='token')
+class TestVKNotifications(TestCase):
+
+    data = {
+        'pk': 1,
+        'client': 'john_doe',
+        'phone': '+79999999999',
+        'date': '29 March 2024',
+        'start': '10:00',
+        'end': '11:00',
+        'bikes': 2,
+        'status': 'confirmed',
+    }
+
+    def setUp(self):
+        cache.clear()
+        get_vk_client.cache_clear()
+        self.server = FakeVKServer()
+        self.server.__enter__()
+        self.addCleanup(self.server.__exit__)
+
+    def notify(self, count: int) -> None:
+        for pk in range(1, count + 1):
+            send_vk_notify('Admin panel', False, {**self.data, 'pk': pk},
+                           is_admin=True)
+
+    def test_digest(self):
+        with patch('btr.tasks.notifications.send_vk_outbox.apply_async') \
+                as task:
+            with self.captureOnCommitCallbacks(execute=True):
+                self.notify(3)
+        # one drain after the digest window
+        task.assert_called_once_with(countdown=5)
+        with override_settings(VK_API_URL=self.server.url):
+            self.assertEqual(send_vk_outbox(), {'sent': 3, 'failed': 0})
+        calls = self.server.get_calls('messages.send')
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(calls[0]['user_id'], '100')
+        self.assertEqual(calls[0]['access_token'], 'token')
+        for pk in ('#1', '#2', '#3'):
+            self.assertIn(pk, calls[0]['message'])
+
+    def test_persistent_client(self):
+        self.assertIs(get_vk_client('token'), get_vk_client('token'))
+
+    def test_failed_digest_retried(self):
+        self.notify(2)
+        # access denied
+        self.server.errors.append(901)
+        client = VKClient('token', self.server.url)
+        self.assertEqual(outbox.drain_vk(client=client),
+                         {'sent': 0, 'failed': 2})
+        self.assertEqual(OutboxMessage.objects.filter(
+            status=OutboxMessage.PENDING, attempts=1).count(), 2)
+
+    def test_too_many_requests_repeated(self):
+        self.notify(1)
+        self.server.errors.append(6)
+        client = VKClient('token', self.server.url)
+        with self.assertLogs('vk_api'):
+            self.assertEqual(outbox.drain_vk(client=client),
+                             {'sent': 1, 'failed': 0})
+        self.assertEqual(len(self.server.get_calls('messages.send')), 2)
+
+    def test_long_digest_split(self):
+        for i in range(3):
+            outbox.enqueue('100', '', 'x' * (VK_MESSAGE_LIMIT // 2),
+                           channel=OutboxMessage.VK)
+        client = VKClient('token', self.server.url)
+        outbox.drain_vk(client=client)
+        calls = self.server.get_calls('messages.send')
+        self.assertEqual(len(calls), 3)
+        self.assertEqual(len({call['random_id'] for call in calls}), 3)
+
+    def test_digest_id(self):
+        self.notify(3)
+        first, second, third = OutboxMessage.objects.order_by('pk')
+        self.assertEqual(outbox.get_digest_id([first, second]),
+                         outbox.get_digest_id([second, first]))
+        # a retry merging other messages isn't dropped as a repeat
+        self.assertNotEqual(outbox.get_digest_id([first, second]),
+                            outbox.get_digest_id([first, second, third]))
+        self.assertNotEqual(outbox.get_digest_id([first]),
+                            outbox.get_digest_id([first, second]))
+        self.assertLess(outbox.get_digest_id([first]), 2 ** 31)
+
+
+class TestRateLimiter(TestCase):
+
+    def setUp(self):
+        cache.clear()
+
+    @patch('btr.vk.time.time', return_value=1000.5)
+    @patch('btr.vk.time.sleep')
+    def test_wait(self, sleep, now):
+        limiter = RateLimiter('test', rps=2)
+        limiter.wait()
+        limiter.wait()
+        sleep.assert_not_called()
+        # third request waits for the next second
+        sleep.side_effect = lambda seconds: now.configure_mock(
+            return_value=1001.0)
+        limiter.wait()
+        sleep.assert_called_once_with(0.5)
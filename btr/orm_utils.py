@@ -1,20 +1,23 @@
-from datetime import datetime, timedelta
+import calendar
+from collections import defaultdict
+from datetime import date, datetime, timedelta
 from typing import Tuple, Type, TypeVar, List
 
+from django.conf import settings
 from django.utils.translation import gettext_lazy as _
-from django.core.exceptions import (ObjectDoesNotExist,
-                                    MultipleObjectsReturned,
-                                    ValidationError)
-from django.db.models import Q
+from django.core.exceptions import ObjectDoesNotExist, ValidationError
+from django.db import transaction
 from django.db.models import Model
 from asgiref.sync import sync_to_async
 
-from btr.bookings.models import Booking
+from btr.bookings.availability import AvailabilityCache
+from btr.bookings.occupancy import (DayCapacity, RidePolicy, format_capacity,
+                                    format_intervals)
+from btr.bookings.models import Booking, BookingDay
 from btr.tg_bot.utils import exceptions as e
 from btr.users.models import SiteUser
-from btr.workhours.models import WorkHours, DayControl
-
-from config import settings
+from btr.users.passwords import acheck_password, amake_password
+from btr.workhours.models import WorkHours, DayControl, SchedulingPolicy
 
 from .templatetags.contrib_extras import ru_month_genitive
 
@@ -25,9 +28,11 @@ class AsyncTools:
     """
     A utility class with methods for connect async and sync context, mostly
      between Aiogram(async) and Django ORM(sync) for CRUD operation.
+
+    Single queries use native async ORM methods, operations of several
+     queries run in one sync block inside a transaction.
     """
-    @sync_to_async
-    def get_queryset(self, user: SiteUser(), **kwargs) -> list:
+    async def get_queryset(self, user: SiteUser(), **kwargs) -> list:
         """
         Get a QuerySet of Booking objects based on the provided kw arguments.
 
@@ -45,10 +50,10 @@ class AsyncTools:
             queryset = queryset.filter(**lookup)
 
         queryset = queryset.exclude(status__in=[_('completed'), _('canceled')])
-        return list(queryset)
+        return [booking async for booking in queryset]
 
-    @sync_to_async
-    def get_object(self, model: Type[T], load_prefetch=None, **kwargs) -> T:
+    async def get_object(self, model: Type[T], load_prefetch=None,
+                         **kwargs) -> T:
         """
         Get a Model object based on the provided keyword arguments.
 
@@ -60,29 +65,54 @@ class AsyncTools:
         Returns:
             T: The retrieved Model object.
         """
+        queryset = model.objects.all()
         if load_prefetch:
-            obj = model.objects.prefetch_related(load_prefetch).get(**kwargs)
-        else:
-            obj = model.objects.get(**kwargs)
-        return obj
+            queryset = queryset.prefetch_related(load_prefetch)
+        return await queryset.aget(**kwargs)
 
     @sync_to_async
     def modify_booking(self, pk: str, **kwargs) -> None:
         """
         Modify booking attributes based on provided keyword arguments.
 
+        Changes of the time, bikes or to an active status (e.g. a canceled
+         booking confirmed again) are admitted under the date lock. Dates
+          are locked before the booking row, in the order of the web
+           admission, so the two paths can't deadlock.
+
         Args:
             pk (str): The primary key of the booking to be modified.
             **kwargs: Additional keyword arguments representing fields
              and their new values.
-        """
-        booking = Booking.objects.get(pk=pk)
-        for field, value in kwargs.items():
-            setattr(booking, field, value)
-        booking.save()
 
-    @sync_to_async
-    def check_available_field(self, user_input: str) -> bool:
+        Raises:
+            TimeIsNotAvailable: If the new time or status doesn't fit.
+        """
+        schedule = {'booking_date', 'start_time', 'end_time', 'bike_count'}
+        admit = bool(schedule & kwargs.keys()) or (
+            'status' in kwargs and kwargs['status'] != _('canceled')
+        )
+        with transaction.atomic():
+            old_date = Booking.objects.values_list(
+                'booking_date', flat=True
+            ).get(pk=pk)
+            dates = {str(old_date)}
+            if 'booking_date' in kwargs:
+                dates.add(str(kwargs['booking_date']))
+            for day in sorted(dates):
+                BookingDay.lock(day)
+            booking = Booking.objects.select_for_update().get(pk=pk)
+            for field, value in kwargs.items():
+                setattr(booking, field, value)
+            if not admit:
+                booking.save()
+                return
+            try:
+                SlotsFinder(str(booking.booking_date)).admit(booking)
+            except ValidationError:
+                raise e.TimeIsNotAvailable
+
+    async def check_available_field(self, user_input: str) -> bool:
         """
         Check if the provided user input (username, email, or phone number)
          is available.
@@ -93,22 +123,19 @@ class AsyncTools:
         Returns:
             bool: True if the user input is available, False otherwise.
         """
-        login = user_input.lower()
-        try:
-            SiteUser.objects.get(
-                Q(username=login) |
-                Q(email=login) |
-                Q(phone_number=login)
-            )
+        if await SiteUser.objects.filter_by_login(
+            user_input.lower()
+        ).aexists():
             raise e.UserAlreadyExists
-        except (ObjectDoesNotExist, MultipleObjectsReturned):
-            return True
+        return True
 
-    @sync_to_async
-    def create_user(self, **kwargs) -> str:
+    async def create_user(self, **kwargs) -> str:
         """
         Create a new user with the provided keyword arguments.
 
+        The password is hashed in the hashers pool and the user is
+         created with one insert.
+
         Args:
             **kwargs: Keyword arguments for creating the user
              (e.g., username, email, etc.).
@@ -117,13 +144,11 @@ class AsyncTools:
             str: The randomly generated password for the new user.
         """
         password = SiteUser.objects.make_random_password(length=8)
-        user = SiteUser.objects.create(**kwargs)
-        user.set_password(password)
-        user.save()
+        kwargs['password'] = await amake_password(password)
+        await SiteUser.objects.acreate(**kwargs)
         return password
 
-    @sync_to_async
-    def reset_password(self, **kwargs) -> str:
+    async def reset_password(self, **kwargs) -> str:
         """
         Reset the user's password and return the new randomly
          generated password.
@@ -134,15 +159,19 @@ class AsyncTools:
 
         Returns:
             str: The newly generated password.
+
+        Raises:
+            UserDoesNotExists: If the user does not exist.
         """
-        user = SiteUser.objects.get(**kwargs)
         password = SiteUser.objects.make_random_password(length=8)
-        user.set_password(password)
-        user.save()
+        encoded = await amake_password(password)
+        if not await SiteUser.objects.filter(**kwargs).aupdate(
+            password=encoded
+        ):
+            raise e.UserDoesNotExists
         return password
 
-    @sync_to_async
-    def create_booking(self, **kwargs) -> str:
+    async def create_booking(self, **kwargs) -> str:
         """
         Create a new booking with the provided attributes.
 
@@ -152,11 +181,17 @@ class AsyncTools:
 
         Returns:
             str: The ID of the newly created booking.
+
+        Raises:
+            TimeIsNotAvailable: If the time was taken meanwhile.
         """
-        user = SiteUser.objects.get(pk=kwargs.get('rider'))
-        kwargs['rider'] = user
-        booking = Booking.objects.create(**kwargs)
-        booking.save()
+        kwargs['rider_id'] = kwargs.pop('rider')
+        booking = Booking(**kwargs)
+        finder = SlotsFinder(str(booking.booking_date))
+        try:
+            await sync_to_async(finder.admit)(booking)
+        except ValidationError:
+            raise e.TimeIsNotAvailable
         return str(booking.id)
 
     async def edit_booking(self, **kwargs) -> None:
@@ -172,7 +207,7 @@ class AsyncTools:
         """
         pk = kwargs.get('pk')
         edited_data = {
-            'booking_data': kwargs.get('date'),
+            'booking_date': kwargs.get('date'),
             'start_time': kwargs.get('start'),
             'end_time': kwargs.get('end'),
             'bike_count': kwargs.get('bikes'),
@@ -223,12 +258,12 @@ class AsyncTools:
             UserDoesNotExists: If the user does not exist.
         """
         try:
-            user = await self.get_object(SiteUser, **kwargs)
-            if user.check_password(password):
-                return None
-            raise e.WrongPassword
+            user = await SiteUser.objects.only('password').aget(**kwargs)
         except ObjectDoesNotExist:
             raise e.UserDoesNotExists
+        # password hashing is CPU bound, keep it off the event loop
+        if not await acheck_password(password, user.password):
+            raise e.WrongPassword
 
     async def get_user_bookings(self, **kwargs) -> dict:
         """
@@ -365,26 +400,6 @@ class AsyncTools:
             return f'{obj.day} {ru_month_genitive(obj)}, {obj.year}'
         return f'{obj.day} {obj.month}, {obj.year}'
 
-    async def get_excluded_slot(self, email: str, date: str) -> tuple:
-        """
-        Checks and retrieves all available times
-         (if the user already has a reservation for that date).
-
-        Args:
-            email (str): The email address of the user.
-            date (str): The date for which to retrieve the booking.
-
-        Returns:
-            tuple: A tuple containing the start time and end time of the
-             existed booking (None if there are no bookings for this date).
-        """
-        user = await self.get_object(SiteUser, email=email)
-        queryset = await self.get_queryset(user, rider=user.id,
-                                           booking_date=date)
-        booking = queryset[-1]
-        if booking:
-            return booking.start_time, booking.end_time
-
     async def get_available_status(self, **kwargs) -> List:
         """
         Determine the available status transition for a booking based
@@ -422,9 +437,7 @@ class AsyncTools:
         Returns:
             None
         """
-        booking = await self.get_object(Booking, pk=pk)
-        booking.status = status
-        await sync_to_async(booking.save)()
+        await self.modify_booking(pk, status=status)
 
 
 class SlotsFinder:
@@ -436,42 +449,52 @@ class SlotsFinder:
 
     Args:
         date (str): The date for which slots need to be found.
+        policy (RidePolicy, optional): Already loaded scheduling policy.
     """
 
     FRIDAY = 5
 
-    def __init__(self, date: str):
+    def __init__(self, date: str, policy: RidePolicy = None):
         self.date = date
+        self._policy = policy
 
-    @staticmethod
-    def get_workhours() -> dict:
+    @property
+    def policy(self) -> RidePolicy:
         """
-        Get work time ranges from database.
+        Scheduling policy (buffer, granularity and ride limits), loaded
+         once per finder.
 
         Returns:
-            dict: dictionary with default open time slots.
+            RidePolicy: Compiled policy.
         """
-        ordinary_slots = WorkHours.objects.get(day='Workday')
-        weekend_slots = WorkHours.objects.get(day='Weekend')
-        return {
-            'ordinary_slots': (ordinary_slots.open, ordinary_slots.close),
-            'weekend_slots': (weekend_slots.open, weekend_slots.close),
-        }
+        if self._policy is None:
+            self._policy = SchedulingPolicy.get_policy()
+        return self._policy
+
+    async def get_policy_as(self) -> RidePolicy:
+        """
+        Get the scheduling policy (for bot).
+
+        Returns:
+            RidePolicy: Compiled policy.
+        """
+        return await sync_to_async(lambda: self.policy)()
 
     @staticmethod
-    @sync_to_async
-    def get_workhours_as() -> dict:
+    def get_workhours() -> dict:
         """
-        Get work time ranges from database asynchronous(for bot usage).
+        Get work time ranges from database in a single query.
 
         Returns:
             dict: dictionary with default open time slots.
         """
-        ordinary_slots = WorkHours.objects.get(day='Workday')
-        weekend_slots = WorkHours.objects.get(day='Weekend')
+        workhours = {
+            record.day: (record.open, record.close) for record in
+            WorkHours.objects.filter(day__in=('Workday', 'Weekend'))
+        }
         return {
-            'ordinary_slots': (ordinary_slots.open, ordinary_slots.close),
-            'weekend_slots': (weekend_slots.open, weekend_slots.close),
+            'ordinary_slots': workhours['Workday'],
+            'weekend_slots': workhours['Weekend'],
         }
 
     def get_custom_open_hours(self) -> tuple | None:
@@ -487,20 +510,6 @@ class SlotsFinder:
         except ObjectDoesNotExist:
             return None
 
-    @sync_to_async
-    def get_custom_open_hours_as(self) -> tuple | None:
-        """
-        Get custom open hours for current day if exists. Async uses only.
-
-        Returns:
-            tuple: tuple of open and close hours. None if not exists.
-        """
-        try:
-            day = DayControl.objects.get(date=self.date)
-            return day.open, day.close
-        except ObjectDoesNotExist:
-            return None
-
     def is_weekend(self) -> bool:
         """
         Check if the given date falls on a weekend.
@@ -512,161 +521,282 @@ class SlotsFinder:
         f_date = datetime.strptime(self.date, "%Y-%m-%d")
         return f_date.weekday() >= self.FRIDAY
 
-    def get_booked_slots(self) -> List[Tuple]:
+    def choose_working_hours(self, workhours: dict,
+                             custom_hours: tuple | None) -> tuple:
         """
-        Retrieve busy time ranges from the database.
+        Pick open hours for current day from already loaded data.
+
+        Args:
+            workhours (dict): Default open hours (see get_workhours).
+            custom_hours (tuple | None): Day overrides if exists.
 
         Returns:
-            list: A list of strings representing booked time slots
-             in the format "start_time-end_time".
+            tuple: tuple of open and close hours.
         """
-        bookings = (Booking.objects.filter(booking_date=self.date).exclude(
-            status=_('canceled'))
-        )
-        return [(book.start_time, book.end_time) for book in bookings]
+        if custom_hours:
+            return custom_hours
+        if self.is_weekend():
+            return workhours.get('weekend_slots')
+        return workhours.get('ordinary_slots')
 
-    def get_booked_slots_for_edit(self, excluded_slot: tuple) -> List[Tuple]:
+    def get_booked_slots(self, excluded_pk: int = None) -> List[Tuple]:
         """
-        Retrieve busy time ranges excluding the current range.
+        Retrieve busy time ranges and bikes from the database.
 
         Args:
-            excluded_slot (tuple): A tuple representing the current time range
-             (start_time, end_time).
+            excluded_pk (int, optional): Booking to skip (e.g. the edited
+             one). Defaults to None.
 
         Returns:
-            list: A list of strings representing booked time slots
-             that do not overlap with the excluded range.
+            list: A list of tuples (start_time, end_time, bike_count).
         """
-        exc_start, exc_end = excluded_slot
-        bookings = (Booking.objects.filter(booking_date=self.date).exclude(
-            status=_('canceled'))
+        bookings = Booking.objects.filter(booking_date=self.date).exclude(
+            status=_('canceled')
         )
-        return [(book.start_time, book.end_time) for book in bookings if
-                (book.start_time >= exc_end or book.end_time <= exc_start)]
+        if excluded_pk is not None:
+            bookings = bookings.exclude(pk=excluded_pk)
+        return list(bookings.values_list('start_time', 'end_time',
+                                         'bike_count'))
 
     @staticmethod
-    def get_free_intervals(working_hours: Tuple,
-                           booked_slots: List[Tuple]) -> List[Tuple]:
+    def get_capacity(working_hours: Tuple, booked_slots: List[Tuple],
+                     policy: RidePolicy = None) -> DayCapacity:
         """
-        Calculate available time slots based on booked seconds.
+        Calculate free bikes of the day.
 
         Args:
             working_hours (tuple): A tuple of working time (open-close)
             booked_slots (list): A list of tuples representing
-             booked time slots in seconds.
+             booked time slots (start_time, end_time, bike_count).
+            policy (RidePolicy, optional): Scheduling policy, defaults
+             if not given.
 
         Returns:
-            list: A list of tuples representing available time slots
-             in the format (start_time, end_time).
+            DayCapacity: Free bikes of the day against the fleet size.
         """
-        # check if day closed
-        if all(hour is None for hour in working_hours):
-            return []
+        buffer = (policy or RidePolicy()).buffer
+        day = DayCapacity(*working_hours, fleet=settings.FLEET_SIZE)
+        for start, end, bikes in booked_slots:
+            day.book(start, end, bikes, buffer)
+        return day
 
-        # check if there are no bookings
-        if not booked_slots:
-            return [tuple(map(lambda x: x.strftime('%H:%M'), working_hours))]
+    def calc_day_capacity(self, excluded_pk: int = None) -> DayCapacity:
+        """
+        Calculate free bikes of current day from database.
 
-        # combine time with date for further operations
-        combined_bookings = [(datetime.combine(datetime.today(), start),
-                              datetime.combine(datetime.today(), end)) for
-                             start, end in booked_slots]
+        Args:
+            excluded_pk (int, optional): Booking to skip. Defaults to None.
 
-        # set service intervals around bookings by 1 hour
-        booked_intervals = [((start - timedelta(hours=1)).time(),
-                             (end + timedelta(hours=1)).time()) for start, end
-                            in combined_bookings]
+        Returns:
+            DayCapacity: Free bikes of the day.
+        """
+        working_hours = self.choose_working_hours(
+            self.get_workhours(),
+            self.get_custom_open_hours(),
+        )
+        return self.get_capacity(working_hours,
+                                 self.get_booked_slots(excluded_pk),
+                                 self.policy)
 
-        free_intervals = []
+    def calc_day_availability(self) -> dict:
+        """
+        Calculate free bikes and load of current day from database.
 
-        # sort booked slots by start time before open time
-        booked_intervals.sort(key=lambda x: x[0])
+        Returns:
+            dict: dictionary with 'capacity' (segments of free bikes
+             in minutes) and 'load' (workload percentage).
+        """
+        day = self.calc_day_capacity()
+        return {'capacity': day.segments, 'load': day.load}
 
-        # add initial free slot
-        if working_hours[0] < booked_intervals[0][0]:
-            free_intervals.append((working_hours[0], booked_intervals[0][0]))
+    def get_day_availability(self) -> dict:
+        """
+        Get free bikes and load of current day, cached until the day
+         bookings or settings change.
 
-        # find free intervals between booked slots
-        for i in range(len(booked_intervals) - 1):
-            if booked_intervals[i][1] < booked_intervals[i + 1][0]:
-                free_intervals.append(
-                    (booked_intervals[i][1], booked_intervals[i + 1][0]))
+        Returns:
+            dict: dictionary with 'capacity' (segments of free bikes in
+             minutes, see DayCapacity.from_segments) and 'load' (workload
+              percentage) of the day.
+        """
+        return AvailabilityCache().get_or_set(
+            self.date,
+            self.calc_day_availability,
+        )
+
+    @staticmethod
+    def get_range_availability(first: date, last: date) -> dict:
+        """
+        Get free bikes and load of every day in the range. A single day is
+         read through the day cache, longer ranges are loaded by months
+         (see LoadCalc.get_month_availability).
+
+        Args:
+            first (date): First day of the range.
+            last (date): Last day of the range (included).
+
+        Returns:
+            dict: Day availability keyed by date.
+        """
+        if first == last:
+            finder = SlotsFinder(first.isoformat())
+            return {first: finder.get_day_availability()}
+
+        availability = {}
+        month = first.replace(day=1)
+        while month <= last:
+            load = LoadCalc(
+                calendar.monthcalendar(month.year, month.month),
+                month.year,
+                month.month,
+            )
+            for day, value in load.get_month_availability().items():
+                if first <= month.replace(day=day) <= last:
+                    availability[month.replace(day=day)] = value
+            month = (month + timedelta(days=31)).replace(day=1)
+        return availability
+
+    def find_capacity(self, excluded_pk: int = None) -> DayCapacity:
+        """
+        Get free bikes of current day, read from cache unless a booking
+         is excluded.
+
+        Args:
+            excluded_pk (int, optional): Booking to skip (e.g. the edited
+             one). Defaults to None.
+
+        Returns:
+            DayCapacity: Free bikes of the day.
+        """
+        if self.date.split('-')[-1] == '0':
+            return DayCapacity(fleet=settings.FLEET_SIZE)
 
-        # add final free interval after close time
-        if booked_intervals[-1][1] < working_hours[1]:
-            free_intervals.append((booked_intervals[-1][1], working_hours[1]))
+        if excluded_pk is None:
+            return DayCapacity.from_segments(
+                self.get_day_availability().get('capacity'),
+                settings.FLEET_SIZE,
+            )
+        return self.calc_day_capacity(excluded_pk)
+
+    def find_free_intervals(self, bikes: int = 1,
+                            excluded_pk: int = None) -> List[Tuple]:
+        """
+        Get a list of free intervals in minutes since midnight.
+
+        Args:
+            bikes (int): Count of required bikes. Defaults to 1.
+            excluded_pk (int, optional): Booking to skip (e.g. the edited
+             one). Defaults to None.
 
-        return [(start.strftime('%H:%M'), end.strftime('%H:%M')) for start, end
-                in free_intervals]
+        Returns:
+            list: A list of tuples representing available time slots
+             in the format (start, end) in minutes.
+        """
+        return self.find_capacity(excluded_pk).free_intervals(bikes)
 
-    def find_available_slots(self, excluded_slot: Tuple = None) -> List[Tuple]:
+    def find_available_slots(self, bikes: int = 1,
+                             excluded_pk: int = None) -> List[Tuple]:
         """
         Get a list of available time slots (for django view).
 
         Args:
-            excluded_slot (tuple, optional): A tuple representing
-             the current time range (start_time, end_time). Defaults to None.
+            bikes (int): Count of required bikes. Defaults to 1.
+            excluded_pk (int, optional): Booking to skip (e.g. the edited
+             one). Defaults to None.
 
         Returns:
             list: A list of tuples representing available time slots
              in the format (start_time, end_time).
         """
-        if self.date.split('-')[-1] == '0':
-            return []
+        return format_intervals(self.find_free_intervals(bikes, excluded_pk))
 
-        slots = self.get_workhours()
-        custom_hours = self.get_custom_open_hours()
-        if self.is_weekend():
-            working_hours = slots.get('weekend_slots')
-        else:
-            working_hours = slots.get('ordinary_slots')
-        if custom_hours:
-            working_hours = custom_hours
-        if not excluded_slot:
-            booked_slots = self.get_booked_slots()
-        else:
-            booked_slots = self.get_booked_slots_for_edit(excluded_slot)
-        available_slots = self.get_free_intervals(working_hours, booked_slots)
-        return available_slots
+    def find_capacity_slots(self, excluded_pk: int = None) -> List[Tuple]:
+        """
+        Get time ranges with count of free bikes (for django view).
+
+        Args:
+            excluded_pk (int, optional): Booking to skip. Defaults to None.
 
-    async def find_available_slots_as(self, excluded_slot=None) -> list:
+        Returns:
+            list: A list of tuples (start_time, end_time, free bikes)
+             of ranges with at least one free bike.
+        """
+        return format_capacity(self.find_capacity(excluded_pk).segments)
+
+    async def find_free_intervals_as(self, bikes: int = 1,
+                                     excluded_pk: int = None) -> list:
         """
-        Get a list of available time slots (for bot).
+        Get a list of free intervals in minutes (for bot).
 
         Args:
-            excluded_slot (tuple, optional): A tuple representing
-             the current time range (start_time, end_time). Defaults to None.
+            bikes (int): Count of required bikes. Defaults to 1.
+            excluded_pk (int, optional): Booking to skip (e.g. the edited
+             one). Defaults to None.
 
         Returns:
             list: A list of tuples representing available time slots
-             in the format (start_time, end_time).
+             in the format (start, end) in minutes.
         """
-        get_booking_slots_as = sync_to_async(self.get_booked_slots)
-        get_slots_for_edit = sync_to_async(self.get_booked_slots_for_edit)
-        slots = await self.get_workhours_as()
-        custom_hours = await self.get_custom_open_hours_as()
-        if self.is_weekend():
-            working_hours = slots.get('weekend_slots')
-        else:
-            working_hours = slots.get('ordinary_slots')
-        if custom_hours:
-            working_hours = custom_hours
         try:
-            if not excluded_slot:
-                booked_slots = await get_booking_slots_as()
-            else:
-                booked_slots = await get_slots_for_edit(excluded_slot)
-            available_slots = self.get_free_intervals(working_hours,
-                                                      booked_slots)
-            return available_slots
+            return await sync_to_async(self.find_free_intervals)(
+                bikes, excluded_pk
+            )
         except ValidationError:
             return []
 
+    async def find_free_bikes_as(self, start: str, end: str,
+                                 excluded_pk: int = None) -> int:
+        """
+        Get count of bikes free during the whole time range (for bot).
+
+        Args:
+            start (str): Start time in the format 'HH:MM'.
+            end (str): End time in the format 'HH:MM'.
+            excluded_pk (int, optional): Booking to skip. Defaults to None.
+
+        Returns:
+            int: Count of free bikes.
+        """
+        day = await sync_to_async(self.find_capacity)(excluded_pk)
+        return day.free_bikes(start, end)
+
+    def admit(self, booking: Booking) -> Booking:
+        """
+        Save the booking if its time and bikes are still free. The date is
+         locked while the check and the write run, so concurrent admissions
+         of the same date can't exceed the fleet.
+
+        Args:
+            booking (Booking): New or edited booking on the finder date.
+
+        Returns:
+            Booking: The saved booking.
+
+        Raises:
+            ValidationError: If the time is not available.
+        """
+        with transaction.atomic():
+            BookingDay.lock(self.date)
+            if booking.status != _('canceled'):
+                day = self.calc_day_capacity(excluded_pk=booking.pk)
+                free_bikes = day.free_bikes(booking.start_time,
+                                            booking.end_time)
+                if free_bikes < int(booking.bike_count):
+                    raise ValidationError(
+                        _('Selected time is not available for booking'),
+                        code='unavailable',
+                    )
+            booking.save()
+        return booking
+
 
 class LoadCalc:
     """
     A utility class for calculating load-related information.
 
+    All month data (work hours, day overrides and bookings) is fetched once
+     by load_month, so the whole calendar costs a constant number of queries.
+
     Args:
         calendar (list): A list representing the calendar data.
         year (int): The year for which load calculations are performed.
@@ -677,54 +807,87 @@ class LoadCalc:
         self.calendar = calendar
         self.year = year
         self.month = month
+        self.workhours = {}
+        self.custom_hours = {}
+        self.booked_slots = defaultdict(list)
+        self.policy = None
+        self.availability = {}
+
+    def load_month(self) -> None:
+        """
+        Fetch work hours, scheduling policy, day overrides and bookings
+         for the whole month.
+        """
+        last_day = calendar.monthrange(self.year, self.month)[1]
+        first_date = datetime(self.year, self.month, 1).date()
+        last_date = datetime(self.year, self.month, last_day).date()
+        self.workhours = SlotsFinder.get_workhours()
+        self.policy = SchedulingPolicy.get_policy()
+        days = DayControl.objects.filter(date__range=(first_date, last_date))
+        self.custom_hours = {day.date.day: (day.open, day.close)
+                             for day in days}
+        bookings = (Booking.objects.filter(
+            booking_date__range=(first_date, last_date)
+        ).exclude(status=_('canceled')).values_list(
+            'booking_date', 'start_time', 'end_time', 'bike_count')
+        )
+        self.booked_slots = defaultdict(list)
+        for booking_date, *booked_slot in bookings:
+            self.booked_slots[booking_date.day].append(tuple(booked_slot))
 
-    @staticmethod
-    def get_day_load(date: str) -> int:
+    def calc_day_availability(self, day: int) -> dict:
         """
-        Calculate the workload of a given date as a percentage.
+        Calculate free bikes and load of the day from loaded month data.
 
         Args:
-            date (str): The date for which workload needs to be calculated.
-
-        Returns:
-            int: Workload percentage (rounded down).
-                -1 if the date is invalid (e.g., last day of the month).
-        """
-        if date.split('-')[-1] == '0':
-            return -1
-        bookings = (Booking.objects.filter(booking_date=date)
-                    .exclude(status=_('canceled')))
-        s = SlotsFinder(date)
-        custom_h = s.get_custom_open_hours()
-        workhours = s.get_workhours()
-
-        # check if this day has custom workhours
-        if custom_h:
-            # return 100% load when day is closed
-            if all(hour is None for hour in custom_h):
-                return 100
-
-            open_h = datetime.combine(datetime.today().date(), custom_h[0])
-            close_h = datetime.combine(datetime.today().date(), custom_h[-1])
-        elif s.is_weekend():
-            weekend = workhours.get('weekend_slots')
-            open_h = datetime.combine(datetime.today().date(), weekend[0])
-            close_h = datetime.combine(datetime.today().date(), weekend[-1])
-        else:
-            ordinary = workhours.get('ordinary_slots')
-            open_h = datetime.combine(datetime.today().date(), ordinary[0])
-            close_h = datetime.combine(datetime.today().date(), ordinary[-1])
-        diff = close_h - open_h
-        open_hours_count = diff.total_seconds() // 3600
-        book_time = 0
-        for booking in bookings:
-            start_time = booking.start_time
-            end_time = booking.end_time
-            start = datetime.combine(datetime.today(), start_time)
-            end = datetime.combine(datetime.today(), end_time)
-            duration = (end - start).seconds // 3600
-            book_time += duration
-        return int((book_time / open_hours_count) * 100)
+            day (int): Day of the month.
+
+        Returns:
+            dict: dictionary with 'capacity' and 'load' of the day.
+        """
+        s = SlotsFinder(f'{self.year}-{self.month}-{day}', self.policy)
+        working_hours = s.choose_working_hours(
+            self.workhours,
+            self.custom_hours.get(day),
+        )
+        capacity = s.get_capacity(working_hours,
+                                  self.booked_slots.get(day, []),
+                                  self.policy)
+        return {'capacity': capacity.segments, 'load': capacity.load}
+
+    def get_month_availability(self) -> dict:
+        """
+        Get free slots and load of every day in the month. Cached days are
+         read in one cache round trip, the month is loaded from database
+         only if some days are missing.
+
+        Returns:
+            dict: Day availability keyed by day of the month.
+        """
+        days = {day: f'{self.year}-{self.month}-{day}'
+                for week in self.calendar for day in week if day}
+        cache = AvailabilityCache()
+        found, stamps = cache.get_many(days.values())
+        if stamps:
+            self.load_month()
+            computed = {date: self.calc_day_availability(day)
+                        for day, date in days.items() if date in stamps}
+            cache.set_many(computed, stamps)
+            found.update(computed)
+        return {day: found[date] for day, date in days.items()}
+
+    def get_version(self) -> str:
+        """
+        Get the availability version of the month, it changes with any
+         booking or settings change of its days.
+
+        Returns:
+            str: The version.
+        """
+        return AvailabilityCache().get_version(
+            f'{self.year}-{self.month}-{day}'
+            for week in self.calendar for day in week if day
+        )
 
     def get_week_load(self, week: list) -> list:
         """
@@ -739,9 +902,16 @@ class LoadCalc:
         """
         week_load = []
         for day in week:
-            date = f'{self.year}-{self.month}-{day}'
-            slots = SlotsFinder(date).find_available_slots()
-            day_load = (day, self.get_day_load(date), slots)
+            # day out of current month
+            if not day:
+                week_load.append((day, -1, []))
+                continue
+            availability = self.availability.get(day)
+            capacity = DayCapacity.from_segments(
+                availability.get('capacity'), settings.FLEET_SIZE
+            )
+            day_load = (day, availability.get('load'),
+                        format_intervals(capacity.free_intervals()))
             week_load.append(day_load)
         return week_load
 
@@ -752,4 +922,5 @@ class LoadCalc:
         Returns:
             list: A list of weekly workload information.
         """
+        self.availability = self.get_month_availability()
         return [self.get_week_load(week) for week in self.calendar]
@@ -0,0 +1,116 @@
+import logging
+import time
+from concurrent import futures
+
+from django.conf import settings
+from django.core.cache import cache
+from kombu.exceptions import OperationalError
+from requests import RequestException
+from vk_api.exceptions import VkApiError
+
+from btr.vk import TopicComments
+
+
+logger = logging.getLogger(__name__)
+
+GROUP_ID = '211850637'
+TOPIC_ID = '49522524'
+
+STORE_KEY = 'reviews:comments'
+REFRESH_LOCK_KEY = 'reviews:refresh'
+# seconds
+FRESH_FOR = 10 * 60
+REFRESH_LOCK_TIMEOUT = 60
+# timeout of VK calls and of the whole fetch when a page is requested
+# with an empty store
+FETCH_TIMEOUT = 3
+FETCH_DEADLINE = 5
+
+# fetches for pages run here, so a page doesn't wait past the deadline
+_executor = futures.ThreadPoolExecutor(max_workers=1,
+                                       thread_name_prefix='reviews')
+
+
+def fetch_reviews(timeout: float) -> list:
+    """
+    Get topic comments with profiles of their authors from VK.
+    """
+    vk = TopicComments(GROUP_ID, TOPIC_ID, settings.VK_ACCESS_TOKEN,
+                       timeout)
+    return vk.get_comments()
+
+
+def refresh_reviews(timeout: float = 10) -> list:
+    """
+    Fetch comments from VK and store them for the reviews page. The stored
+     comments never expire, so the page has them while VK is down.
+
+    Args:
+        timeout (float): Timeout of every VK call in seconds.
+
+    Returns:
+        list: Stored comments.
+    """
+    comments = fetch_reviews(timeout)
+    cache.set(STORE_KEY, {'comments': comments, 'fetched_at': time.time()},
+              None)
+    return comments
+
+
+def schedule_refresh() -> None:
+    """
+    Refresh stored comments in background, one task at a time. The page
+     doesn't fail if the broker is unreachable, the lock is released for
+     the next request to try again.
+    """
+    from btr.tasks.reviews import refresh_vk_reviews
+    if cache.add(REFRESH_LOCK_KEY, True, REFRESH_LOCK_TIMEOUT):
+        try:
+            refresh_vk_reviews.delay()
+        except OperationalError as error:
+            cache.delete(REFRESH_LOCK_KEY)
+            logger.warning('VK reviews refresh is not scheduled: %r', error)
+
+
+def refresh_locked() -> list:
+    """
+    Refresh comments for a page, the refresh lock is held by the caller
+     and released when the fetch is over.
+    """
+    try:
+        return refresh_reviews(FETCH_TIMEOUT)
+    finally:
+        cache.delete(REFRESH_LOCK_KEY)
+
+
+def get_reviews() -> list:
+    """
+    Get comments for the reviews page (stale-while-revalidate).
+
+    Stored comments are returned at once, stale ones are refreshed in
+     background. With an empty store one request fetches comments from VK
+     and waits for them up to FETCH_DEADLINE seconds (a late fetch still
+     fills the store), other requests get an empty list meanwhile. An
+     empty list is also returned if VK doesn't answer.
+
+    Returns:
+        list: Comments with profiles of their authors.
+    """
+    entry = cache.get(STORE_KEY)
+    if entry is not None:
+        if time.time() - entry['fetched_at'] > FRESH_FOR:
+            schedule_refresh()
+        return entry['comments']
+    if not cache.add(REFRESH_LOCK_KEY, True, REFRESH_LOCK_TIMEOUT):
+        # fetched by another request or the task
+        return []
+    fetch = _executor.submit(refresh_locked)
+    try:
+        return fetch.result(timeout=FETCH_DEADLINE)
+    except futures.TimeoutError:
+        logger.warning('VK reviews are not fetched in %ss', FETCH_DEADLINE)
+        return []
+    except (VkApiError, RequestException) as error:
+        logger.warning('VK reviews are not available: %r', error)
+        schedule_refresh()
+        return []
@@ -1,8 +1,8 @@
-import os
-from dotenv import load_dotenv
+from django.conf import settings
 from django.utils.translation import gettext as _
 
-from ..vk import SendBookingNotification
+from btr.notifications.models import OutboxMessage
+from btr.notifications.outbox import enqueue
 from ..celery import app
 
 
@@ -12,6 +12,9 @@ def send_vk_notify(via: str, created: bool, data: dict,
     """
     Send a message in VK after successfully booking or changing status.
 
+    The message is queued in the outbox, notifications which arrive within
+     VK_DIGEST_WINDOW seconds are sent to the admin as one digest.
+
     Args:
         via (str): The source of the notification (e.g., 'Admin panel').
         created (bool): Indicates whether the booking was just created.
@@ -33,10 +36,6 @@ def send_vk_notify(via: str, created: bool, data: dict,
         'status' (str): Booking status (e.g. 'confirmed')
         'email' (str): Rider email (e.g. 'john@example.com')
     """
-    load_dotenv()
-    user_id = os.getenv('VK_ADMIN_ID')
-    access_token = os.getenv('VK_BTR_KEY')
-    vk = SendBookingNotification(user_id, access_token)
     status = data.get('status')
     username = _(
         'User with username {client}'
@@ -99,4 +98,4 @@ def send_vk_notify(via: str, created: bool, data: dict,
             end=data.get('end'),
             bikes=data.get('bikes'),
         )
-    vk.send_notify(msg)
+    enqueue(settings.VK_ADMIN_ID, '', msg, channel=OutboxMessage.VK)
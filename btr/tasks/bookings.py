@@ -1,12 +1,17 @@
-from datetime import datetime
+from collections import Counter
 
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
 from django.utils.translation import gettext as _
 
 from celery import shared_task
 
 from btr.bookings.models import Booking
+from btr.users.levels import add_completed_rides
 from ..emails import (create_booking_mail, confirm_booking_mail,
-                      cancel_booking_mail, edit_booking_mail)
+                      cancel_booking_mail, edit_booking_mail,
+                      bulk_booking_mail)
 from ..celery import app
 
 
@@ -184,22 +189,61 @@ def send_self_edit_booking_message(**kwargs) -> None:
     )
 
 
+@app.task
+def send_bulk_booking_messages(action: str, bookings: list) -> None:
+    """
+    Email many users at once (e.g. after admin mass actions), the email
+     template is rendered once for all of them.
+
+    Args:
+        action (str): Email action ('confirm' or 'cancel').
+        bookings (list): Booking details of every user
+         (see send_confirm_message).
+
+    Example:
+        send_bulk_booking_messages('confirm', [
+            {'email': 'user@example.com', 'date': '2024-03-29',
+             'start': '10:00', 'end': '11:00', 'bikes': '2', 'pk': '123'},
+        ])
+    """
+    bulk_booking_mail(action, bookings)
+
+
 @shared_task
-def check_booking_status() -> None:
+def check_booking_status(batch_size: int = 1000) -> int:
     """
     Automatically set booking status to 'completed' after the booking end time.
 
+    Finished bookings are claimed with SELECT ... FOR UPDATE SKIP LOCKED,
+     so several beat/worker nodes never process the same rows, completed
+     with a single UPDATE and riders' completed rides counters and levels
+     are changed with F expressions.
+
+    Args:
+        batch_size (int): Max count of bookings completed per run.
+
+    Returns:
+        int: Count of completed bookings.
+
     Example:
         This task runs periodically and updates the status of confirmed
          bookings whose end time has passed.
     """
-    current_time = datetime.utcnow()
-    current_date = datetime.utcnow().date()
-    bookings_to_complete = Booking.objects.filter(
-        status=_('confirmed'),
-        booking_date__lte=current_date,
-        end_time__gte=current_time,
+    now = timezone.localtime()
+    finished = Q(booking_date__lt=now.date()) | Q(
+        booking_date=now.date(),
+        end_time__lte=now.time(),
     )
-    for booking in bookings_to_complete:
-        booking.status = _('completed')
-        booking.save()
+    with transaction.atomic():
+        claimed = list(Booking.objects.select_for_update(
+            skip_locked=True
+        ).filter(finished, status=_('confirmed')).order_by('pk').values_list(
+            'pk', 'rider_id')[:batch_size])
+        if not claimed:
+            return 0
+        completed = Booking.objects.filter(
+            pk__in=[pk for pk, rider_id in claimed],
+            status=_('confirmed'),
+        ).update(status=_('completed'))
+        add_completed_rides(Counter(rider_id for pk, rider_id in claimed))
+    return completed
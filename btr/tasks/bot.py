@@ -0,0 +1,19 @@
+from django.conf import settings
+
+from btr.tg_bot.storage import purge_expired
+from ..celery import app
+
+
+@app.task
+def purge_bot_states() -> int:
+    """
+    Delete abandoned bot dialogs of the database FSM storage.
+
+    Returns:
+        int: Count of deleted dialogs.
+
+    Example:
+        This task runs periodically, dialogs idle for TG_FSM_TTL seconds
+         are deleted.
+    """
+    return purge_expired(settings.TG_FSM_TTL)
@@ -0,0 +1,51 @@
+from btr.notifications import outbox
+from ..celery import app
+
+
+@app.task
+def send_outbox(batch_size: int = outbox.BATCH_SIZE) -> dict:
+    """
+    Drain emails from the notifications outbox batch by batch, every batch
+     reuses one email connection.
+
+    Args:
+        batch_size (int): Max count of messages per connection.
+
+    Returns:
+        dict: Count of 'sent' and 'failed' messages.
+
+    Example:
+        This task runs periodically and after new notifications are queued.
+    """
+    total = {'sent': 0, 'failed': 0}
+    while True:
+        result = outbox.drain(batch_size)
+        for key, value in result.items():
+            total[key] += value
+        if sum(result.values()) < batch_size:
+            return total
+
+
+@app.task
+def send_vk_outbox(batch_size: int = outbox.BATCH_SIZE) -> dict:
+    """
+    Drain VK notifications from the outbox, pending messages of every
+     recipient are sent as one digest.
+
+    Args:
+        batch_size (int): Max count of messages per batch.
+
+    Returns:
+        dict: Count of 'sent' and 'failed' messages.
+
+    Example:
+        This task runs periodically and after the digest window of new
+         notifications.
+    """
+    total = {'sent': 0, 'failed': 0}
+    while True:
+        result = outbox.drain_vk(batch_size)
+        for key, value in result.items():
+            total[key] += value
+        if sum(result.values()) < batch_size:
+            return total
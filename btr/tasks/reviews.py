@@ -0,0 +1,21 @@
+from django.core.cache import cache
+
+from btr import reviews
+from ..celery import app
+
+
+@app.task
+def refresh_vk_reviews() -> int:
+    """
+    Fetch VK topic comments for the reviews page.
+
+    Returns:
+        int: Count of stored comments.
+
+    Example:
+        This task runs periodically and when stored comments are stale.
+    """
+    try:
+        return len(reviews.refresh_reviews())
+    finally:
+        cache.delete(reviews.REFRESH_LOCK_KEY)
@@ -1,6 +1,11 @@
 from django import template
+from django.core.cache import cache
+from django.core.cache.utils import make_template_fragment_key
+from django.utils.translation import get_language
 import datetime
 
+from btr.bookings.fragments import FRAGMENT_TIMEOUT, track
+
 
 register = template.Library()
 
@@ -50,3 +55,48 @@ def ru_month_genitive(date: datetime.date) -> str:
         12: "Декабря",
     }
     return months_genitive[date.month]
+
+
+class FragmentCacheNode(template.Node):
+
+    def __init__(self, nodelist, name: str, vary_on: list):
+        self.nodelist = nodelist
+        self.name = name
+        self.vary_on = vary_on
+
+    def render(self, context) -> str:
+        vary_on = [var.resolve(context) for var in self.vary_on]
+        vary_on.append(get_language())
+        key = make_template_fragment_key(self.name, vary_on)
+        with track(self.name) as render:
+            value = cache.get(key)
+            render['hit'] = value is not None
+            if value is None:
+                value = self.nodelist.render(context)
+                cache.set(key, value, FRAGMENT_TIMEOUT)
+        return value
+
+
+@register.tag
+def fragment_cache(parser, token):
+    """
+    Tag to cache a fragment per language and vary on values, like the
+     builtin cache tag, counting hits and render times.
+
+    Example:
+        {% fragment_cache 'calendar-next' next_month next_version %}
+            ...
+        {% endfragment_cache %}
+    """
+    bits = token.split_contents()
+    if len(bits) < 2:
+        raise template.TemplateSyntaxError(
+            f"'{bits[0]}' tag requires at least 1 argument."
+        )
+    nodelist = parser.parse(('endfragment_cache',))
+    parser.delete_first_token()
+    return FragmentCacheNode(
+        nodelist,
+        bits[1].strip('\'"'),
+        [parser.compile_filter(bit) for bit in bits[2:]],
+    )
@@ -1,11 +1,13 @@
 from django import forms
 from django.contrib.admin import AdminSite
+from django.core.cache import cache
 from django.test import TestCase, RequestFactory
 from django.urls import reverse_lazy
 from django.utils.translation import activate
 
 from btr.bookings.admin import BookingAdmin
 from btr.bookings.models import Booking
+from btr.metrics import get_query_budget
 from btr.users.models import SiteUser
 
 
@@ -28,6 +30,8 @@ class BTRTestCase(TestCase):
 
     def setUp(self):
 
+        cache.clear()
+
         self.user = SiteUser.objects.get(pk=1)
         self.user.set_password(self.password)
         self.user.save()
@@ -40,6 +44,19 @@ class BTRTestCase(TestCase):
 
         self.client.force_login(self.user)
 
+    def assertQueryBudget(self, response):
+        """
+        Fail if the request made more queries than the query_budget of its
+         view, catches N+1 regressions of budgeted views.
+        """
+        budget = get_query_budget(response.wsgi_request)
+        self.assertIsNotNone(budget, 'the view has no query budget')
+        self.assertLessEqual(
+            response.metrics.queries, budget,
+            f'{response.resolver_match.view_name} made '
+            f'{response.metrics.queries} queries, the budget is {budget}'
+        )
+
 
 class BTRAdminTestCase(BTRTestCase):
 
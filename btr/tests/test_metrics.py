@@ -0,0 +1,109 @@
+from unittest.mock import MagicMock, patch
+
+from django.test import override_settings
+from django.urls import reverse_lazy
+
+from btr.bookings.models import Booking
+from btr.metrics import collect, get_metrics, record_cache, reset_metrics
+from btr.test_init import BTRTestCase
+
+
+class TestMetrics(BTRTestCase):
+
+    metrics_url = reverse_lazy('metrics')
+    calendar_url = reverse_lazy('bookings')
+
+    def setUp(self):
+        super().setUp()
+        reset_metrics()
+
+    def test_collect(self):
+        with collect() as stats:
+            list(Booking.objects.all())
+            Booking.objects.count()
+            record_cache(hits=2, misses=1)
+        record_cache(hits=5)
+        self.assertEqual(stats.queries, 2)
+        self.assertGreater(stats.db_time, 0)
+        self.assertEqual((stats.cache_hits, stats.cache_misses), (2, 1))
+
+    def test_response_stats(self):
+        response = self.client.get(self.calendar_url)
+        self.assertGreater(response.metrics.queries, 0)
+        self.assertGreater(response.metrics.cache_misses, 0)
+        self.assertGreater(response.metrics.render_time, 0)
+        self.assertNotIn('X-DB-Queries', response)
+        response = self.client.get(self.calendar_url)
+        self.assertGreater(response.metrics.cache_hits, 0)
+
+    @override_settings(DEBUG=True)
+    def test_debug_headers(self):
+        response = self.client.get(self.calendar_url)
+        self.assertEqual(int(response['X-DB-Queries']),
+                         response.metrics.queries)
+        for header in ('X-DB-Time-Ms', 'X-Cache-Hits', 'X-Cache-Misses',
+                       'X-Render-Time-Ms'):
+            self.assertIn(header, response)
+        self.assertIn('render;dur=', response['Server-Timing'])
+
+    def test_aggregated(self):
+        self.client.get(self.calendar_url)
+        self.client.get(self.calendar_url)
+        metrics = get_metrics()['bookings']
+        self.assertEqual(metrics['requests'], 2)
+        self.assertEqual(sum(metrics['duration_buckets'].values()), 2)
+        self.assertEqual(sum(metrics['query_buckets'].values()), 2)
+        self.assertGreater(metrics['queries'], 0)
+        self.assertGreater(metrics['cache_hits'], 0)
+
+    def test_redis_single_round_trip(self):
+        redis = MagicMock()
+        with patch('btr.metrics._get_redis', return_value=redis):
+            self.client.get(self.calendar_url)
+        pipe = redis.pipeline.return_value
+        pipe.execute.assert_called_once()
+        redis.get.assert_not_called()
+        # the view set is updated atomically with the counters
+        self.assertEqual(pipe.sadd.call_args.args[1], 'bookings')
+        fields = {call.args[1] for call in pipe.hincrby.call_args_list}
+        self.assertTrue({'requests', 'queries'} <= fields)
+
+    def test_store_failure_ignored(self):
+        with patch('btr.metrics.MetricsStore.add',
+                   side_effect=ConnectionError), \
+                self.assertLogs('btr.metrics', 'WARNING'):
+            response = self.client.get(reverse_lazy('is_health'))
+        self.assertEqual(response.status_code, 200)
+
+    def test_endpoint_access(self):
+        self.assertEqual(self.client.get(self.metrics_url).status_code, 404)
+        with self.settings(METRICS_TOKEN='secret'):
+            response = self.client.get(self.metrics_url,
+                                       HTTP_AUTHORIZATION='Bearer wrong')
+            self.assertEqual(response.status_code, 404)
+            self.client.logout()
+            response = self.client.get(self.metrics_url,
+                                       HTTP_AUTHORIZATION='Bearer secret')
+            self.assertEqual(response.status_code, 200)
+
+    def test_endpoint(self):
+        self.user.is_staff = True
+        self.user.save()
+        self.client.get(self.calendar_url)
+        response = self.client.get(self.metrics_url)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(
+            response, 'btr_request_queries_count{view="bookings"} 1'
+        )
+        self.assertContains(
+            response,
+            'btr_request_duration_ms_bucket{view="bookings",le="+Inf"} 1'
+        )
+        self.assertContains(
+            response, 'btr_fragment_misses_total{fragment="calendar-current"}'
+        )
+
+    def test_profile_query_budget(self):
+        self.assertQueryBudget(
+            self.client.get(reverse_lazy('profile', args=[self.user.pk]))
+        )
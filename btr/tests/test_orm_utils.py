@@ -0,0 +1,85 @@
+from asgiref.sync import async_to_sync
+from django.utils.translation import gettext as _
+
+from btr.bookings.models import Booking
+from btr.orm_utils import AsyncTools
+from btr.test_init import BTRTestCase
+from btr.tg_bot.utils import exceptions as e
+from btr.users.models import SiteUser
+
+
+class TestAsyncTools(BTRTestCase):
+
+    async def test_user_bookings(self):
+        user = await AsyncTools().get_user_info(pk=2)
+        bookings = await AsyncTools().get_user_bookings(email=user['email'])
+        self.assertEqual(bookings['bookings_id'], ['1', '2'])
+        with self.assertRaises(e.UserDoesNotExists):
+            await AsyncTools().get_user_info(pk=100)
+
+    async def test_check_password(self):
+        await AsyncTools().check_password(self.password, pk=1)
+        with self.assertRaises(e.WrongPassword):
+            await AsyncTools().check_password('wrong', pk=1)
+        with self.assertRaises(e.UserDoesNotExists):
+            await AsyncTools().check_password(self.password, pk=100)
+
+    def test_create_user(self):
+        with self.assertNumQueries(1):
+            password = async_to_sync(AsyncTools().create_user)(
+                username='bot_user',
+                first_name='Bot',
+                email='Bot@example.com',
+                phone_number='+79990001122',
+            )
+        user = SiteUser.objects.get(username='bot_user')
+        self.assertEqual(user.status, _('newbie'))
+        self.assertEqual(user.normalized_email, 'bot@example.com')
+        self.assertTrue(user.check_password(password))
+
+    def test_reset_password(self):
+        reset_password = async_to_sync(AsyncTools().reset_password)
+        with self.assertNumQueries(1):
+            password = reset_password(email='user2@example.com')
+        self.assertTrue(SiteUser.objects.get(pk=2).check_password(password))
+        with self.assertRaises(e.UserDoesNotExists):
+            reset_password(email='unknown@example.com')
+
+    async def test_check_available_field(self):
+        self.assertTrue(
+            await AsyncTools().check_available_field('free_username')
+        )
+        with self.assertRaises(e.UserAlreadyExists):
+            await AsyncTools().check_available_field(self.user.username)
+
+    async def test_make_and_edit_booking(self):
+        pk = await AsyncTools().make_booking({
+            'pk': 2,
+            'date': '9999-02-20',
+            'start': '12:00',
+            'end': '13:00',
+            'bikes': '1',
+        })
+        await AsyncTools().edit_booking(pk=pk, date='9999-02-21',
+                                        start='14:00', end='15:00', bikes='2')
+        booking = await Booking.objects.aget(pk=pk)
+        self.assertEqual(str(booking.booking_date), '9999-02-21')
+        self.assertEqual(booking.bike_count, 2)
+        self.assertEqual(booking.status, _('pending'))
+
+    async def test_change_booking_status(self):
+        await AsyncTools().change_booking_status(_('confirmed'), '1')
+        booking = await Booking.objects.aget(pk=1)
+        self.assertEqual(booking.status, _('confirmed'))
+
+    async def test_reconfirm_into_full_slot(self):
+        await AsyncTools().change_booking_status(_('canceled'), '1')
+        # the whole fleet takes the time of the canceled booking
+        await Booking.objects.acreate(
+            rider_id=3, booking_date='9999-02-10', start_time='17:00',
+            end_time='18:00', bike_count=4, status=_('confirmed'),
+        )
+        with self.assertRaises(e.TimeIsNotAvailable):
+            await AsyncTools().change_booking_status(_('confirmed'), '1')
+        booking = await Booking.objects.aget(pk=1)
+        self.assertEqual(booking.status, _('canceled'))
@@ -0,0 +1,124 @@
+import time
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from kombu.exceptions import OperationalError
+
+from btr import reviews
+from btr.fake_vk import FakeVKServer
+from btr.vk import get_vk_client
+
+
+COMMENTS = {
+    'items': [
+        {'id': 1, 'from_id': -211850637, 'text': 'Topic'},
+        {'id': 2, 'from_id': 10, 'text': 'Great ride'},
+        {'id': 3, 'from_id': 20, 'text': 'Cool bikes'},
+        {'id': 4, 'from_id': 10, 'text': 'Again!'},
+    ],
+}
+USERS = [
+    {'id': 10, 'first_name': 'John', 'last_name': 'Doe'},
+    {'id': 20, 'first_name': 'Jane', 'last_name': 'Roe',
+     'photo_100': 'https://example.com/jane.jpg'},
+]
+
+
+class TestReviews(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        get_vk_client.cache_clear()
+        self.server = FakeVKServer()
+        self.server.responses = {
+            'board.getComments': COMMENTS,
+            'users.get': USERS,
+        }
+        self.server.__enter__()
+        self.addCleanup(self.server.__exit__)
+        settings = override_settings(VK_API_URL=self.server.url,
+                                     VK_ACCESS_TOKEN='token')
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+    def test_users_batched(self):
+        comments = reviews.refresh_reviews()
+        self.assertEqual(len(comments), 3)
+        self.assertEqual(comments[2]['user']['first_name'], 'John')
+        users_calls = self.server.get_calls('users.get')
+        self.assertEqual(len(users_calls), 1)
+        self.assertEqual(users_calls[0]['user_ids'], '10,20')
+
+    def test_page_from_store(self):
+        reviews.refresh_reviews()
+        with patch('btr.tasks.reviews.refresh_vk_reviews.delay') as task:
+            response = self.client.get(reverse('reviews'))
+        self.assertContains(response, 'Cool bikes')
+        self.assertContains(response, 'jane.jpg')
+        task.assert_not_called()
+        self.assertEqual(len(self.server.get_calls('board.getComments')), 1)
+
+    def test_stale_revalidated(self):
+        reviews.refresh_reviews()
+        fetched_at = time.time() - reviews.FRESH_FOR - 1
+        entry = cache.get(reviews.STORE_KEY)
+        cache.set(reviews.STORE_KEY, {**entry, 'fetched_at': fetched_at})
+        with patch('btr.tasks.reviews.refresh_vk_reviews.delay') as task:
+            self.assertEqual(len(reviews.get_reviews()), 3)
+            reviews.get_reviews()
+        # stale comments are returned, one refresh is scheduled
+        task.assert_called_once()
+
+    def test_broker_down(self):
+        reviews.refresh_reviews()
+        fetched_at = time.time() - reviews.FRESH_FOR - 1
+        entry = cache.get(reviews.STORE_KEY)
+        cache.set(reviews.STORE_KEY, {**entry, 'fetched_at': fetched_at})
+        with patch('btr.tasks.reviews.refresh_vk_reviews.delay',
+                   side_effect=OperationalError('broker is down')), \
+                self.assertLogs('btr.reviews', 'WARNING'):
+            response = self.client.get(reverse('reviews'))
+        # stored comments are served, the next request tries again
+        self.assertContains(response, 'Cool bikes')
+        self.assertIsNone(cache.get(reviews.REFRESH_LOCK_KEY))
+
+    def test_cold_store_fallback(self):
+        # access denied
+        self.server.errors.append(15)
+        with patch('btr.tasks.reviews.refresh_vk_reviews.delay') as task, \
+                self.assertLogs('btr.reviews', 'WARNING'):
+            response = self.client.get(reverse('reviews'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['comments'], [])
+        task.assert_called_once()
+
+    def test_fetch_deadline(self):
+        def slow_fetch(timeout):
+            time.sleep(0.3)
+            return ['comment']
+
+        with patch('btr.reviews.fetch_reviews', side_effect=slow_fetch), \
+                patch('btr.reviews.FETCH_DEADLINE', 0.05), \
+                self.assertLogs('btr.reviews', 'WARNING'):
+            started = time.monotonic()
+            self.assertEqual(reviews.get_reviews(), [])
+            self.assertLess(time.monotonic() - started, 0.25)
+            # the late fetch still fills the store
+            reviews._executor.submit(lambda: None).result()
+        self.assertEqual(reviews.get_reviews(), ['comment'])
+        self.assertIsNone(cache.get(reviews.REFRESH_LOCK_KEY))
+
+    def test_single_inline_fetch(self):
+        # another request is fetching
+        cache.add(reviews.REFRESH_LOCK_KEY, True)
+        self.assertEqual(reviews.get_reviews(), [])
+        self.assertEqual(self.server.get_calls('board.getComments'), [])
+
+    def test_task(self):
+        from btr.tasks.reviews import refresh_vk_reviews
+        cache.set(reviews.REFRESH_LOCK_KEY, True)
+        self.assertEqual(refresh_vk_reviews(), 3)
+        self.assertIsNone(cache.get(reviews.REFRESH_LOCK_KEY))
+        self.assertEqual(len(reviews.get_reviews()), 3)
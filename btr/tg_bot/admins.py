@@ -0,0 +1,88 @@
+import asyncio
+import logging
+import os
+import re
+import signal
+from typing import Any, Awaitable, Callable, Dict
+
+from aiogram import BaseMiddleware
+from aiogram.types import TelegramObject
+from dotenv import dotenv_values, find_dotenv
+
+
+logger = logging.getLogger(__name__)
+
+ID_RE = re.compile(r'-?\d+')
+
+# reload signal, not available on windows
+RELOAD_SIGNAL = getattr(signal, 'SIGHUP', None)
+
+_admin_ids: frozenset = frozenset()
+
+
+def parse_admin_ids(value: str) -> frozenset:
+    """
+    Parse telegram IDs of admins (e.g. '[123, 456]' or '123,456').
+
+    Args:
+        value (str): TG_ADMIN_IDS value.
+
+    Returns:
+        frozenset: Admin IDs.
+    """
+    return frozenset(int(pk) for pk in ID_RE.findall(value or ''))
+
+
+def load_admin_ids() -> frozenset:
+    """
+    Read admin IDs from .env file, or from the environment if the file
+     doesn't set them. The file wins, so it can be edited and reloaded
+     without a restart.
+
+    Returns:
+        frozenset: Loaded admin IDs.
+    """
+    global _admin_ids
+    value = dotenv_values(find_dotenv()).get('TG_ADMIN_IDS')
+    if value is None:
+        value = os.getenv('TG_ADMIN_IDS')
+    _admin_ids = parse_admin_ids(value)
+    logger.info('Loaded %d bot admin IDs', len(_admin_ids))
+    return _admin_ids
+
+
+def get_admin_ids() -> frozenset:
+    """
+    Get admin IDs loaded at bot startup.
+    """
+    return _admin_ids
+
+
+async def watch_admin_ids() -> None:
+    """
+    Reload admin IDs when the bot process gets SIGHUP.
+    """
+    if RELOAD_SIGNAL is not None:
+        asyncio.get_running_loop().add_signal_handler(RELOAD_SIGNAL,
+                                                      load_admin_ids)
+
+
+async def unwatch_admin_ids() -> None:
+    if RELOAD_SIGNAL is not None:
+        asyncio.get_running_loop().remove_signal_handler(RELOAD_SIGNAL)
+
+
+class AdminMiddleware(BaseMiddleware):
+    """
+    Pass 'is_admin' flag of the event user to handlers.
+    """
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any],
+    ) -> Any:
+        user = data.get('event_from_user')
+        data['is_admin'] = user is not None and user.id in _admin_ids
+        return await handler(event, data)
@@ -1,9 +1,18 @@
 import logging
 
 from aiogram import Bot, Dispatcher, F
+from aiogram.client.session.aiohttp import AiohttpSession
+from aiogram.client.telegram import TelegramAPIServer
 from aiogram.filters import Command
+from aiogram.webhook.aiohttp_server import setup_application
+from aiohttp import web
+from django.conf import settings
 
+from .admins import (AdminMiddleware, load_admin_ids, unwatch_admin_ids,
+                     watch_admin_ids)
+from .storage import get_storage
 from .utils.commands import set_commands
+from .webhook import BoundedRequestHandler, CONCURRENCY, DRAIN_TIMEOUT
 from .states.create_account import CreateAccountState
 from .states.reset_password import ResetPasswordState
 from .states.create_booking import BookingState
@@ -34,9 +43,19 @@ class BookingBot:
         level=logging.INFO
     )
 
-    def __init__(self, token: str):
-        self.bot = Bot(token=token, parse_mode='HTML')
-        self.dp = Dispatcher()
+    def __init__(self, token: str, api_url: str = None):
+        # api_url points the bot to another Bot API server (e.g. a fake one)
+        session = AiohttpSession(
+            api=TelegramAPIServer.from_base(api_url)
+        ) if api_url else None
+        self.bot = Bot(token=token, parse_mode='HTML', session=session)
+        self.dp = Dispatcher(storage=get_storage(
+            settings.TG_FSM_STORAGE, settings.TG_FSM_TTL
+        ))
+        self.webhook_handler = None
+        # resolved once, handlers get 'is_admin' flag from the middleware
+        load_admin_ids()
+        self.dp.message.outer_middleware(AdminMiddleware())
 
     def _setup(self):
         self.dp.message.register(Start.handle, Command(commands='start'))
@@ -228,9 +247,84 @@ class BookingBot:
         )
 
     async def run(self):
+        """
+        Run the bot in long-polling mode.
+        """
         self._setup()
+        self.dp.startup.register(watch_admin_ids)
+        self.dp.shutdown.register(unwatch_admin_ids)
         await set_commands(self.bot)
+        # polling doesn't work while a webhook is set
+        await self.bot.delete_webhook()
         try:
-            await self.dp.start_polling(self.bot, skip_updates=True)
+            await self.dp.start_polling(self.bot)
         finally:
             await self.bot.session.close()
+            await self.dp.storage.close()
+
+    def get_webhook_app(self, path: str, secret: str = None,
+                        concurrency: int = CONCURRENCY,
+                        drain_timeout: float = DRAIN_TIMEOUT,
+                        ) -> web.Application:
+        """
+        Build aiohttp application which receives updates on the path.
+
+        Args:
+            path (str): Webhook route (e.g. '/tg/webhook/').
+            secret (str, optional): Secret token of webhook requests.
+            concurrency (int): Max count of concurrent update handlers.
+            drain_timeout (float): Seconds to finish running handlers
+             on shutdown.
+
+        Returns:
+            web.Application: Webhook application.
+        """
+        self._setup()
+        app = web.Application()
+        self.webhook_handler = BoundedRequestHandler(
+            self.dp,
+            self.bot,
+            concurrency=concurrency,
+            drain_timeout=drain_timeout,
+            secret_token=secret,
+        )
+        self.webhook_handler.register(app, path=path)
+        setup_application(app, self.dp, bot=self.bot)
+        return app
+
+    def run_webhook(self, url: str, path: str, host: str, port: int,
+                    secret: str = None, concurrency: int = CONCURRENCY,
+                    drain_timeout: float = DRAIN_TIMEOUT) -> None:
+        """
+        Run the bot in webhook mode. The webhook is kept on shutdown, so
+         Telegram queues updates while the bot restarts.
+
+        Args:
+            url (str): Public base url of the bot (e.g. 'https://btr.ru').
+            path (str): Webhook route.
+            host (str): Interface to listen.
+            port (int): Port to listen.
+            secret (str, optional): Secret token of webhook requests.
+            concurrency (int): Max count of concurrent update handlers.
+            drain_timeout (float): Seconds to finish running handlers
+             on shutdown.
+        """
+        async def on_startup(bot: Bot) -> None:
+            await set_commands(bot)
+            await bot.set_webhook(
+                url.rstrip('/') + path,
+                secret_token=secret,
+                max_connections=concurrency,
+                allowed_updates=self.dp.resolve_used_update_types(),
+            )
+
+        async def on_shutdown() -> None:
+            await self.dp.storage.close()
+
+        self.dp.startup.register(on_startup)
+        self.dp.startup.register(watch_admin_ids)
+        self.dp.shutdown.register(on_shutdown)
+        self.dp.shutdown.register(unwatch_admin_ids)
+        app = self.get_webhook_app(path, secret, concurrency, drain_timeout)
+        web.run_app(app, host=host, port=port,
+                    shutdown_timeout=drain_timeout)
@@ -0,0 +1,121 @@
+import asyncio
+import itertools
+import time
+from typing import Any, Dict, List
+
+from aiohttp import ClientSession, web
+
+
+class FakeTelegramServer:
+    """
+    Local Telegram Bot API answering every method call with a successful
+     result and recording the calls, for throughput tests of the bot.
+
+    Example:
+        server = FakeTelegramServer()
+        runner = web.AppRunner(server.make_app())
+        ...
+        bot = BookingBot(token, api_url='http://127.0.0.1:8082')
+    """
+
+    def __init__(self, latency: float = 0.0):
+        # simulated round trip of every api call in seconds
+        self.latency = latency
+        self.calls: List[tuple] = []
+        self.message_ids = itertools.count(1)
+        self.sent = asyncio.Event()
+        self.expected = 0
+        # concurrent api calls
+        self.active = 0
+        self.max_active = 0
+
+    def make_app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_post('/bot{token}/{method}', self.handle)
+        return app
+
+    async def handle(self, request: web.Request) -> web.Response:
+        method = request.match_info['method']
+        data = dict(await request.post())
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            if self.latency:
+                await asyncio.sleep(self.latency)
+        finally:
+            self.active -= 1
+        self.calls.append((method, data))
+        if self.expected and len(self.get_calls('sendMessage')) >= \
+                self.expected:
+            self.sent.set()
+        return web.json_response({
+            'ok': True,
+            'result': self.get_result(method, data),
+        })
+
+    def get_calls(self, method: str) -> List[dict]:
+        return [data for name, data in self.calls if name == method]
+
+    def get_result(self, method: str, data: dict) -> Any:
+        if method in ('sendMessage', 'editMessageText'):
+            return {
+                'message_id': next(self.message_ids),
+                'date': int(time.time()),
+                'chat': {'id': int(data.get('chat_id', 0)),
+                         'type': 'private'},
+                'text': data.get('text', ''),
+            }
+        return True
+
+    async def wait_messages(self, count: int, timeout: float) -> None:
+        """
+        Wait until the bot sent the count of messages.
+        """
+        self.expected = count
+        if len(self.get_calls('sendMessage')) < count:
+            await asyncio.wait_for(self.sent.wait(), timeout)
+
+    @staticmethod
+    def make_update(update_id: int, user_id: int,
+                    text: str = '/start') -> Dict[str, Any]:
+        user = {'id': user_id, 'is_bot': False, 'first_name': 'Rider'}
+        entities = [{'type': 'bot_command', 'offset': 0,
+                     'length': len(text)}] if text.startswith('/') else []
+        return {
+            'update_id': update_id,
+            'message': {
+                'message_id': update_id,
+                'date': int(time.time()),
+                'chat': {'id': user_id, 'type': 'private'},
+                'from': user,
+                'text': text,
+                'entities': entities,
+            },
+        }
+
+    @staticmethod
+    async def send_updates(url: str, updates: List[dict],
+                           connections: int = 40,
+                           secret: str = None) -> List[int]:
+        """
+        Deliver updates to the webhook like Telegram does, with a limited
+         count of parallel connections.
+
+        Returns:
+            list: Response status of every update.
+        """
+        headers = {'X-Telegram-Bot-Api-Secret-Token': secret} if secret \
+            else {}
+        queue = iter(updates)
+        statuses = []
+
+        async def worker(session: ClientSession) -> None:
+            for update in queue:
+                async with session.post(url, json=update,
+                                        headers=headers) as response:
+                    statuses.append(response.status)
+
+        async with ClientSession() as session:
+            await asyncio.gather(*(worker(session)
+                                   for _i in range(connections)))
+        return statuses
@@ -6,11 +6,11 @@ from aiogram.types import Message
 from django.utils.translation import gettext as _
 
 from btr.orm_utils import AsyncTools
-from ...utils.handlers import check_admin_access, get_emoji_for_status, \
-    json_filter, vk_notify, mail_notify
+from ...utils.handlers import get_emoji_for_status, vk_notify, mail_notify
 from ...keyboards.kb_cancel import CancelKB
 from ...keyboards.kb_dialog import DialogKB
 from ...states.admin.change_status import ChangeStatusState
+from ...utils import exceptions as e
 from ...utils.decorators import validators
 from ...utils.validators import validate_id, validate_status
 
@@ -18,11 +18,12 @@ from ...utils.validators import validate_id, validate_status
 class ChangeStatus:
 
     @staticmethod
-    async def ask_id(message: Message, state: FSMContext, bot: Bot):
+    async def ask_id(message: Message, state: FSMContext, bot: Bot,
+                     is_admin: bool = False):
         user_id = message.from_user.id
         user_name = message.from_user.first_name
         kb = CancelKB().place()
-        if check_admin_access(user_id):
+        if is_admin:
             msg = _(
                 '🙋🏼‍♂️<em>Hi, <strong>{admin}</strong>!\n\n'
                 'Let\'s change booking status!\n\n'
@@ -78,7 +79,7 @@ class ChangeStatus:
         ).format(id=pk)
         await bot.send_message(user_id, msg, reply_markup=kb)
         await bot.send_message(user_id, msg2, reply_markup=kb_reply)
-        await state.update_data(pk=pk, status_kb=kb_reply,
+        await state.update_data(pk=pk, kb=changeable_status,
                                 booking_info=booking_info, user_info=user_info)
         await state.set_state(ChangeStatusState.bookingStatus)
 
@@ -93,8 +94,18 @@ class ChangeStatus:
         user_info = data.get('user_info')
         pk = data.get('pk')
         old_status = booking_info.get('status')
-        await AsyncTools().change_booking_status(status, pk)
-        clean_data = json_filter(data)
+        try:
+            await AsyncTools().change_booking_status(status, pk)
+        except e.TimeIsNotAvailable:
+            msg = _(
+                '🔴🔴🔴\n\n'
+                '<em><strong>Booking #{id} can\'t be {status}!</strong>\n\n'
+                'Its time is already booked.</em>'
+            ).format(id=pk, status=status)
+            await bot.send_message(user_id, msg)
+            await state.clear()
+            return
+        clean_data = dict(data)
         clean_data.update(booking_info)
         clean_data.update(user_info)
         clean_data['pk'] = pk
@@ -10,16 +10,17 @@ from ...keyboards.kb_cancel import CancelKB
 from ...states.admin.check_booking import CheckBookingState
 from ...utils.decorators import validators
 from ...utils.validators import validate_id
-from ...utils.handlers import check_admin_access, get_emoji_for_status
+from ...utils.handlers import get_emoji_for_status
 
 
 class CheckBooking:
 
     @staticmethod
-    async def ask_id(message: Message, state: FSMContext, bot: Bot):
+    async def ask_id(message: Message, state: FSMContext, bot: Bot,
+                     is_admin: bool = False):
         user_id = message.from_user.id
         user_name = message.from_user.first_name
-        if check_admin_access(user_id):
+        if is_admin:
             msg = _(
                 '🙋🏼‍♂️<em>Hi, <strong>{admin}</strong>!\n\n'
                 'To see full booking info type an '
@@ -10,11 +10,11 @@ from ...states.admin.foreign_book import ForeignBookingState
 from ...keyboards.kb_cancel import CancelKB
 from ...keyboards.kb_dialog import DialogKB
 from ...utils.decorators import validators
-from ...utils.handlers import (check_admin_access, extract_start_times,
-                               check_available_start_time,
+from ...utils.handlers import (extract_start_times, check_available_start_time,
                                get_slots_for_bot_view, extract_hours,
                                get_end_time, check_available_hours,
-                               friendly_formatted_date, json_filter, vk_notify)
+                               friendly_formatted_date, vk_notify,
+                               get_bikes_options)
 from ...utils.validators import (validate_bike_quantity,
                                  validate_phone_number,
                                  validate_date, validate_time,
@@ -24,10 +24,11 @@ from ...utils.validators import (validate_bike_quantity,
 class ForeignBook:
 
     @staticmethod
-    async def ask_bikes(message: Message, state: FSMContext, bot: Bot):
+    async def ask_bikes(message: Message, state: FSMContext, bot: Bot,
+                        is_admin: bool = False):
         user_id = message.from_user.id
         user_name = message.from_user.first_name
-        if check_admin_access(user_id):
+        if is_admin:
             msg = _(
                 '🙋🏼‍♂️<em>Hi, <strong>{admin}</strong>!\n\n'
                 'Let\'s book unregistered rider!\n\n'
@@ -36,12 +37,12 @@ class ForeignBook:
             msg2 = _(
                 '<em>Choose value from options⤵️</em>'
             )
-            bikes = ['1', '2', '3', '4']
+            bikes = get_bikes_options()
             kb_cancel = CancelKB().place()
             kb_reply = DialogKB(bikes).place()
             await bot.send_message(user_id, msg, reply_markup=kb_cancel)
             await bot.send_message(user_id, msg2, reply_markup=kb_reply)
-            await state.update_data(bikes_kb=kb_reply)
+            await state.update_data(kb=bikes)
             await state.set_state(ForeignBookingState.outBikes)
         else:
             msg = _(
@@ -98,10 +99,14 @@ class ForeignBook:
         friendly_date = AsyncTools().get_friendly_date(
             friendly_formatted_date(date)
         )
+        data = await state.get_data()
         s = SlotsFinder(date)
-        free_slots: list = await s.find_available_slots_as()
+        free_slots: list = await s.find_free_intervals_as(
+            bikes=int(data.get('bikes'))
+        )
         if free_slots:
-            starts = extract_start_times(free_slots)
+            starts = extract_start_times(free_slots,
+                                         await s.get_policy_as())
             kb_reply = DialogKB(starts).place()
             slots_view = get_slots_for_bot_view(free_slots)
             msg = _(
@@ -117,8 +122,8 @@ class ForeignBook:
             await bot.send_message(user_id, msg2, reply_markup=kb_reply)
             await state.update_data(
                 date=date,
-                starts_kb=kb_reply,
-                slots=slots_view,
+                kb=starts,
+                slots_list=free_slots,
                 friendly_date=friendly_date
             )
             await state.set_state(ForeignBookingState.outStart)
@@ -140,9 +145,11 @@ class ForeignBook:
         date = data.get('date')
         validate_time(start)
         s = SlotsFinder(date)
-        free_slots: list = await s.find_available_slots_as()
+        free_slots: list = await s.find_free_intervals_as(
+            bikes=int(data.get('bikes'))
+        )
         check_available_start_time(start, free_slots)
-        hours = extract_hours(free_slots, start)
+        hours = extract_hours(free_slots, start, await s.get_policy_as())
         msg = _(
             '🟢🟢🟢\n\n'
             '<em><strong>Ok!</strong>\n\n'
@@ -153,7 +160,7 @@ class ForeignBook:
         kb_reply = DialogKB(hours).place()
         await bot.send_message(user_id, msg, reply_markup=kb)
         await bot.send_message(user_id, msg2, reply_markup=kb_reply)
-        await state.update_data(start=start, hours_kb=kb_reply)
+        await state.update_data(start=start, kb=hours)
         await state.set_state(ForeignBookingState.outHours)
 
     @staticmethod
@@ -168,14 +175,17 @@ class ForeignBook:
         start = data.get('start')
         end = get_end_time(start, hours)
         s = SlotsFinder(date)
-        free_slots = await s.find_available_slots_as()
+        free_slots = await s.find_free_intervals_as(
+            bikes=int(data.get('bikes'))
+        )
         validate_time_range(start, end)
-        check_available_hours(start, hours, free_slots)
+        check_available_hours(start, hours, free_slots,
+                              await s.get_policy_as())
         admin = await AsyncTools().get_user_info(username='admin')
         data['end'] = end
         data['pk'] = admin.get('pk')
         pk = await AsyncTools().make_booking(data, is_admin=True)
-        clean_data = json_filter(data)
+        clean_data = dict(data)
         clean_data['pk'] = pk
         clean_data['date'] = friendly_date
         clean_data['username'] = 'admin'
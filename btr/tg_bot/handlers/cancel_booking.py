@@ -88,7 +88,7 @@ class CancelRide:
             )
             await bot.send_message(user_id, msg, reply_markup=kb)
             await bot.send_message(user_id, msg2, reply_markup=kb_reply)
-            await state.update_data(pks=bookings_id, ids_kb=kb_reply)
+            await state.update_data(pks=bookings_id, kb=bookings_id)
             await state.set_state(BookCancelState.pk)
 
     @staticmethod
@@ -113,8 +113,7 @@ class CancelRide:
         )
         await bot.send_message(user_id, msg, reply_markup=kb)
         await bot.send_message(user_id, msg2, reply_markup=kb_reply)
-        await state.update_data(pk=pk, confirm_kb=kb_reply,
-                                booking_info=booking_info)
+        await state.update_data(pk=pk, kb=confirm, booking_info=booking_info)
         await state.set_state(BookCancelState.confirm)
 
     @staticmethod
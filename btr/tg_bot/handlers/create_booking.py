@@ -15,8 +15,8 @@ from ...orm_utils import AsyncTools, SlotsFinder
 from ..utils.handlers import (get_slots_for_bot_view, extract_start_times,
                               check_available_start_time,
                               extract_hours, get_end_time,
-                              check_available_hours, vk_notify, json_filter,
-                              mail_notify, friendly_formatted_date)
+                              check_available_hours, vk_notify, mail_notify,
+                              friendly_formatted_date, get_bikes_options)
 
 
 class BookingRide:
@@ -41,7 +41,7 @@ class BookingRide:
         kb = CancelKB().place()
         validate_email(email)
         user_info = await AsyncTools().get_user_info(email=email)
-        bikes = ['1', '2', '3', '4']
+        bikes = get_bikes_options()
         msg = _(
             '🟢🟢🟢\n\n'
             '<em>User with email <strong>{email}</strong>\n'
@@ -52,8 +52,7 @@ class BookingRide:
         kb_reply = DialogKB(bikes).place()
         await bot.send_message(user_id, msg, reply_markup=kb)
         await bot.send_message(user_id, msg2, reply_markup=kb_reply)
-        await state.update_data(email=email, bikes_kb=kb_reply,
-                                user_info=user_info)
+        await state.update_data(email=email, kb=bikes, user_info=user_info)
         await state.set_state(BookingState.bookBikes)
 
     @staticmethod
@@ -81,13 +80,17 @@ class BookingRide:
         user_id = message.from_user.id
         kb = CancelKB().place()
         validate_date(date)
+        data = await state.get_data()
         s = SlotsFinder(date)
-        free_slots: list = await s.find_available_slots_as()
+        free_slots: list = await s.find_free_intervals_as(
+            bikes=int(data.get('bikes'))
+        )
         friendly_date = AsyncTools().get_friendly_date(
             friendly_formatted_date(date)
         )
         if free_slots:
-            starts = extract_start_times(free_slots)
+            starts = extract_start_times(free_slots,
+                                         await s.get_policy_as())
             slots_view = get_slots_for_bot_view(free_slots)
             msg = _(
                 '🟢🟢🟢\n\n'
@@ -104,8 +107,7 @@ class BookingRide:
             await state.update_data(
                 date=date,
                 friendly_date=friendly_date,
-                starts_kb=kb_reply,
-                slots=slots_view,
+                kb=starts,
                 slots_list=free_slots,
             )
             await state.set_state(BookingState.bookStart)
@@ -127,7 +129,8 @@ class BookingRide:
         slots_list = data.get('slots_list')
         validate_time(start)
         check_available_start_time(start, slots_list)
-        hours = extract_hours(slots_list, start)
+        policy = await SlotsFinder(data.get('date')).get_policy_as()
+        hours = extract_hours(slots_list, start, policy)
         msg = _(
             '🟢🟢🟢\n\n'
             '<em><strong>Ok!</strong>\n\n'
@@ -138,7 +141,7 @@ class BookingRide:
         kb_reply = DialogKB(hours).place()
         await bot.send_message(user_id, msg, reply_markup=kb)
         await bot.send_message(user_id, msg2, reply_markup=kb_reply)
-        await state.update_data(start=start, hours_kb=kb_reply)
+        await state.update_data(start=start, kb=hours)
         await state.set_state(BookingState.bookHours)
 
     @staticmethod
@@ -153,17 +156,17 @@ class BookingRide:
         friendly_date = data.get('friendly_date')
         end = get_end_time(start, hours)
         validate_time_range(start, end)
-        check_available_hours(start, hours, slots_list)
+        policy = await SlotsFinder(data.get('date')).get_policy_as()
+        check_available_hours(start, hours, slots_list, policy)
         data['end'] = end
         data['name'] = name
         user_info = data.get('user_info')
         data.update(user_info)
         data['status'] = _('pending')
         data['pk'] = await AsyncTools().make_booking(data)
-        clean_data = json_filter(data)
-        clean_data['date'] = friendly_date
-        vk_notify(False, True, **clean_data)
-        mail_notify('booking_details', **clean_data)
+        notify_data = {**data, 'date': friendly_date}
+        vk_notify(False, True, **notify_data)
+        mail_notify('booking_details', **notify_data)
         msg = _(
             '🎉🎉🎉\n\n'
             '<em><strong>Booking created successfully!</strong>\n\n'
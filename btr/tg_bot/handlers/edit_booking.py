@@ -10,7 +10,7 @@ from ..states.edit_booking import EditBookingState
 from ..utils.handlers import (extract_start_times, get_slots_for_bot_view,
                               extract_hours, check_available_start_time,
                               get_end_time, check_available_hours, get_hours,
-                              json_filter, vk_notify, mail_notify)
+                              vk_notify, mail_notify, get_bikes_options)
 from ..utils.validators import (validate_email, validate_pks, validate_time,
                                 validate_bike_quantity, validate_time_range,
                                 validate_id, validate_hours)
@@ -93,7 +93,7 @@ class EditBooking:
             )
             await bot.send_message(user_id, msg, reply_markup=kb)
             await bot.send_message(user_id, msg2, reply_markup=kb_reply)
-            await state.update_data(pks=bookings_id, ids_kb=kb_reply)
+            await state.update_data(pks=bookings_id, kb=bookings_id)
             await state.set_state(EditBookingState.pk)
 
     @staticmethod
@@ -110,13 +110,12 @@ class EditBooking:
         user_id = message.from_user.id
         kb = CancelKB().place()
         s = SlotsFinder(date)
-        email = data.get('email')
-        excluded: tuple = await AsyncTools().get_excluded_slot(email, date)
-        free_slots: list = await s.find_available_slots_as(
-            excluded_slot=excluded
+        free_slots: list = await s.find_free_intervals_as(
+            bikes=int(booking_info.get('bikes')), excluded_pk=int(pk)
         )
         if free_slots:
-            starts = extract_start_times(free_slots)
+            starts = extract_start_times(free_slots,
+                                         await s.get_policy_as())
             starts.append(EditBooking.unchanged_btn[-1])
             slots_view = get_slots_for_bot_view(free_slots)
             msg = _(
@@ -134,8 +133,7 @@ class EditBooking:
             await state.update_data(
                 date=date,
                 friendly_date=friendly_date,
-                starts_kb=kb_reply,
-                slots=slots_view,
+                kb=starts,
                 slots_list=free_slots,
                 booking_info=booking_info,
                 pk=pk,
@@ -163,7 +161,8 @@ class EditBooking:
         friendly_date = data.get('friendly_date')
         validate_time(start)
         check_available_start_time(start, slots_list)
-        hours = extract_hours(slots_list, start)
+        policy = await SlotsFinder(data.get('date')).get_policy_as()
+        hours = extract_hours(slots_list, start, policy)
         if start == canonical_start:
             hours.append(EditBooking.unchanged_btn[-1])
         msg = _(
@@ -176,7 +175,7 @@ class EditBooking:
         kb_reply = DialogKB(hours).place()
         await bot.send_message(user_id, msg, reply_markup=kb)
         await bot.send_message(user_id, msg2, reply_markup=kb_reply)
-        await state.update_data(start=start, hours_kb=kb_reply)
+        await state.update_data(start=start, kb=hours)
         await state.set_state(EditBookingState.end)
 
     @staticmethod
@@ -196,11 +195,18 @@ class EditBooking:
         else:
             end = canonical_end
             hours = get_hours(start, end)
-        bikes = ['1', '2', '3', '4', _('Unchanged')]
-        kb_reply = DialogKB(bikes).place()
         slots_list = data.get('slots_list')
         validate_time_range(start, end)
-        check_available_hours(start, hours, slots_list)
+        s = SlotsFinder(data.get('date'))
+        # the booked time is kept even if the policy has changed since
+        unchanged = (start, end) == (booking_info.get('start'), canonical_end)
+        policy = None if unchanged else await s.get_policy_as()
+        check_available_hours(start, hours, slots_list, policy)
+        free_bikes = await s.find_free_bikes_as(
+            start, end, excluded_pk=int(data.get('pk'))
+        )
+        bikes = get_bikes_options(free_bikes) + [_('Unchanged')]
+        kb_reply = DialogKB(bikes).place()
         msg = _(
             '🟢🟢🟢\n\n'
             '<em><strong>Ok!</strong>\n'
@@ -213,7 +219,7 @@ class EditBooking:
         )
         await bot.send_message(user_id, msg, reply_markup=kb)
         await bot.send_message(user_id, msg2, reply_markup=kb_reply)
-        await state.update_data(end=end, bikes_kb=kb_reply, hours=hours)
+        await state.update_data(end=end, kb=bikes, hours=hours)
         await state.set_state(EditBookingState.bikes)
 
     @staticmethod
@@ -232,12 +238,14 @@ class EditBooking:
         friendly_date = data.get('friendly_date')
         await AsyncTools().edit_booking(**data)
         data.update(user_info)
-        clean_data = json_filter(data)
-        clean_data['date'] = friendly_date
-        clean_data['pk'] = pk
-        clean_data['status'] = _('pending')
-        vk_notify(False, False, **clean_data)
-        mail_notify('self_booking_edit', **clean_data)
+        notify_data = {
+            **data,
+            'date': friendly_date,
+            'pk': pk,
+            'status': _('pending'),
+        }
+        vk_notify(False, False, **notify_data)
+        mail_notify('self_booking_edit', **notify_data)
         msg = _(
             '🎉🎉🎉\n\n'
             '<em><strong>Booking #{pk} successfully edited!</strong>\n\n'
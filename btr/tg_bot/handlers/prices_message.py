@@ -24,16 +24,17 @@ class Prices:
         '💰 2500₽ / hour'
         '</strong>'
     )
-    _kb = InlineMenuKB().place()
 
     @staticmethod
     async def handle(message: Message, bot: Bot):
         user_id = message.from_user.id
-        await bot.send_message(user_id, Prices._msg, reply_markup=Prices._kb)
+        kb = InlineMenuKB().place()
+        await bot.send_message(user_id, Prices._msg, reply_markup=kb)
 
     @staticmethod
     async def callback_handle(call: CallbackQuery, state: FSMContext):
+        kb = InlineMenuKB().place()
         await call.message.edit_reply_markup(reply_markup=None)
-        await call.message.answer(Prices._msg, reply_markup=Prices._kb)
+        await call.message.answer(Prices._msg, reply_markup=kb)
         await call.answer()
         await state.clear()
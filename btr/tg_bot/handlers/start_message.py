@@ -19,16 +19,17 @@ class Start:
         '📱 <strong>Get our contacts</strong>\n\n'
         'broteamracing.ru'
     )
-    _kb = InlineMenuKB().place_to_start()
 
     @staticmethod
     async def handle(message: Message, bot: Bot):
         user_id = message.from_user.id
-        await bot.send_message(user_id, Start._msg, reply_markup=Start._kb)
+        kb = InlineMenuKB().place_to_start()
+        await bot.send_message(user_id, Start._msg, reply_markup=kb)
 
     @staticmethod
     async def callback_handle(call: CallbackQuery, state: FSMContext):
+        kb = InlineMenuKB().place_to_start()
         await call.message.edit_reply_markup(reply_markup=None)
-        await call.message.answer(Start._msg, reply_markup=Start._kb)
+        await call.message.answer(Start._msg, reply_markup=kb)
         await call.answer()
         await state.clear()
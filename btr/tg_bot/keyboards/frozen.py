@@ -0,0 +1,18 @@
+from aiogram.types import InlineKeyboardMarkup, ReplyKeyboardMarkup
+from pydantic import ConfigDict
+
+
+class FrozenInlineKeyboardMarkup(InlineKeyboardMarkup):
+    """
+    Inline keyboard shared by all handlers, assignment raises an error.
+    """
+
+    model_config = ConfigDict(frozen=True)
+
+
+class FrozenReplyKeyboardMarkup(ReplyKeyboardMarkup):
+    """
+    Reply keyboard shared by all handlers, assignment raises an error.
+    """
+
+    model_config = ConfigDict(frozen=True)
@@ -1,36 +1,51 @@
+from functools import lru_cache
+
 from aiogram.utils.keyboard import InlineKeyboardBuilder
-from django.utils.translation import gettext as _
+from django.utils.translation import get_language, gettext as _
+
+from .frozen import FrozenInlineKeyboardMarkup
+
+
+@lru_cache(maxsize=None)
+def get_menu_markup(language: str,
+                    start: bool = False) -> FrozenInlineKeyboardMarkup:
+    """
+    Build the main menu keyboard once per language.
+
+    Args:
+        language (str): Active language code, the cache key.
+        start (bool): Menu of the start message, with prices button
+         instead of main menu one.
+
+    Returns:
+        FrozenInlineKeyboardMarkup: Shared keyboard.
+    """
+    kb = InlineKeyboardBuilder()
+    items = {
+        _('Book a ride'): 'book',
+        _('See help'): 'help',
+        _('Create account'): 'create',
+        _('Reset password'): 'reset',
+        _('Cancel booking'): 'cancel',
+        _('Edit booking'): 'edit',
+    }
+    if start:
+        items[_('See prices')] = 'price'
+    else:
+        items[_('Main menu')] = 'start'
+    for item, callback in items.items():
+        kb.button(
+            text=item,
+            callback_data=callback,
+        )
+    kb.adjust(2)
+    return FrozenInlineKeyboardMarkup(inline_keyboard=kb.export())
 
 
 class InlineMenuKB:
 
-    def __init__(self):
-        self.kb = InlineKeyboardBuilder()
-        self.items = {
-            _('Book a ride'): 'book',
-            _('See help'): 'help',
-            _('Create account'): 'create',
-            _('Reset password'): 'reset',
-            _('Cancel booking'): 'cancel',
-            _('Edit booking'): 'edit',
-        }
-
-    def place(self):
-        self.items[_('Main menu')] = 'start'
-        for item, callback in self.items.items():
-            self.kb.button(
-                text=item,
-                callback_data=callback,
-            )
-        self.kb.adjust(2)
-        return self.kb.as_markup()
-
-    def place_to_start(self):
-        self.items[_('See prices')] = 'price'
-        for item, callback in self.items.items():
-            self.kb.button(
-                text=item,
-                callback_data=callback,
-            )
-        self.kb.adjust(2)
-        return self.kb.as_markup()
+    def place(self) -> FrozenInlineKeyboardMarkup:
+        return get_menu_markup(get_language())
+
+    def place_to_start(self) -> FrozenInlineKeyboardMarkup:
+        return get_menu_markup(get_language(), start=True)
@@ -1,17 +1,32 @@
+from functools import lru_cache
+
 from aiogram.utils.keyboard import InlineKeyboardBuilder, InlineKeyboardButton
-from django.utils.translation import gettext as _
+from django.utils.translation import get_language, gettext as _
+
+from .frozen import FrozenInlineKeyboardMarkup
+
+
+@lru_cache(maxsize=None)
+def get_cancel_markup(language: str) -> FrozenInlineKeyboardMarkup:
+    """
+    Build the cancel dialog keyboard once per language.
+
+    Args:
+        language (str): Active language code, the cache key.
+
+    Returns:
+        FrozenInlineKeyboardMarkup: Shared keyboard.
+    """
+    kb = InlineKeyboardBuilder()
+    kb.add(InlineKeyboardButton(
+        text=_('Cancel dialog'),
+        callback_data='cancel-dialog',
+    ))
+    kb.adjust(1)
+    return FrozenInlineKeyboardMarkup(inline_keyboard=kb.export())
 
 
 class CancelKB:
 
-    def __init__(self):
-        self.kb = InlineKeyboardBuilder()
-        self.cancel_button = InlineKeyboardButton(
-            text=_('Cancel dialog'),
-            callback_data='cancel-dialog',
-        )
-
-    def place(self):
-        self.kb.add(self.cancel_button)
-        self.kb.adjust(1)
-        return self.kb.as_markup()
+    def place(self) -> FrozenInlineKeyboardMarkup:
+        return get_cancel_markup(get_language())
@@ -1,13 +1,36 @@
-from aiogram.types import KeyboardButton, ReplyKeyboardMarkup
+from functools import lru_cache
+from typing import Tuple
+
+from aiogram.types import KeyboardButton
+
+from .frozen import FrozenReplyKeyboardMarkup
+
+
+# start times and hours differ by day, keep the recent option sets only
+DIALOG_CACHE_SIZE = 256
+
+
+@lru_cache(maxsize=DIALOG_CACHE_SIZE)
+def get_dialog_markup(buttons: Tuple[str, ...]) -> FrozenReplyKeyboardMarkup:
+    """
+    Build a one row reply keyboard once per button set.
+
+    Args:
+        buttons (tuple): Button labels, already translated.
+
+    Returns:
+        FrozenReplyKeyboardMarkup: Shared keyboard.
+    """
+    return FrozenReplyKeyboardMarkup(
+        keyboard=[[KeyboardButton(text=button) for button in buttons]],
+        one_time_keyboard=True,
+        resize_keyboard=True,
+    )
 
 
 class DialogKB:
     def __init__(self, buttons: list):
-        self.buttons = [[KeyboardButton(text=button) for button in buttons]]
-
-    def place(self) -> ReplyKeyboardMarkup:
-        return ReplyKeyboardMarkup(
-            keyboard=self.buttons,
-            one_time_keyboard=True,
-            resize_keyboard=True,
-        )
+        self.buttons = tuple(map(str, buttons))
+
+    def place(self) -> FrozenReplyKeyboardMarkup:
+        return get_dialog_markup(self.buttons)
@@ -0,0 +1,28 @@
+# Generated by Django 4.2.6 on 2026-10-18 12:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BotState',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=255, unique=True, verbose_name='Key')),
+                ('state', models.CharField(blank=True, max_length=100, null=True, verbose_name='State')),
+                ('data', models.JSONField(blank=True, default=dict, verbose_name='Data')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Updated at')),
+            ],
+            options={
+                'verbose_name': 'Bot state',
+                'verbose_name_plural': 'Bot states',
+            },
+        ),
+    ]
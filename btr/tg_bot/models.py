@@ -0,0 +1,38 @@
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+
+class BotState(models.Model):
+    """
+    FSM state and data of a bot dialog, used by the database FSM storage.
+
+    Data holds only json primitives, keyboards are rebuilt from it.
+    """
+
+    key = models.CharField(
+        max_length=255,
+        unique=True,
+        verbose_name=_('Key'),
+    )
+    state = models.CharField(
+        max_length=100,
+        null=True,
+        blank=True,
+        verbose_name=_('State'),
+    )
+    data = models.JSONField(
+        default=dict,
+        blank=True,
+        verbose_name=_('Data'),
+    )
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name=_('Updated at'),
+    )
+
+    class Meta:
+        verbose_name = _('Bot state')
+        verbose_name_plural = _('Bot states')
+
+    def __str__(self) -> str:
+        return f'{self.key}: {self.state}'
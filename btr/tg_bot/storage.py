@@ -0,0 +1,131 @@
+from datetime import timedelta
+from typing import Any, Dict, Optional
+
+from aiogram.fsm.state import State
+from aiogram.fsm.storage.base import BaseStorage, StateType, StorageKey
+from aiogram.fsm.storage.memory import MemoryStorage
+from aiogram.fsm.storage.redis import RedisStorage
+from django.conf import settings
+from django.utils import timezone
+
+from .models import BotState
+
+
+MEMORY = 'memory'
+REDIS = 'redis'
+DATABASE = 'db'
+
+# redis database of the bot, 0 is the broker and 1 is the cache
+REDIS_DB = 2
+
+
+class DjangoStorage(BaseStorage):
+    """
+    FSM storage keeping dialogs in the database, so they survive bot
+     restarts and are shared by every bot process.
+
+    A row is deleted when its dialog is cleared. Rows not updated for
+     ttl seconds are treated as empty and are replaced by the next write,
+     abandoned ones are deleted by the purge_bot_states task.
+    """
+
+    def __init__(self, ttl: Optional[int] = None):
+        self.ttl = ttl
+
+    @staticmethod
+    def build_key(key: StorageKey) -> str:
+        parts = [key.bot_id, key.chat_id, key.user_id]
+        if key.thread_id:
+            parts.append(key.thread_id)
+        parts.append(key.destiny)
+        return ':'.join(map(str, parts))
+
+    async def get_row(self, key: StorageKey) -> Optional[BotState]:
+        rows = BotState.objects.filter(key=self.build_key(key))
+        if self.ttl:
+            expired = timezone.now() - timedelta(seconds=self.ttl)
+            rows = rows.filter(updated_at__gt=expired)
+        return await rows.afirst()
+
+    async def delete_expired(self, k: str) -> None:
+        # a write would refresh updated_at and revive the other column
+        if self.ttl:
+            expired = timezone.now() - timedelta(seconds=self.ttl)
+            await BotState.objects.filter(
+                key=k, updated_at__lte=expired
+            ).adelete()
+
+    async def set_state(self, key: StorageKey, state: StateType = None):
+        state = state.state if isinstance(state, State) else state
+        k = self.build_key(key)
+        await self.delete_expired(k)
+        if state is None:
+            await BotState.objects.filter(key=k, data={}).adelete()
+            await BotState.objects.filter(key=k).aupdate(
+                state=None, updated_at=timezone.now()
+            )
+        else:
+            await BotState.objects.aupdate_or_create(
+                key=k, defaults={'state': state}
+            )
+
+    async def get_state(self, key: StorageKey) -> Optional[str]:
+        row = await self.get_row(key)
+        return row.state if row else None
+
+    async def set_data(self, key: StorageKey, data: Dict[str, Any]) -> None:
+        k = self.build_key(key)
+        await self.delete_expired(k)
+        if not data:
+            await BotState.objects.filter(key=k, state=None).adelete()
+            await BotState.objects.filter(key=k).aupdate(
+                data={}, updated_at=timezone.now()
+            )
+        else:
+            await BotState.objects.aupdate_or_create(
+                key=k, defaults={'data': data}
+            )
+
+    async def get_data(self, key: StorageKey) -> Dict[str, Any]:
+        row = await self.get_row(key)
+        return dict(row.data) if row else {}
+
+    async def close(self) -> None:
+        pass
+
+
+def purge_expired(ttl: int) -> int:
+    """
+    Delete dialogs of the database storage not updated for ttl seconds.
+
+    Args:
+        ttl (int): Seconds to keep an idle dialog.
+
+    Returns:
+        int: Count of deleted dialogs.
+    """
+    expired = timezone.now() - timedelta(seconds=ttl)
+    return BotState.objects.filter(updated_at__lte=expired).delete()[0]
+
+
+def get_storage(kind: str, ttl: Optional[int] = None) -> BaseStorage:
+    """
+    Get FSM storage of the bot.
+
+    Args:
+        kind (str): 'memory', 'redis' or 'db'.
+        ttl (int, optional): Seconds to keep an idle dialog.
+
+    Returns:
+        BaseStorage: The storage.
+    """
+    match kind:
+        case k if k == REDIS:
+            url = (f'redis://{settings.REDIS_HOST}:{settings.REDIS_PORT}/'
+                   f'{REDIS_DB}')
+            return RedisStorage.from_url(url, state_ttl=ttl, data_ttl=ttl)
+        case k if k == DATABASE:
+            return DjangoStorage(ttl)
+        case k if k == MEMORY:
+            return MemoryStorage()
+    raise ValueError(f'Unknown FSM storage: {kind}')
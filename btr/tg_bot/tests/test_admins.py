@@ -0,0 +1,64 @@
+import asyncio
+import os
+import signal
+from unittest import skipIf
+from unittest.mock import patch
+
+from django.test import SimpleTestCase
+
+from btr.bookings.management.commands.bench_webhook import (PATH, TOKEN,
+                                                            start_site)
+from btr.tg_bot import admins
+from btr.tg_bot.bot import BookingBot
+from btr.tg_bot.fake_server import FakeTelegramServer
+
+
+@patch('btr.tg_bot.admins.find_dotenv', return_value='')
+class TestAdmins(SimpleTestCase):
+
+    def test_parse(self, _find_dotenv):
+        self.assertEqual(admins.parse_admin_ids('[123, -456]'),
+                         frozenset({123, -456}))
+        self.assertEqual(admins.parse_admin_ids('123,456'),
+                         frozenset({123, 456}))
+        self.assertEqual(admins.parse_admin_ids(None), frozenset())
+
+    @skipIf(admins.RELOAD_SIGNAL is None, 'no SIGHUP on this platform')
+    def test_reload_on_signal(self, _find_dotenv):
+        async def reload():
+            await admins.watch_admin_ids()
+            try:
+                os.environ['TG_ADMIN_IDS'] = '[2]'
+                os.kill(os.getpid(), admins.RELOAD_SIGNAL)
+                await asyncio.sleep(0.05)
+            finally:
+                await admins.unwatch_admin_ids()
+
+        with patch.dict(os.environ, {'TG_ADMIN_IDS': '[1]'}):
+            with self.assertLogs('btr.tg_bot.admins'):
+                self.assertEqual(admins.load_admin_ids(), {1})
+                asyncio.run(reload())
+        self.assertEqual(admins.get_admin_ids(), {2})
+        self.assertEqual(signal.getsignal(signal.SIGHUP), signal.SIG_DFL)
+
+    async def test_admin_commands(self, _find_dotenv):
+        telegram = FakeTelegramServer()
+        telegram_runner, api_url = await start_site(telegram.make_app())
+        with patch.dict(os.environ, {'TG_ADMIN_IDS': '[1001]'}):
+            with self.assertLogs(level='INFO'):
+                bot = BookingBot(TOKEN, api_url)
+                webhook_runner, webhook_url = await start_site(
+                    bot.get_webhook_app(PATH)
+                )
+                await FakeTelegramServer.send_updates(webhook_url + PATH, [
+                    FakeTelegramServer.make_update(1, 1001, '/check'),
+                    FakeTelegramServer.make_update(2, 1002, '/check'),
+                ])
+                await telegram.wait_messages(2, timeout=10)
+                await webhook_runner.cleanup()
+                await telegram_runner.cleanup()
+        texts = {int(call['chat_id']): call['text']
+                 for call in telegram.get_calls('sendMessage')}
+        self.assertIn('Rider', texts[1001])
+        self.assertNotIn('🔴', texts[1001])
+        self.assertTrue(texts[1002].startswith('🔴🔴🔴'))
@@ -0,0 +1,39 @@
+from django.test import SimpleTestCase
+from django.utils.translation import override
+from pydantic import ValidationError
+
+from btr.tg_bot.keyboards.inline_menu import InlineMenuKB
+from btr.tg_bot.keyboards.kb_cancel import CancelKB
+from btr.tg_bot.keyboards.kb_dialog import DialogKB
+
+
+class TestKeyboards(SimpleTestCase):
+
+    def test_memoized_by_language(self):
+        with override('en'):
+            cancel = CancelKB().place()
+            self.assertIs(CancelKB().place(), cancel)
+            self.assertIs(InlineMenuKB().place(), InlineMenuKB().place())
+        with override('ru'):
+            self.assertIsNot(CancelKB().place(), cancel)
+            self.assertEqual(CancelKB().place().inline_keyboard[0][0].text,
+                             'Отменить диалог')
+
+    def test_menus(self):
+        with override('en'):
+            menu = InlineMenuKB().place()
+            start = InlineMenuKB().place_to_start()
+        self.assertEqual(menu.inline_keyboard[-1][-1].callback_data, 'start')
+        self.assertEqual(start.inline_keyboard[-1][-1].callback_data, 'price')
+
+    def test_dialog(self):
+        kb = DialogKB(['1', '2', '3']).place()
+        self.assertIs(DialogKB(('1', '2', '3')).place(), kb)
+        self.assertIsNot(DialogKB(['1', '2']).place(), kb)
+        self.assertEqual([b.text for b in kb.keyboard[0]], ['1', '2', '3'])
+
+    def test_immutable(self):
+        with self.assertRaises(ValidationError):
+            DialogKB(['1']).place().one_time_keyboard = False
+        with self.assertRaises(ValidationError):
+            CancelKB().place().inline_keyboard = []
@@ -0,0 +1,88 @@
+from datetime import timedelta
+
+from aiogram.fsm.storage.base import StorageKey
+from aiogram.fsm.storage.memory import MemoryStorage
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from btr.tasks.bot import purge_bot_states
+from btr.tg_bot.models import BotState
+from btr.tg_bot.states.create_booking import BookingState
+from btr.tg_bot.storage import DjangoStorage, get_storage
+
+
+class TestDjangoStorage(TestCase):
+
+    key = StorageKey(bot_id=1, chat_id=2, user_id=2)
+
+    async def test_round_trip(self):
+        storage = DjangoStorage()
+        await storage.set_state(self.key, BookingState.bookDate)
+        await storage.update_data(self.key, {'kb': ['1', '2'], 'pk': 3})
+        await storage.update_data(self.key, {'slots_list': [[600, 720]]})
+        # another process reads the same dialog
+        storage = DjangoStorage()
+        self.assertEqual(await storage.get_state(self.key),
+                         BookingState.bookDate.state)
+        self.assertEqual(await storage.get_data(self.key), {
+            'kb': ['1', '2'], 'pk': 3, 'slots_list': [[600, 720]],
+        })
+        self.assertEqual(await BotState.objects.acount(), 1)
+
+    async def test_clear_deletes_row(self):
+        storage = DjangoStorage()
+        await storage.set_state(self.key, BookingState.bookDate)
+        await storage.set_data(self.key, {'pk': 3})
+        await storage.set_state(self.key, None)
+        self.assertEqual(await storage.get_data(self.key), {'pk': 3})
+        await storage.set_data(self.key, {})
+        self.assertFalse(await BotState.objects.aexists())
+        self.assertIsNone(await storage.get_state(self.key))
+
+    async def test_ttl(self):
+        storage = DjangoStorage(ttl=60)
+        await storage.set_data(self.key, {'pk': 3})
+        await BotState.objects.aupdate(
+            updated_at=timezone.now() - timedelta(minutes=2)
+        )
+        self.assertEqual(await storage.get_data(self.key), {})
+
+    async def test_expired_not_revived(self):
+        storage = DjangoStorage(ttl=60)
+        await storage.set_state(self.key, BookingState.bookDate)
+        await storage.set_data(self.key, {'pk': 3})
+        await BotState.objects.aupdate(
+            updated_at=timezone.now() - timedelta(minutes=2)
+        )
+        # a new dialog starts from empty data
+        await storage.set_state(self.key, BookingState.bookDate)
+        self.assertEqual(await storage.get_data(self.key), {})
+        await storage.update_data(self.key, {'kb': ['1']})
+        self.assertEqual(await storage.get_data(self.key), {'kb': ['1']})
+        await BotState.objects.aupdate(
+            updated_at=timezone.now() - timedelta(minutes=2)
+        )
+        await storage.set_data(self.key, {'pk': 4})
+        self.assertIsNone(await storage.get_state(self.key))
+
+    @override_settings(TG_FSM_TTL=60)
+    def test_purge_task(self):
+        BotState.objects.create(key='old', data={'pk': 1})
+        BotState.objects.create(key='new', data={'pk': 2})
+        BotState.objects.filter(key='old').update(
+            updated_at=timezone.now() - timedelta(minutes=2)
+        )
+        self.assertEqual(purge_bot_states(), 1)
+        self.assertEqual(
+            list(BotState.objects.values_list('key', flat=True)), ['new']
+        )
+
+    def test_get_storage(self):
+        self.assertIsInstance(get_storage('memory'), MemoryStorage)
+        self.assertIsInstance(get_storage('db'), DjangoStorage)
+        with self.assertRaises(ValueError):
+            get_storage('file')
+
+    def test_key(self):
+        key = StorageKey(bot_id=1, chat_id=2, user_id=3, thread_id=4)
+        self.assertEqual(DjangoStorage.build_key(key), '1:2:3:4:default')
@@ -0,0 +1,76 @@
+from django.test import SimpleTestCase
+
+from btr.bookings.management.commands.bench_webhook import (PATH, TOKEN,
+                                                            start_site)
+from btr.tg_bot.bot import BookingBot
+from btr.tg_bot.fake_server import FakeTelegramServer
+
+
+class TestWebhook(SimpleTestCase):
+
+    async def start(self, concurrency: int = 2, latency: float = 0.01,
+                    secret: str = None) -> None:
+        self.telegram = FakeTelegramServer(latency=latency)
+        self.telegram_runner, api_url = await start_site(
+            self.telegram.make_app()
+        )
+        self.bot = BookingBot(TOKEN, api_url)
+        self.webhook_runner, webhook_url = await start_site(
+            self.bot.get_webhook_app(PATH, secret, concurrency=concurrency)
+        )
+        self.url = webhook_url + PATH
+
+    async def stop(self) -> None:
+        await self.webhook_runner.cleanup()
+        await self.telegram_runner.cleanup()
+
+    def get_updates(self, count: int) -> list:
+        return [FakeTelegramServer.make_update(i, 1000 + i)
+                for i in range(count)]
+
+    async def test_bounded_concurrency(self):
+        await self.start(concurrency=2)
+        with self.assertLogs(level='INFO'):
+            statuses = await FakeTelegramServer.send_updates(
+                self.url, self.get_updates(10), connections=10
+            )
+            await self.telegram.wait_messages(10, timeout=10)
+            await self.stop()
+        self.assertEqual(statuses, [200] * 10)
+        chats = {int(call['chat_id'])
+                 for call in self.telegram.get_calls('sendMessage')}
+        self.assertEqual(chats, set(range(1000, 1010)))
+        self.assertEqual(self.telegram.max_active, 2)
+
+    async def test_drain_on_shutdown(self):
+        await self.start(concurrency=5, latency=0.2)
+        with self.assertLogs(level='INFO'):
+            await FakeTelegramServer.send_updates(
+                self.url, self.get_updates(5), connections=5
+            )
+            # handlers are still waiting for the api
+            self.assertEqual(self.telegram.get_calls('sendMessage'), [])
+            await self.stop()
+        self.assertEqual(len(self.telegram.get_calls('sendMessage')), 5)
+
+    async def test_secret(self):
+        await self.start(secret='secret')
+        try:
+            statuses = await FakeTelegramServer.send_updates(
+                self.url, self.get_updates(1), secret='wrong'
+            )
+            self.assertEqual(statuses, [401])
+        finally:
+            await self.stop()
+
+    async def test_refused_while_closing(self):
+        await self.start()
+        self.bot.webhook_handler.closing = True
+        try:
+            statuses = await FakeTelegramServer.send_updates(
+                self.url, self.get_updates(1)
+            )
+            # Telegram redelivers the update after restart
+            self.assertEqual(statuses, [503])
+        finally:
+            await self.stop()
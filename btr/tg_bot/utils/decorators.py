@@ -2,12 +2,14 @@ from aiogram import Bot
 from aiogram.fsm.context import FSMContext
 from aiogram.types import Message
 
+from django.conf import settings
 from django.utils.translation import gettext as _
 
 from functools import wraps
-from collections import OrderedDict
 
 from ..keyboards.kb_cancel import CancelKB
+from ..keyboards.kb_dialog import DialogKB
+from .handlers import get_slots_for_bot_view
 from . import exceptions as e
 
 
@@ -50,11 +52,8 @@ def validators(func):
     async def wrapper(message: Message, state: FSMContext, bot: Bot,
                       *args, **kwargs):
         data = await state.get_data()
-        ordered_data = OrderedDict(data)
-        kb_reply = next((
-            data[k] for k in reversed(ordered_data.keys())
-            if k.endswith('_kb')
-        ), None)
+        # state keeps only button labels of the last dialog keyboard
+        kb_reply = DialogKB(data['kb']).place() if data.get('kb') else None
         user_id = message.from_user.id
         kb = CancelKB().place()
         try:
@@ -139,8 +138,9 @@ def validators(func):
         except e.WrongBikesCount:
             msg = _(
                 '🔴🔴🔴\n\n'
-                '<em>Bikes count must be at <strong>1 - 4</strong>!\n\n</em>'
-            )
+                '<em>Bikes count must be at <strong>1 - {fleet}</strong>!'
+                '\n\n</em>'
+            ).format(fleet=settings.FLEET_SIZE)
             msg2 = _(
                 '<em>Choose bikes from options ⤵️</em>'
             )
@@ -180,7 +180,7 @@ def validators(func):
             await bot.send_message(user_id, msg, reply_markup=kb)
             await bot.send_message(user_id, msg2, reply_markup=kb_reply)
         except e.TimeIsNotAvailable:
-            slots = data.get('slots')
+            slots = get_slots_for_bot_view(data.get('slots_list') or [])
             start = data.get('start')
             msg = _(
                 '🔴🔴🔴\n\n'
@@ -1,55 +1,37 @@
-import os
 import secrets
 import string
 from typing import List, Tuple
 
-from dotenv import load_dotenv
 from datetime import datetime, timedelta
-from aiogram.types import ReplyKeyboardMarkup
 
+from django.conf import settings
 from django.utils.translation import gettext as _
 
 from .exceptions import TimeIsNotAvailable, CodesCompareError
+from btr.bookings.occupancy import (DayOccupancy, RidePolicy, format_duration,
+                                    format_intervals, parse_duration,
+                                    to_clock, to_minutes)
 from btr.tasks.admin import send_vk_notify
 from btr.tasks import bookings as book_mail
 from btr.tasks import users as user_mail
 
 
-def check_admin_access(user_id: int) -> bool:
-    """
-    Check if the current user is an admin.
-
-    Args:
-        user_id (int): The user ID to check.
-
-    Returns:
-        bool: True if the user is an admin, False otherwise.
-    """
-    load_dotenv()
-    admin_ids = os.getenv('TG_ADMIN_IDS')
-    return user_id in eval(admin_ids)
-
-
-def extract_start_times(intervals: List[Tuple]) -> List[str]:
+def extract_start_times(intervals: List[Tuple],
+                        policy: RidePolicy = None) -> List[str]:
     """
     Get all available start times for bot buttons.
 
     Args:
-        intervals (List[Tuple[str, str]]): List of time intervals (start, end).
+        intervals (List[Tuple[int, int]]): List of free intervals in minutes.
+        policy (RidePolicy, optional): Scheduling policy, defaults if not
+         given.
 
     Returns:
         List[str]: List of formatted start times.
     """
-    start_times = []
-    for start, end in intervals:
-        start_dt = datetime.strptime(start, '%H:%M')
-        end_dt = datetime.strptime(end, '%H:%M')
-        hours_difference = (end_dt - start_dt).seconds // 3600
-        start_times.extend(
-            [(start_dt + timedelta(hours=i)).strftime('%H:%M') for i in
-             range(hours_difference)])
-
-    return start_times
+    day = DayOccupancy.from_free_intervals(intervals)
+    policy = policy or RidePolicy()
+    return [to_clock(start) for start in policy.start_times(day)]
 
 
 def friendly_formatted_date(date: str) -> str:
@@ -66,24 +48,25 @@ def friendly_formatted_date(date: str) -> str:
     return date_object.strftime('%Y-%B-%d')
 
 
-def extract_hours(slots: list, start_time: str) -> list:
+def extract_hours(slots: list, start_time: str,
+                  policy: RidePolicy = None) -> list:
     """
     Get a list of available hours for booking.
 
     Args:
-        slots (list): List of time slots (start, end).
+        slots (list): List of free intervals in minutes (start, end).
         start_time (str): The desired start time in the format 'HH:MM'.
+        policy (RidePolicy, optional): Scheduling policy, defaults if not
+         given.
 
     Returns:
-        list: A list of available hours (as strings) from the start time.
+        list: A list of available durations from the start time, whole
+         hours as '2' and others as 'H:MM'.
     """
-    for start, end in slots:
-        start_hours = int(start.split(':')[0])
-        end_hours = int(end.split(':')[0])
-        book_hours = int(start_time.split(':')[0])
-        if start_hours <= book_hours < end_hours:
-            available_hours = end_hours - book_hours
-            return [str(i) for i in range(1, available_hours + 1)]
+    day = DayOccupancy.from_free_intervals(slots)
+    policy = policy or RidePolicy()
+    return [format_duration(minutes)
+            for minutes in policy.durations(day, start_time)]
 
 
 def get_slots_for_bot_view(slots: list) -> str:
@@ -91,24 +74,41 @@ def get_slots_for_bot_view(slots: list) -> str:
     Show free booking slots for a given date.
 
     Args:
-        slots (list): List of time slots (start, end).
+        slots (list): List of free intervals in minutes (start, end).
 
     Returns:
         str: A formatted string with available booking slots.
     """
     bot_view_slots = ''
-    for slot in slots:
-        bot_view_slots += f'{slot[0]}-{slot[1]}\n'
+    for start, end in format_intervals(slots):
+        bot_view_slots += f'{start}-{end}\n'
     return bot_view_slots
 
 
+def get_bikes_options(free_bikes: int = None) -> List[str]:
+    """
+    Get bike counts a rider can choose from.
+
+    Args:
+        free_bikes (int): Bikes left free for the chosen time,
+         the whole fleet if not given.
+
+    Returns:
+        List[str]: Counts from 1 to the free bikes.
+    """
+    limit = settings.FLEET_SIZE
+    if free_bikes is not None:
+        limit = min(free_bikes, limit)
+    return [str(count) for count in range(1, limit + 1)]
+
+
 def check_available_start_time(start_time: str, slots: list) -> bool:
     """
     Check if the given time is available in the list of free slots.
 
     Args:
         start_time (str): The desired start time in the format 'HH:MM'.
-        slots (list): List of time slots (start, end).
+        slots (list): List of free intervals in minutes (start, end).
 
     Returns:
         bool: True if the time is available, False otherwise.
@@ -116,9 +116,9 @@ def check_available_start_time(start_time: str, slots: list) -> bool:
     Raises:
         TimeIsNotAvailable: if start time are already booked or out of time.
     """
-    for slot_start, slot_end in slots:
-        if slot_start <= start_time < slot_end:
-            return True
+    start = to_minutes(start_time)
+    if DayOccupancy.from_free_intervals(slots).is_free(start, start + 1):
+        return True
     raise TimeIsNotAvailable
 
 
@@ -128,13 +128,14 @@ def get_end_time(start_time: str, hours: str) -> str:
 
     Args:
         start_time (str): The start time in the format 'HH:MM'.
-        hours (str): The duration in hours.
+        hours (str): The duration in hours ('2') or hours and minutes
+         ('1:30').
 
     Returns:
         str: The calculated end time in the format 'HH:MM'.
     """
     start = datetime.strptime(start_time, "%H:%M")
-    end = start + timedelta(hours=int(hours))
+    end = start + timedelta(minutes=parse_duration(hours))
     return end.strftime('%H:%M')
 
 
@@ -147,38 +148,41 @@ def get_hours(start: str, end: str) -> str:
         end (str): The end time in the format 'HH:MM'.
 
     Returns:
-        str: The duration between start and end time in hours.
+        str: The duration between start and end time in hours ('2'),
+         or hours and minutes ('1:30').
     """
     start_time = datetime.strptime(start, "%H:%M")
     end_time = datetime.strptime(end, "%H:%M")
     delta = end_time - start_time
-    hours = int(delta.total_seconds() // 3600)
-    return str(hours)
+    return format_duration(int(delta.total_seconds() // 60))
 
 
-def check_available_hours(start_time: str, hours: str, slots: list) -> bool:
+def check_available_hours(start_time: str, hours: str, slots: list,
+                          policy: RidePolicy = None) -> bool:
     """
     Validate if the given time range is available within the list
      of time slots.
 
     Args:
         start_time (str): The start time in the format 'HH:MM'.
-        hours (str): The duration in hours.
-        slots (list): List of time slots represented as tuples (start, end).
+        hours (str): The duration in hours ('2') or hours and minutes
+         ('1:30').
+        slots (list): List of free intervals in minutes (start, end).
+        policy (RidePolicy, optional): Scheduling policy the ride must fit.
 
     Returns:
         bool: True if the time range is available, False otherwise.
 
     Raises:
-        TimeIsNotAvailable: If the time range is not available within any slot.
-    """
-    start = datetime.strptime(start_time, '%H:%M')
-    end = start + timedelta(hours=int(hours))
-    for slot_start, slot_end in slots:
-        f_start = datetime.strptime(slot_start, '%H:%M')
-        f_end = datetime.strptime(slot_end, '%H:%M')
-        if f_start <= start and f_end >= end:
-            return True
+        TimeIsNotAvailable: If the time range is not available within any slot
+         or doesn't fit the policy.
+    """
+    start = to_minutes(start_time)
+    end = start + parse_duration(hours)
+    if policy is not None and not policy.allows(start, end):
+        raise TimeIsNotAvailable
+    if DayOccupancy.from_free_intervals(slots).is_free(start, end):
+        return True
     raise TimeIsNotAvailable
 
 
@@ -307,19 +311,3 @@ def mail_notify(action: str, **kwargs) -> None:
             book_mail.send_edit_booking_message.delay(**kwargs)
         case a if a == 'self_booking_edit':
             book_mail.send_self_edit_booking_message.delay(**kwargs)
-
-
-def json_filter(data: dict) -> dict:
-    """
-    Filter out instances of ReplyKeyboardMarkup from a dictionary.
-
-    Args:
-        data (dict): The input dictionary to filter.
-
-    Returns:
-        dict: A new dictionary with instances of ReplyKeyboardMarkup removed.
-    """
-    return {
-        key: value for key, value in data.items()
-        if not isinstance(value, ReplyKeyboardMarkup)
-    }
@@ -1,14 +1,15 @@
 import re
 from datetime import datetime, date
 
+from django.conf import settings
 from django.utils.translation import gettext as _
 
+from btr.bookings.occupancy import parse_duration
 from ..utils import exceptions as e
 
 
 MAX_NAME_LENGTH = 40
 MIN_BIKES_COUNT = 1
-MAX_BIKES_COUNT = 4
 
 
 def validate_name(name: str) -> bool:
@@ -84,13 +85,13 @@ def validate_bike_quantity(count: str) -> bool:
 
     Raises:
         WrongBikesCount: If the input is not a valid integer or if
-         it's not within the range of 1 to 4.
+         it's not within the range of 1 to the fleet size.
     """
     try:
         int(count)
     except ValueError:
         raise e.WrongBikesCount
-    if int(count) in set(range(MIN_BIKES_COUNT, MAX_BIKES_COUNT + 1)):
+    if MIN_BIKES_COUNT <= int(count) <= settings.FLEET_SIZE:
         return True
     raise e.WrongBikesCount
 
@@ -207,7 +208,7 @@ def validate_hours(hours: str) -> bool:
     Validate the format of hours.
 
     Args:
-        hours (str): The hours to validate.
+        hours (str): The hours to validate ('2' or '1:30').
 
     Returns:
         bool: True if the hours have a valid format, False otherwise.
@@ -216,7 +217,7 @@ def validate_hours(hours: str) -> bool:
         WrongHoursFormat: If the hours do not have a valid format.
     """
     try:
-        int(hours)
+        parse_duration(hours)
         return True
     except ValueError:
         raise e.WrongHoursFormat
@@ -0,0 +1,83 @@
+import asyncio
+import logging
+from typing import Any, Dict
+
+from aiogram import Bot, Dispatcher
+from aiogram.webhook.aiohttp_server import SimpleRequestHandler
+from aiohttp import web
+
+
+logger = logging.getLogger(__name__)
+
+# Telegram opens up to 40 webhook connections by default
+CONCURRENCY = 40
+# seconds
+DRAIN_TIMEOUT = 30
+
+
+class BoundedRequestHandler(SimpleRequestHandler):
+    """
+    Webhook handler which runs updates in background with a limited count
+     of concurrent handlers.
+
+    Telegram gets the answer when a handler slot is free, so a burst of
+     updates waits in Telegram instead of piling up in memory. On shutdown
+     new updates are refused (Telegram redelivers them later) and running
+     handlers are drained.
+
+    Args:
+        dispatcher (Dispatcher): Bot dispatcher.
+        bot (Bot): Bot instance.
+        concurrency (int): Max count of concurrent handlers.
+        drain_timeout (float): Seconds to wait for running handlers
+         on shutdown.
+    """
+
+    def __init__(self, dispatcher: Dispatcher, bot: Bot,
+                 concurrency: int = CONCURRENCY,
+                 drain_timeout: float = DRAIN_TIMEOUT, **kwargs: Any):
+        super().__init__(dispatcher, bot, handle_in_background=True,
+                         **kwargs)
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.drain_timeout = drain_timeout
+        self.closing = False
+
+    async def _handle_request_background(self, bot: Bot,
+                                         request: web.Request):
+        if self.closing:
+            return web.Response(status=503)
+        update = await request.json(loads=bot.session.json_loads)
+        await self.semaphore.acquire()
+        task = asyncio.create_task(self._bounded_feed_update(bot, update))
+        self._background_feed_update_tasks.add(task)
+        task.add_done_callback(self._background_feed_update_tasks.discard)
+        return web.json_response({}, dumps=bot.session.json_dumps)
+
+    async def _bounded_feed_update(self, bot: Bot,
+                                   update: Dict[str, Any]) -> None:
+        try:
+            await self._background_feed_update(bot, update)
+        finally:
+            self.semaphore.release()
+
+    async def drain(self) -> None:
+        """
+        Wait for running handlers, unfinished ones are canceled after
+         drain_timeout.
+        """
+        tasks = set(self._background_feed_update_tasks)
+        if not tasks:
+            return
+        logger.info('Draining %s update handlers', len(tasks))
+        done, pending = await asyncio.wait(tasks, timeout=self.drain_timeout)
+        for task in pending:
+            task.cancel()
+        if pending:
+            logger.warning('%s update handlers canceled on shutdown',
+                           len(pending))
+            await asyncio.wait(pending)
+
+    async def close(self) -> None:
+        self.closing = True
+        await self.drain()
+        await super().close()
@@ -3,7 +3,7 @@ from django.conf.urls.static import static
 from django.contrib import admin
 from django.urls import path, include
 
-from .views import VKCommentsView, health
+from .views import VKCommentsView, health, metrics
 from .views import IndexView, BriefingView, ContactsView, BlogView
 
 urlpatterns = [
@@ -17,6 +17,7 @@ urlpatterns = [
     path('contacts/', ContactsView.as_view(), name='contacts'),
     path('admin/', admin.site.urls),
     path('health-check/', health, name='is_health'),
+    path('metrics/', metrics, name='metrics'),
 ]
 
 if settings.DEBUG:
@@ -22,6 +22,7 @@ class UserAdmin(admin.ModelAdmin):
         'phone_number',
         'email',
         'status',
+        'completed_rides',
     )
 
     list_filter = ('status',)
@@ -0,0 +1,111 @@
+from typing import Dict, List, Tuple
+
+from django.db.models import (Case, Count, F, OuterRef, QuerySet, Subquery,
+                              Value, When)
+from django.db.models.functions import Coalesce
+from django.utils.translation import gettext as _
+
+from btr.bookings.models import Booking
+from .models import SiteUser
+
+
+def get_levels() -> List[Tuple[int | None, str]]:
+    """
+    Get rider levels with upper limits of completed rides.
+
+    Returns:
+        list: Tuples of (limit, level), the last level has no limit.
+    """
+    return [
+        (3, _('Newbie')),
+        (5, _('Amateur')),
+        (10, _('Professional')),
+        (None, _('Master')),
+    ]
+
+
+def get_level(completed: int) -> str:
+    """
+    Get rider level by count of completed bookings.
+
+    Args:
+        completed (int): Count of completed bookings.
+
+    Returns:
+        str: Translated level (e.g. 'Newbie', 'Amateur', etc.).
+    """
+    for limit, level in get_levels():
+        if limit is None or completed < limit:
+            return level
+
+
+def level_case(delta: int = 0) -> Case:
+    """
+    Build SQL expression of the rider level after completed rides counter
+     changes by delta. Admin accounts keep their status.
+
+    SET clauses of an UPDATE read column values from before the update, so
+     the limits are shifted by delta instead of reading the new counter.
+
+    Args:
+        delta (int): Change of completed rides in the same UPDATE.
+
+    Returns:
+        Case: Expression for the status field.
+    """
+    *levels, (_limit, last_level) = get_levels()
+    return Case(
+        When(is_superuser=True, then=F('status')),
+        *[When(completed_rides__lt=limit - delta, then=Value(level))
+          for limit, level in levels],
+        default=Value(last_level),
+    )
+
+
+def add_completed_rides(deltas: Dict[int, int]) -> int:
+    """
+    Atomically change completed rides counters and levels of riders.
+
+    One UPDATE per distinct delta value (usually one), no counting.
+
+    Args:
+        deltas (dict): Change of completed rides keyed by rider id.
+
+    Returns:
+        int: Count of updated riders.
+    """
+    riders_by_delta = {}
+    for rider_id, delta in deltas.items():
+        if delta:
+            riders_by_delta.setdefault(delta, []).append(rider_id)
+    updated = 0
+    for delta, rider_ids in riders_by_delta.items():
+        updated += SiteUser.objects.filter(pk__in=rider_ids).update(
+            completed_rides=F('completed_rides') + delta,
+            status=level_case(delta),
+        )
+    return updated
+
+
+def rebuild_completed_rides(queryset: QuerySet = None) -> int:
+    """
+    Recount completed rides and levels from bookings in two UPDATE
+     statements.
+
+    Args:
+        queryset (QuerySet, optional): Riders to rebuild. Defaults to all.
+
+    Returns:
+        int: Count of updated riders.
+    """
+    if queryset is None:
+        queryset = SiteUser.objects.all()
+    completed = Booking.objects.filter(
+        rider=OuterRef('pk'),
+        status=_('completed'),
+    ).order_by().values('rider').annotate(count=Count('pk')).values('count')
+    updated = queryset.update(
+        completed_rides=Coalesce(Subquery(completed), 0),
+    )
+    queryset.update(status=level_case())
+    return updated
@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from btr.users.levels import rebuild_completed_rides
+from btr.users.models import SiteUser
+
+
+class Command(BaseCommand):
+    """
+    Recount completed rides counters and levels of riders from bookings.
+
+    Riders are processed by primary key ranges, every batch is two UPDATE
+     statements in its own transaction.
+
+    Usage:
+        python manage.py rebuild_completed_rides --batch-size 5000
+    """
+
+    help = 'Rebuild completed rides counters and levels of riders'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=5000)
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        last_pk = SiteUser.objects.order_by('-pk').values_list(
+            'pk', flat=True).first() or 0
+        updated = 0
+        for start in range(0, last_pk + 1, batch_size):
+            with transaction.atomic():
+                updated += rebuild_completed_rides(SiteUser.objects.filter(
+                    pk__gte=start,
+                    pk__lt=start + batch_size,
+                ))
+        self.stdout.write(self.style.SUCCESS(
+            f'Rebuilt completed rides of {updated} riders'
+        ))
@@ -0,0 +1,33 @@
+# Generated by Django 4.2.6 on 2026-10-18 11:48
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.utils.translation import gettext as _
+
+
+def count_completed_rides(apps, schema_editor):
+    SiteUser = apps.get_model('users', 'SiteUser')
+    Booking = apps.get_model('bookings', 'Booking')
+    completed = Booking.objects.filter(
+        rider=OuterRef('pk'),
+        status=_('completed'),
+    ).order_by().values('rider').annotate(count=Count('pk')).values('count')
+    SiteUser.objects.update(completed_rides=Coalesce(Subquery(completed), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0006_rename_emails_siteuser_email'),
+        ('bookings', '0012_booking_booking_date_status_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='siteuser',
+            name='completed_rides',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Completed rides'),
+        ),
+        migrations.RunPython(count_completed_rides, migrations.RunPython.noop),
+    ]
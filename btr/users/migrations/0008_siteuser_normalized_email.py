@@ -0,0 +1,33 @@
+# Generated by Django 4.2.6 on 2026-10-18 12:16
+
+import btr.users.models
+from django.db import migrations, models
+from django.db.models.functions import Lower
+
+
+def fill_normalized_email(apps, schema_editor):
+    SiteUser = apps.get_model('users', 'SiteUser')
+    SiteUser.objects.update(normalized_email=Lower('email'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0007_siteuser_completed_rides'),
+    ]
+
+    operations = [
+        migrations.AlterModelManagers(
+            name='siteuser',
+            managers=[
+                ('objects', btr.users.models.SiteUserManager()),
+            ],
+        ),
+        migrations.AddField(
+            model_name='siteuser',
+            name='normalized_email',
+            field=models.EmailField(db_index=True, editable=False, max_length=50, null=True),
+        ),
+        migrations.RunPython(fill_normalized_email,
+                             migrations.RunPython.noop),
+    ]
@@ -1,7 +1,30 @@
-from django.contrib.auth.models import AbstractUser
+from django.contrib.auth.models import AbstractUser, UserManager
 from django.db import models
+from django.db.models import Q
 from django.utils.translation import gettext_lazy as _
 from phonenumber_field.modelfields import PhoneNumberField
+from phonenumber_field.phonenumber import to_python
+
+
+class SiteUserManager(UserManager):
+
+    def filter_by_login(self, login: str) -> models.QuerySet:
+        """
+        Get users whose username, email or phone number matches the login,
+         in one query over indexed columns.
+
+        Args:
+            login (str): Username, email (any case) or phone number
+             (any format parsable for the default region).
+
+        Returns:
+            QuerySet: Matched users, up to one per field.
+        """
+        lookups = Q(username=login) | Q(normalized_email=login.lower())
+        phone = to_python(login)
+        if getattr(phone, 'is_valid', bool)():
+            lookups |= Q(phone_number=phone.as_e164)
+        return self.filter(lookups)
 
 
 class SiteUser(AbstractUser):
@@ -27,6 +50,14 @@ class SiteUser(AbstractUser):
         verbose_name=_('Email')
     )
 
+    # lowercased email for lookups, set on save
+    normalized_email = models.EmailField(
+        max_length=50,
+        null=True,
+        editable=False,
+        db_index=True,
+    )
+
     phone_number = PhoneNumberField(
         blank=False,
         unique=True,
@@ -59,6 +90,14 @@ class SiteUser(AbstractUser):
         choices=LEVEL_CHOICES,
     )
 
+    completed_rides = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name=_('Completed rides'),
+    )
+
+    objects = SiteUserManager()
+
     def __str__(self):
         return self.username
 
@@ -0,0 +1,74 @@
+import asyncio
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from typing import Callable, Optional
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth.hashers import check_password, make_password
+
+
+_executor: Optional[ProcessPoolExecutor] = None
+
+
+def init_worker(settings_module: str) -> None:
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', settings_module)
+    import django
+    django.setup()
+
+
+def get_executor() -> Optional[ProcessPoolExecutor]:
+    """
+    Get the process pool of password hashers, started on first use.
+     Workers are spawned, so they don't inherit threads or the event
+      loop of the bot.
+
+    Returns:
+        ProcessPoolExecutor or None: None if PASSWORD_HASH_WORKERS is 0.
+    """
+    global _executor
+    if _executor is None and settings.PASSWORD_HASH_WORKERS:
+        _executor = ProcessPoolExecutor(
+            settings.PASSWORD_HASH_WORKERS,
+            mp_context=get_context('spawn'),
+            initializer=init_worker,
+            initargs=(os.environ['DJANGO_SETTINGS_MODULE'],),
+        )
+    return _executor
+
+
+async def run_hasher(func: Callable, *args):
+    executor = get_executor()
+    if executor is None:
+        return await sync_to_async(func)(*args)
+    return await asyncio.get_running_loop().run_in_executor(
+        executor, func, *args
+    )
+
+
+async def amake_password(password: str) -> str:
+    """
+    Hash the password in the hashers pool.
+
+    Args:
+        password (str): Raw password.
+
+    Returns:
+        str: Encoded password for the password column.
+    """
+    return await run_hasher(make_password, password)
+
+
+async def acheck_password(password: str, encoded: str) -> bool:
+    """
+    Check the password against the encoded one in the hashers pool.
+
+    Args:
+        password (str): Raw password.
+        encoded (str): Value of the password column.
+
+    Returns:
+        bool: True if the password is correct.
+    """
+    return await run_hasher(check_password, password, encoded)
@@ -1,27 +1,45 @@
 from django.db.models import Model
-from django.db.models.signals import post_save
+from django.db.models.signals import pre_save
 from django.dispatch import receiver
 from django.utils.translation import gettext as _
 
 from .models import SiteUser
 
 
-@receiver(post_save, sender=SiteUser)
-def set_status(sender: Model, instance: SiteUser,
-               created: bool, **kwargs) -> None:
+@receiver(pre_save, sender=SiteUser)
+def set_normalized_email(sender: Model, instance: SiteUser,
+                         **kwargs) -> None:
     """
-    Signal handler to set status to new users.
+    Signal handler to keep the lowercased email lookup column in sync.
 
     Args:
         sender (Model): The sender model class.
         instance (SiteUser): The instance of the user being saved.
-        created (bool): A flag indicating whether the instance was
-         created or updated.
         **kwargs: Additional keyword arguments.
 
     Returns:
         None
     """
-    if created:
+    update_fields = kwargs.get('update_fields')
+    if update_fields is not None and 'email' not in update_fields:
+        return
+    instance.normalized_email = instance.email.lower() if instance.email \
+        else None
+
+
+@receiver(pre_save, sender=SiteUser)
+def set_status(sender: Model, instance: SiteUser, **kwargs) -> None:
+    """
+    Signal handler to set status to new users, before the insert so
+     a new user costs one query.
+
+    Args:
+        sender (Model): The sender model class.
+        instance (SiteUser): The instance of the user being saved.
+        **kwargs: Additional keyword arguments.
+
+    Returns:
+        None
+    """
+    if instance._state.adding:
         instance.status = _('newbie')
-        instance.save()
@@ -0,0 +1,81 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.utils.translation import gettext as _
+
+from btr.bookings.models import Booking
+from btr.test_init import BTRTestCase
+from btr.users.levels import get_level
+from btr.users.models import SiteUser
+
+
+class TestRiderLevels(BTRTestCase):
+
+    def complete(self, booking: Booking) -> None:
+        booking.status = _('completed')
+        booking.save()
+
+    def create_completed(self, count: int, rider: SiteUser = None) -> list:
+        return [Booking.objects.create(
+            rider=rider or self.user3,
+            booking_date='9999-04-10',
+            start_time='10:00',
+            end_time='11:00',
+            bike_count=1,
+            status=_('completed'),
+        ) for _i in range(count)]
+
+    def test_get_level(self):
+        self.assertEqual(get_level(0), _('Newbie'))
+        self.assertEqual(get_level(3), _('Amateur'))
+        self.assertEqual(get_level(9), _('Professional'))
+        self.assertEqual(get_level(10), _('Master'))
+
+    def test_save_without_status_change(self):
+        self.booking.start_time = '16:00'
+        # only the booking update, rider is not touched
+        with self.assertNumQueries(1):
+            self.booking.save()
+
+    def test_status_transitions(self):
+        self.complete(self.booking)
+        self.complete(self.booking)
+        self.user2.refresh_from_db()
+        self.assertEqual(self.user2.completed_rides, 1)
+        self.booking.status = _('canceled')
+        self.booking.save()
+        self.user2.refresh_from_db()
+        self.assertEqual(self.user2.completed_rides, 0)
+
+    def test_level_changes(self):
+        bookings = self.create_completed(3)
+        self.user3.refresh_from_db()
+        self.assertEqual(self.user3.completed_rides, 3)
+        self.assertEqual(self.user3.status, _('Amateur'))
+        bookings[0].delete()
+        self.user3.refresh_from_db()
+        self.assertEqual(self.user3.completed_rides, 2)
+        self.assertEqual(self.user3.status, _('Newbie'))
+
+    def test_admin_status_kept(self):
+        admin = SiteUser.objects.create_superuser(
+            username='admin',
+            email='admin@example.com',
+            password='admin',
+        )
+        SiteUser.objects.filter(pk=admin.pk).update(status='admin')
+        self.create_completed(3, rider=admin)
+        admin.refresh_from_db()
+        self.assertEqual(admin.completed_rides, 3)
+        self.assertEqual(admin.status, 'admin')
+
+    def test_rebuild_command(self):
+        self.create_completed(5)
+        SiteUser.objects.update(completed_rides=0, status=_('Newbie'))
+        call_command('rebuild_completed_rides', batch_size=2,
+                     stdout=StringIO())
+        self.user3.refresh_from_db()
+        self.user2.refresh_from_db()
+        self.assertEqual(self.user3.completed_rides, 5)
+        self.assertEqual(self.user3.status, _('Professional'))
+        self.assertEqual(self.user2.completed_rides, 0)
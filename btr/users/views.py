@@ -38,6 +38,7 @@ class UserRegistrationView(SuccessMessageMixin, CreateView):
 class UserView(UserAuthRequiredMixin, DetailView):
     model = SiteUser
     template_name = 'users/profile.html'
+    query_budget = 5
     context_object_name = 'profile'
     login_url = 'login'
     permission_denied_message = _('You must to be log in')
@@ -1,13 +1,17 @@
 import os
 
-from django.http import JsonResponse
+from django.conf import settings
+from django.http import Http404, HttpResponse, JsonResponse
+from django.utils.crypto import constant_time_compare
 from dotenv import load_dotenv
 
 from django.shortcuts import render
 from django.views import View
 from django.views.generic import TemplateView
 
-from btr.vk import TopicComments
+from btr.bookings.fragments import get_stats
+from btr.metrics import format_prometheus, get_metrics
+from btr.reviews import GROUP_ID, TOPIC_ID, get_reviews
 
 
 load_dotenv()
@@ -31,21 +35,14 @@ class ContactsView(TemplateView):
 
 class VKCommentsView(View):
     template_name = 'reviews/reviews.html'
-    access_token = os.getenv('VK_ACCESS_TOKEN')
     app_id = os.getenv('VK_APP_ID')
     app_secret = os.getenv('VK_APP_SECRET')
-    group_id = '211850637'
-    topic_id = '49522524'
+    group_id = GROUP_ID
+    topic_id = TOPIC_ID
 
     def get(self, request, *args, **kwargs):
-        vk = TopicComments(
-            self.group_id,
-            self.topic_id,
-            self.access_token
-        )
-
         context = {
-            'comments': vk.get_comments(),
+            'comments': get_reviews(),
             'group_id': self.group_id,
             'topic_id': self.topic_id,
             'app_id': self.app_id,
@@ -56,3 +53,26 @@ class VKCommentsView(View):
 
 def health(request):
     return JsonResponse({"status": "ok"})
+
+
+def metrics(request):
+    """
+    Per-view request metrics and calendar fragment stats in the Prometheus
+     text format. Open to staff and to the METRICS_TOKEN bearer.
+    """
+    token = settings.METRICS_TOKEN
+    header = request.headers.get('Authorization', '')
+    allowed = request.user.is_staff or (
+        token and constant_time_compare(header, f'Bearer {token}')
+    )
+    if not allowed:
+        raise Http404
+    lines = [format_prometheus(get_metrics())]
+    fragments = get_stats()
+    for field in ('hits', 'misses'):
+        lines.append(f'# TYPE btr_fragment_{field}_total counter\n')
+        lines.extend(f'btr_fragment_{field}_total{{fragment="{name}"}} '
+                     f'{stats[field]}\n'
+                     for name, stats in fragments.items())
+    return HttpResponse(''.join(lines),
+                        content_type='text/plain; version=0.0.4')
@@ -1,16 +1,109 @@
+import math
+import time
+from functools import lru_cache
+
+import requests
 import vk_api
+from django.conf import settings
+from django.core.cache import cache
+
+
+VK_API_URL = 'https://api.vk.com/method/'
+# VK api limit for user and community tokens
+VK_RPS = 3
+# max length of VK message
+VK_MESSAGE_LIMIT = 4096
+# seconds
+VK_TIMEOUT = 10
+
+
+class BaseURLSession(requests.Session):
+    """
+    HTTP session which sends VK api requests to another base url
+     (e.g. a local fake VK server).
+    """
+
+    def __init__(self, base_url: str, timeout: float = VK_TIMEOUT):
+        super().__init__()
+        self.base_url = base_url
+        self.timeout = timeout
+
+    def request(self, method, url, *args, **kwargs):
+        if url.startswith(VK_API_URL):
+            url = self.base_url + url[len(VK_API_URL):]
+        kwargs.setdefault('timeout', self.timeout)
+        return super().request(method, url, *args, **kwargs)
+
+
+class RateLimiter:
+    """
+    Requests per second limit shared by all processes through the cache.
+
+    Every second has its own counter, callers over the limit wait for
+     the next second.
+    """
+
+    def __init__(self, key: str, rps: int):
+        self.key = key
+        self.rps = rps
+
+    def wait(self) -> None:
+        while True:
+            now = time.time()
+            second = math.floor(now)
+            key = f'{self.key}:{second}'
+            cache.add(key, 0, 2)
+            try:
+                count = cache.incr(key)
+            except ValueError:
+                # counter expired between add and incr
+                continue
+            if count <= self.rps:
+                return
+            time.sleep(second + 1 - now)
+
+
+class VKClient(vk_api.VkApi):
+    """
+    VK api session with keep-alive connections, configurable base url and
+     requests limited across all workers.
+    """
+
+    def __init__(self, access_token: str, base_url: str = VK_API_URL,
+                 rps: int = VK_RPS, timeout: float = VK_TIMEOUT):
+        super().__init__(token=access_token,
+                         session=BaseURLSession(base_url, timeout))
+        # spacing of requests in the process, limiter covers the rest
+        self.RPS_DELAY = 1 / rps
+        self.limiter = RateLimiter('vk:rps', rps)
+
+    def method(self, method, values=None, captcha_sid=None, captcha_key=None,
+               raw=False):
+        self.limiter.wait()
+        return super().method(method, values, captcha_sid, captcha_key, raw)
+
+
+@lru_cache(maxsize=None)
+def get_vk_client(access_token: str,
+                  timeout: float = VK_TIMEOUT) -> VKClient:
+    """
+    Get VK client of the token, it is created once per process and lives
+     as long as the worker.
+    """
+    return VKClient(access_token, settings.VK_API_URL, settings.VK_RPS,
+                    timeout)
 
 
 class VKBase:
-    def __init__(self, access_token):
+    def __init__(self, access_token, timeout=VK_TIMEOUT):
         self.access_token = access_token
-        self.vk_session = vk_api.VkApi(token=access_token)
+        self.vk_session = get_vk_client(access_token, timeout)
         self.vk = self.vk_session.get_api()
 
 
 class TopicComments(VKBase):
-    def __init__(self, group_id, topic_id, access_token):
-        super().__init__(access_token)
+    def __init__(self, group_id, topic_id, access_token, timeout=VK_TIMEOUT):
+        super().__init__(access_token, timeout)
         self.group_id = group_id
         self.topic_id = topic_id
         self.comments = {}
@@ -23,34 +116,27 @@ class TopicComments(VKBase):
             extended=1
         )
 
+    def get_users(self, comments: list) -> dict:
+        """Get profiles of comments authors with one users.get call"""
+        user_ids = {comment['from_id'] for comment in comments
+                    if comment['from_id'] > 0}
+        if not user_ids:
+            return {}
+        users = self.vk.users.get(
+            user_ids=','.join(map(str, sorted(user_ids))),
+            fields='photo_100',
+        )
+        return {user['id']: user for user in users}
+
     def get_formatted_comments(self) -> list:
         """Get comments ready to template built in"""
-        comments = []
-        for comment in self.comments['items'][1:]:
-            user_id = comment['from_id']
-            user_info = self.vk.users.get(user_ids=user_id,
-                                          fields='photo_100')[0]
-            comment_data = {
-                'comment': comment,
-                'user': user_info,
-            }
-            comments.append(comment_data)
-        return comments
+        comments = self.comments['items'][1:]
+        users = self.get_users(comments)
+        return [{
+            'comment': comment,
+            'user': users.get(comment['from_id'], {}),
+        } for comment in comments]
 
     def get_comments(self) -> list:
         self.forming_comments()
         return self.get_formatted_comments()
-
-
-class SendBookingNotification(VKBase):
-
-    def __init__(self, group_id, access_token):
-        super().__init__(access_token)
-        self.group_id = group_id
-
-    def send_notify(self, message: str) -> None:
-        self.vk.messages.send(
-            user_id=self.group_id,
-            message=message,
-            random_id=0
-        )
@@ -3,7 +3,7 @@ from django.contrib.admin import SimpleListFilter
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
-from .models import WorkHours, DayControl
+from .models import WorkHours, DayControl, SchedulingPolicy
 
 
 class WorkHoursAdmin(admin.ModelAdmin):
@@ -46,6 +46,19 @@ class DayControlAdmin(admin.ModelAdmin):
     list_filter = ('is_closed', PastDateFilter)
 
 
+class SchedulingPolicyAdmin(admin.ModelAdmin):
+    """
+    Admin configuration for the SchedulingPolicy model, a single record
+     is allowed.
+    """
+
+    list_display = ('buffer', 'granularity', 'min_ride', 'max_ride')
+
+    def has_add_permission(self, request):
+        return not SchedulingPolicy.objects.exists()
+
+
 admin.site.register(WorkHours, WorkHoursAdmin)
 admin.site.register(DayControl, DayControlAdmin)
+admin.site.register(SchedulingPolicy, SchedulingPolicyAdmin)
 admin.site.site_title = _('Opening hours operation')
@@ -0,0 +1,28 @@
+# Generated by Django 4.2.6 on 2026-10-18 11:43
+
+from django.db import migrations, models
+
+
+def remove_duplicate_days(apps, schema_editor):
+    # keep the latest settings for every date before adding unique index
+    DayControl = apps.get_model('workhours', 'DayControl')
+    latest = {}
+    for pk, date in DayControl.objects.order_by('pk').values_list('pk', 'date'):
+        latest[date] = pk
+    DayControl.objects.exclude(pk__in=latest.values()).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('workhours', '0004_alter_daycontrol_options_alter_daycontrol_close_and_more'),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicate_days, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='daycontrol',
+            name='date',
+            field=models.DateField(unique=True, verbose_name='Date'),
+        ),
+    ]
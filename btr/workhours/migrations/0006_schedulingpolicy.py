@@ -0,0 +1,27 @@
+# Generated by Django 4.2.6 on 2026-10-18 12:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('workhours', '0005_alter_daycontrol_date'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SchedulingPolicy',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('buffer', models.PositiveSmallIntegerField(default=60, verbose_name='Service buffer, min')),
+                ('granularity', models.PositiveSmallIntegerField(choices=[(5, 5), (10, 10), (15, 15), (20, 20), (30, 30), (60, 60)], default=60, verbose_name='Slot granularity, min')),
+                ('min_ride', models.PositiveSmallIntegerField(default=60, verbose_name='Min ride length, min')),
+                ('max_ride', models.PositiveSmallIntegerField(blank=True, null=True, verbose_name='Max ride length, min')),
+            ],
+            options={
+                'verbose_name': 'Scheduling policy',
+                'verbose_name_plural': 'Scheduling policy',
+            },
+        ),
+    ]
@@ -1,7 +1,11 @@
+from django.core.cache import cache
 from django.core.exceptions import ValidationError
 from django.db import models
 from django.utils.translation import gettext_lazy as _
 
+from btr.bookings.occupancy import RidePolicy
+from btr.metrics import record_cache
+
 
 class WorkHours(models.Model):
 
@@ -31,6 +35,7 @@ class DayControl(models.Model):
     date = models.DateField(
         verbose_name=_('Date'),
         blank=False,
+        unique=True,
     )
     open = models.TimeField(
         blank=True,
@@ -54,6 +59,13 @@ class DayControl(models.Model):
         verbose_name = _('Day')
         verbose_name_plural = _('Days settings')
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        # keep loaded values to detect changed fields in signals
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+
     # To prevent errors, validate the start time and end time.
     # If the admin forgot to set one of the fields, throw an exception
     def clean(self) -> None:
@@ -64,3 +76,87 @@ class DayControl(models.Model):
                 raise ValidationError(_(
                     'You need to set up open and close if day are not closed'
                 ))
+
+
+class SchedulingPolicy(models.Model):
+    """
+    Booking rules of the track: service buffer, slot granularity and
+     ride length limits (all in minutes). A single record is used,
+     defaults apply while it doesn't exist.
+    """
+
+    GRANULARITY_CHOICES = [(minutes, minutes) for minutes in
+                           (5, 10, 15, 20, 30, 60)]
+    cache_key = 'scheduling-policy'
+
+    buffer = models.PositiveSmallIntegerField(
+        default=RidePolicy().buffer,
+        verbose_name=_('Service buffer, min'),
+    )
+    granularity = models.PositiveSmallIntegerField(
+        choices=GRANULARITY_CHOICES,
+        default=RidePolicy().step,
+        verbose_name=_('Slot granularity, min'),
+    )
+    min_ride = models.PositiveSmallIntegerField(
+        default=RidePolicy().min_ride,
+        verbose_name=_('Min ride length, min'),
+    )
+    max_ride = models.PositiveSmallIntegerField(
+        blank=True,
+        null=True,
+        verbose_name=_('Max ride length, min'),
+    )
+
+    def __str__(self):
+        return f'{self.buffer}/{self.granularity}/{self.min_ride}'
+
+    class Meta:
+        verbose_name = _('Scheduling policy')
+        verbose_name_plural = _('Scheduling policy')
+
+    def clean(self) -> None:
+        # ride lengths have to land on the slot grid
+        lengths = [self.min_ride]
+        if self.max_ride is not None:
+            lengths.append(self.max_ride)
+        if not self.min_ride or any(
+            length % self.granularity for length in lengths
+        ):
+            raise ValidationError(_(
+                'Ride lengths must be multiples of the slot granularity'
+            ))
+        if self.max_ride is not None and self.max_ride < self.min_ride:
+            raise ValidationError(_(
+                'Max ride length can\'t be less than min ride length'
+            ))
+
+    def compile(self) -> RidePolicy:
+        """
+        Build the rules object used by the availability engine.
+
+        Returns:
+            RidePolicy: Compiled policy.
+        """
+        return RidePolicy(
+            buffer=self.buffer,
+            step=self.granularity,
+            min_ride=self.min_ride,
+            max_ride=self.max_ride,
+        )
+
+    @classmethod
+    def get_policy(cls) -> RidePolicy:
+        """
+        Get the compiled policy, read from cache after the first call.
+
+        Returns:
+            RidePolicy: Current policy, defaults if there is no record.
+        """
+        policy = cache.get(cls.cache_key)
+        record_cache(hits=int(policy is not None), misses=int(policy is None))
+        if policy is None:
+            record = cls.objects.order_by('pk').first() or cls()
+            policy = record.compile()
+            cache.set(cls.cache_key, policy, None)
+        return policy
@@ -1,8 +1,11 @@
-from django.db.models.signals import post_migrate
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Model
+from django.db.models.signals import post_migrate, post_save, post_delete
 from django.dispatch import receiver
 
-
-from .models import WorkHours
+from btr.bookings.availability import AvailabilityCache
+from .models import WorkHours, DayControl, SchedulingPolicy
 
 
 @receiver(post_migrate)
@@ -29,3 +32,57 @@ def initiate_default_hours(sender, **kwargs):
                 open='10:00:00',
                 close='22:00:00',
             )
+
+
+@receiver(post_save, sender=DayControl)
+@receiver(post_delete, sender=DayControl)
+def invalidate_day_availability(sender: Model, instance: DayControl,
+                                **kwargs) -> None:
+    """
+    Drop cached availability for the day with changed settings.
+
+    Args:
+        sender (Model): The model class that sends the signal.
+        instance (DayControl): The saved or deleted day settings.
+        **kwargs: Additional keyword arguments.
+
+    Returns:
+        None
+    """
+    loaded_values = getattr(instance, '_loaded_values', {})
+    AvailabilityCache.invalidate(instance.date, loaded_values.get('date'))
+
+
+@receiver(post_save, sender=WorkHours)
+@receiver(post_delete, sender=WorkHours)
+def invalidate_availability(sender: Model, **kwargs) -> None:
+    """
+    Drop all cached availability after default work hours change.
+
+    Args:
+        sender (Model): The model class that sends the signal.
+        **kwargs: Additional keyword arguments.
+
+    Returns:
+        None
+    """
+    AvailabilityCache.invalidate_all()
+
+
+@receiver(post_save, sender=SchedulingPolicy)
+@receiver(post_delete, sender=SchedulingPolicy)
+def invalidate_policy(sender: Model, **kwargs) -> None:
+    """
+    Drop the cached policy and all cached availability after
+     the scheduling policy changes.
+
+    Args:
+        sender (Model): The model class that sends the signal.
+        **kwargs: Additional keyword arguments.
+
+    Returns:
+        None
+    """
+    cache.delete(SchedulingPolicy.cache_key)
+    transaction.on_commit(lambda: cache.delete(SchedulingPolicy.cache_key))
+    AvailabilityCache.invalidate_all()
@@ -1,8 +1,11 @@
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, transaction
 from django.urls import reverse
 
 from btr.fixtures_loader import load_json
 from btr.test_init import BTRAdminTestCase
-from btr.workhours.models import WorkHours
+from btr.orm_utils import SlotsFinder
+from btr.workhours.models import DayControl, SchedulingPolicy, WorkHours
 
 
 class TestWorkhours(BTRAdminTestCase):
@@ -29,3 +32,45 @@ class TestWorkhours(BTRAdminTestCase):
         workhours = WorkHours.objects.get(pk=1)
         open_hours = workhours.open.strftime('%H:%M:%S')
         self.assertEqual(self.change.get('open'), open_hours)
+
+    def test_day_settings_unique_date(self):
+        DayControl.objects.create(date='9999-02-11', is_closed=True)
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            DayControl.objects.create(date='9999-02-11', is_closed=True)
+
+
+class TestSchedulingPolicy(BTRAdminTestCase):
+
+    add_url = reverse('admin:workhours_schedulingpolicy_add')
+
+    def test_defaults_without_record(self):
+        policy = SchedulingPolicy.get_policy()
+        self.assertEqual((policy.buffer, policy.step, policy.min_ride,
+                          policy.max_ride), (60, 60, 60, None))
+        with self.assertNumQueries(0):
+            SchedulingPolicy.get_policy()
+
+    def test_single_record(self):
+        response = self.client.post(self.add_url, {
+            'buffer': 30, 'granularity': 15, 'min_ride': 30, 'max_ride': 120,
+        })
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(SchedulingPolicy.get_policy().step, 15)
+        self.assertEqual(self.client.get(self.add_url).status_code, 403)
+
+    def test_ride_lengths_on_grid(self):
+        for min_ride, max_ride in ((40, None), (60, 50), (0, None)):
+            policy = SchedulingPolicy(granularity=15, min_ride=min_ride,
+                                      max_ride=max_ride)
+            with self.assertRaises(ValidationError):
+                policy.clean()
+
+    def test_buffer_change_refreshes_slots(self):
+        finder = SlotsFinder('9999-02-10')
+        self.assertEqual(finder.find_available_slots(bikes=3),
+                         [('11:00', '16:00'), ('19:00', '22:00')])
+        SchedulingPolicy.objects.create(buffer=0)
+        self.assertEqual(
+            SlotsFinder('9999-02-10').find_available_slots(bikes=3),
+            [('11:00', '17:00'), ('18:00', '22:00')],
+        )
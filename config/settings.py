@@ -1,4 +1,5 @@
 from pathlib import Path
+from django.conf import global_settings
 from dotenv import load_dotenv
 import os
 
@@ -58,6 +59,8 @@ INSTALLED_APPS = [
     'btr.users.apps.UsersConfig',
     'btr.bookings.apps.BookingsConfig',
     'btr.workhours.apps.WorkHoursConfig',
+    'btr.notifications.apps.NotificationsConfig',
+    'btr.tg_bot.apps.TgBotConfig',
     'btr',
     'django_bootstrap5',
 
@@ -72,6 +75,8 @@ CSRF_TRUSTED_ORIGINS = [
 ]
 
 MIDDLEWARE = [
+    # outermost to time the whole request
+    'btr.metrics.MetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.locale.LocaleMiddleware',
@@ -143,8 +148,26 @@ AUTHENTICATION_BACKENDS = [
     'btr.auth.auth_backends.MultiplyFieldBackend',
 ]
 
+# region of phone numbers typed without country code
+PHONENUMBER_DEFAULT_REGION = 'RU'
+
+# bikes available for rent at the same time, also the max bikes per booking
+FLEET_SIZE = int(os.getenv('FLEET_SIZE', 4))
+
+# bearer token of the /metrics/ scraper, staff can open it without one
+METRICS_TOKEN = os.getenv('METRICS_TOKEN')
+
 CONN_MAX_AGE = 500
 
+# comma separated hashers to put first (e.g. MD5PasswordHasher for tests
+# and load tests), the default ones are kept to check existing passwords
+PASSWORD_HASHERS = list(dict.fromkeys([
+    *filter(None, os.getenv('PASSWORD_HASHERS', '').split(',')),
+    *global_settings.PASSWORD_HASHERS,
+]))
+# processes hashing passwords for the bot, 0 hashes them in a thread
+PASSWORD_HASH_WORKERS = int(os.getenv('PASSWORD_HASH_WORKERS', 2))
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -228,12 +251,76 @@ CELERY_BEAT_SCHEDULE = {
         'task': 'btr.tasks.bookings.check_booking_status',
         'schedule': 25.0,
     },
+    'send-outbox': {
+        'task': 'btr.tasks.notifications.send_outbox',
+        'schedule': 30.0,
+    },
+    'send-vk-outbox': {
+        'task': 'btr.tasks.notifications.send_vk_outbox',
+        'schedule': 30.0,
+    },
+    'refresh-vk-reviews': {
+        'task': 'btr.tasks.reviews.refresh_vk_reviews',
+        'schedule': 5 * 60.0,
+    },
+    'purge-bot-states': {
+        'task': 'btr.tasks.bot.purge_bot_states',
+        'schedule': 60 * 60.0,
+    },
 }
 
+CELERY_IMPORTS = ('btr.tasks.reviews', 'btr.tasks.bot')
+
+# cache setup
+
+if DB == 'postgres':
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': 'redis://' + REDIS_HOST + ':' + REDIS_PORT + '/1',
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
 # tg bot setup
 
 TG_BOT_TOKEN = os.getenv('TG_BOT_TOKEN')
 TG_ADMIN_PASSWORD = os.getenv('TG_ADMIN_PASSWORD')
+# 'polling' or 'webhook'
+TG_BOT_MODE = os.getenv('TG_BOT_MODE', 'polling')
+# Bot API server, None is api.telegram.org
+TG_API_URL = os.getenv('TG_API_URL')
+TG_WEBHOOK_URL = os.getenv('TG_WEBHOOK_URL')
+TG_WEBHOOK_PATH = os.getenv('TG_WEBHOOK_PATH', '/tg/webhook/')
+TG_WEBHOOK_SECRET = os.getenv('TG_WEBHOOK_SECRET')
+TG_WEBHOOK_HOST = os.getenv('TG_WEBHOOK_HOST', '127.0.0.1')
+TG_WEBHOOK_PORT = int(os.getenv('TG_WEBHOOK_PORT', 8080))
+# max count of concurrent update handlers in webhook mode
+TG_CONCURRENCY = int(os.getenv('TG_CONCURRENCY', 40))
+# seconds to finish running handlers on shutdown
+TG_DRAIN_TIMEOUT = int(os.getenv('TG_DRAIN_TIMEOUT', 30))
+# dialogs storage: 'memory', 'redis' or 'db'
+TG_FSM_STORAGE = os.getenv(
+    'TG_FSM_STORAGE', 'redis' if DB == 'postgres' else 'memory'
+)
+# seconds to keep an idle dialog
+TG_FSM_TTL = int(os.getenv('TG_FSM_TTL', 24 * 60 * 60))
+
+# vk setup
+
+VK_ADMIN_ID = os.getenv('VK_ADMIN_ID')
+VK_BTR_KEY = os.getenv('VK_BTR_KEY')
+VK_ACCESS_TOKEN = os.getenv('VK_ACCESS_TOKEN')
+VK_API_URL = os.getenv('VK_API_URL', 'https://api.vk.com/method/')
+VK_RPS = int(os.getenv('VK_RPS', 3))
+# seconds to collect admin notifications in one digest message, 0 sends
+# them as soon as possible
+VK_DIGEST_WINDOW = int(os.getenv('VK_DIGEST_WINDOW', 5))
 
 # YANDEX setup
 
@@ -0,0 +1,52 @@
+document.addEventListener("DOMContentLoaded", function() {
+    var container = document.querySelector(".modal-container[data-url]");
+    if (!container) {
+        return;
+    }
+    var url = container.dataset.url;
+
+    function showSlots(modal, slots) {
+        var tbody = modal.querySelector(".slots-table tbody");
+        tbody.innerHTML = "";
+        slots.forEach(function(slot, index) {
+            var row = document.createElement("tr");
+            row.className = "table-success";
+            var number = document.createElement("th");
+            number.scope = "row";
+            number.textContent = index + 1;
+            row.appendChild(number);
+            // from, to and count of free bikes
+            slot.forEach(function(value) {
+                var cell = document.createElement("td");
+                cell.textContent = value;
+                row.appendChild(cell);
+            });
+            tbody.appendChild(row);
+        });
+        var hasSlots = slots.length > 0;
+        modal.querySelector(".slots-loading").classList.add("d-none");
+        modal.querySelector(".slots-table").classList.toggle("d-none", !hasSlots);
+        modal.querySelector(".slots-link").classList.toggle("d-none", !hasSlots);
+        modal.querySelector(".slots-empty").classList.toggle("d-none", hasSlots);
+        modal.querySelector(".slots-close").classList.toggle("d-none", hasSlots);
+    }
+
+    // slots of a day are fetched every time its modal opens
+    container.querySelectorAll(".booking-modal").forEach(function(modal) {
+        modal.addEventListener("show.bs.modal", function() {
+            fetch(url + "?date=" + modal.dataset.date)
+                .then(function(response) {
+                    if (!response.ok) {
+                        throw new Error(response.statusText);
+                    }
+                    return response.json();
+                })
+                .then(function(data) {
+                    showSlots(modal, data.days[0].capacity);
+                })
+                .catch(function() {
+                    showSlots(modal, []);
+                });
+        });
+    });
+});